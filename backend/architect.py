@@ -1,24 +1,371 @@
 """
 architect.py - The Brain
-Uses LLM (Groq) to analyze errors and generate fixed code.
+Uses an LLM (Groq, or the offline local provider) to analyze errors and generate fixed code.
 """
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import keyword
 import os
-from groq import Groq
-from typing import Tuple
+import random
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from metrics import metrics
+from providers import LLMProvider, TruncatedCompletion, get_provider, rate_limit_delay
+from regions import apply_region_reply, compact_error, locate_region, module_context
+
+
+# Sampling settings for concurrent candidates: variant i uses entry i % len
+CANDIDATE_TEMPERATURES = [0.3, 0.7, 0.1, 1.0]
+CANDIDATE_HINTS = [
+    "",
+    "Prefer the smallest change that fixes the problem.",
+    "Think about edge cases and keep the code robust.",
+    "Prefer Python built-ins and standard library functions over hand-written loops.",
+]
+
+
+# Queue priorities: crashes are served before optimizations
+PRIORITIES = {"ERROR": 0, "OPTIMIZATION": 1}
+
+
+class TokenBucket:
+    """Per-minute budget refilled continuously; a limit of 0 means unlimited"""
+    
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+    
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / 60)
+        self.updated = now
+    
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be spent"""
+        if not self.capacity:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)  # A single oversized request must still fit eventually
+        return max(0.0, (amount - self.level) * 60 / self.capacity)
+    
+    def spend(self, amount: float, now: float):
+        if self.capacity:
+            self._refill(now)
+            self.level -= min(amount, self.capacity)
+    
+    def refund(self, amount: float):
+        """Return part of an earlier spend that was not used"""
+        if self.capacity:
+            self.level = min(self.capacity, self.level + amount)
+
+
+class StreamAborted(Exception):
+    """A streamed reply was abandoned because it went off-format"""
+
+
+class Completion(NamedTuple):
+    """A model reply, with timing stats when it was streamed"""
+    text: str
+    stats: Optional[Dict] = None
+
+
+_SENTENCE = re.compile(r"[A-Za-z][A-Za-z0-9',!?.:;\- ]*")
+
+
+def _is_prose(line: str) -> bool:
+    """Whether a reply's first line reads as a sentence rather than code or a diff"""
+    words = line.split()
+    if keyword.iskeyword(words[0]) or not _SENTENCE.fullmatch(line):
+        return False
+    return len(words) >= 4 or line[-1] in ".!:"
+
+
+class StreamGuard:
+    """
+    Watches a streamed reply line by line. Raises StreamAborted if it opens
+    with prose instead of code; reports it complete at a closing markdown
+    fence so trailing commentary is never waited for. Tracks time to first
+    token and generation speed.
+    """
+    
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.first_token: Optional[float] = None
+        self.text = ""
+        self._scanned = 0
+        self._fenced = False
+        self._code_seen = False
+    
+    def feed(self, chunk: str) -> bool:
+        """Add a piece of the reply; True once the reply is complete"""
+        if self.first_token is None and chunk.strip():
+            self.first_token = time.perf_counter() - self.start
+        self.text += chunk
+        while True:
+            end = self.text.find("\n", self._scanned)
+            if end < 0:
+                return False
+            line = self.text[self._scanned:end].strip()
+            self._scanned = end + 1
+            if not line:
+                continue
+            if line.startswith("```"):
+                if self._fenced:
+                    self.text = self.text[:end + 1]
+                    return True
+                self._fenced = True
+            elif not self._code_seen:
+                if _is_prose(line):
+                    raise StreamAborted(f"reply opened with prose: {line[:60]!r}")
+                self._code_seen = True
+    
+    def stats(self) -> Dict:
+        """Time to first token, reply size and tokens/sec (about 4 characters a token)"""
+        elapsed = time.perf_counter() - self.start
+        first_token = self.first_token if self.first_token is not None else elapsed
+        tokens = len(self.text) // 4
+        generating = elapsed - first_token
+        return {
+            "first_token": first_token,
+            "seconds": elapsed,
+            "tokens": tokens,
+            "tokens_per_second": tokens / generating if generating > 0 else 0.0,
+        }
+
+
+class _Job:
+    """One queued completion; every coalesced caller shares its future"""
+    
+    def __init__(self, key: str, priority: int, messages: List[Dict], request: Dict, temperature: float,
+                 max_tokens: int):
+        self.key = key
+        self.priority = priority
+        self.messages = messages
+        self.request = request
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        # Prompt tokens (about 4 characters each) plus the reply budget, settled after the call
+        self.prompt_tokens = sum(len(m["content"]) for m in messages) // 4
+        self.tokens = self.prompt_tokens + max_tokens
+        self.future: Future = Future()
+        self.retries = 0
+        self.partial = ""  # Streamed reply text read so far
+        self.started = False
+
+
+class RequestScheduler:
+    """
+    Queue in front of the LLM provider. Identical in-flight requests are
+    coalesced into one call; requests and tokens per minute are held under
+    budget with token buckets; rate-limit (429) responses back off
+    exponentially (or by Retry-After) and pause the whole queue; crashes
+    jump ahead of optimizations. Calls run on a small thread pool, async
+    callers await the returned future via asyncio.wrap_future. With
+    stream=True, replies from providers that stream are read incrementally
+    through a StreamGuard. Futures resolve to a Completion.
+    """
+    
+    def __init__(self, provider: LLMProvider, rpm: float = 30, tpm: float = 6000, concurrency: int = 4,
+                 max_retries: int = 4, backoff: float = 1.0, stream: bool = False):
+        self.provider = provider
+        self.stream = stream
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._queue: List[Tuple[int, int, _Job]] = []
+        self._pending: Dict[str, _Job] = {}
+        self._order = itertools.count()
+        self._cv = threading.Condition()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="llm")
+        self._dispatcher: Optional[threading.Thread] = None
+        self.coalesced = 0
+        self.rate_limited = 0
+    
+    def submit(self, mutation_type: str, messages: List[Dict], request: Dict, temperature: float,
+               max_tokens: int) -> Future:
+        """Queue a completion (or join an identical one already queued or running)"""
+        key = hashlib.sha256(
+            json.dumps([messages, temperature, max_tokens], sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        with self._cv:
+            job = self._pending.get(key)
+            if job is not None:
+                self.coalesced += 1
+                metrics.llm_requests.inc(outcome="coalesced")
+                return job.future
+            
+            job = _Job(key, PRIORITIES.get(mutation_type, 1), messages, request, temperature, max_tokens)
+            self._pending[key] = job
+            heapq.heappush(self._queue, (job.priority, next(self._order), job))
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch_loop, name="llm-dispatch", daemon=True)
+                self._dispatcher.start()
+            self._cv.notify_all()
+        return job.future
+    
+    def _wait_time(self, job: _Job, now: float) -> float:
+        """Seconds before the job at the head of the queue may be sent"""
+        return max(
+            self._paused_until - now,
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(job.tokens, now)
+        )
+    
+    def _dispatch_loop(self):
+        while True:
+            with self._cv:
+                if not self._queue or self._in_flight >= self.concurrency:
+                    self._cv.wait()
+                    continue
+                
+                job = self._queue[0][2]
+                if not job.started and job.future.cancelled():
+                    heapq.heappop(self._queue)
+                    self._pending.pop(job.key, None)
+                    continue
+                
+                now = time.monotonic()
+                wait = self._wait_time(job, now)
+                if wait > 0:
+                    # A higher-priority submit or a finished call wakes us early
+                    self._cv.wait(wait)
+                    continue
+                
+                heapq.heappop(self._queue)
+                if not job.started:
+                    if not job.future.set_running_or_notify_cancel():
+                        self._pending.pop(job.key, None)
+                        continue
+                    job.started = True
+                self.requests.spend(1, now)
+                self.tokens.spend(job.tokens, now)
+                self._in_flight += 1
+            
+            self._pool.submit(self._execute, job)
+    
+    def _execute(self, job: _Job):
+        outcome = "completed"
+        try:
+            if self.stream and self.provider.streams:
+                completion = self._read_stream(job)
+            else:
+                completion = Completion(self.provider.complete(job.messages, job.request, job.temperature,
+                                                               job.max_tokens))
+        except (StreamAborted, TruncatedCompletion) as e:
+            outcome = "aborted"
+            # Only the reply that streamed in before the abort was generated
+            with self._cv:
+                self.tokens.refund(max(0, job.max_tokens - len(job.partial) // 4))
+            self._finish(job, error=e)
+        except Exception as e:
+            delay = rate_limit_delay(e)
+            if delay is not None and job.retries < self.max_retries:
+                job.retries += 1
+                delay = max(delay, self.backoff * 2 ** (job.retries - 1)) * random.uniform(1.0, 1.25)
+                outcome = "rate_limited"
+                with self._cv:
+                    self.rate_limited += 1
+                    self.tokens.refund(job.tokens)  # Rejected unprocessed; re-spent when it is resent
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                    heapq.heappush(self._queue, (job.priority, next(self._order), job))
+            else:
+                outcome = "failed"
+                with self._cv:
+                    self.tokens.refund(job.max_tokens)
+                self._finish(job, error=e)
+        else:
+            # Keep only what the call used (about 4 characters a token) of the reserved reply budget
+            with self._cv:
+                self.tokens.refund(max(0, job.max_tokens - len(completion.text) // 4))
+            self._finish(job, content=completion)
+        finally:
+            metrics.llm_requests.inc(outcome=outcome)
+            with self._cv:
+                self._in_flight -= 1
+                self._cv.notify_all()
+    
+    def _read_stream(self, job: _Job) -> Completion:
+        """Read a streamed reply, stopping at a closing fence or aborting on prose"""
+        guard = StreamGuard()
+        chunks = self.provider.stream(job.messages, job.request, job.temperature, job.max_tokens)
+        try:
+            for chunk in chunks:
+                if guard.feed(chunk):
+                    break
+        finally:
+            chunks.close()
+            job.partial = guard.text
+        stats = guard.stats()
+        metrics.llm_first_token.observe(stats["first_token"])
+        if stats["tokens_per_second"]:
+            metrics.llm_throughput.observe(stats["tokens_per_second"])
+        return Completion(guard.text, stats)
+    
+    def _finish(self, job: _Job, content: Optional[Completion] = None, error: Optional[Exception] = None):
+        with self._cv:
+            self._pending.pop(job.key, None)
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(content)
+    
+    def stats(self) -> Dict:
+        """Queue depth and counters"""
+        with self._cv:
+            return {
+                "queued": len(self._queue),
+                "in_flight": self._in_flight,
+                "coalesced": self.coalesced,
+                "rate_limited": self.rate_limited,
+                "paused_for": max(0.0, self._paused_until - time.monotonic()),
+            }
+
+
+def _rate_limit(env: str, provider: LLMProvider, name: str) -> float:
+    """Per-minute budget: the env var if set, else the provider's own limit (0 = unlimited)"""
+    configured = os.getenv(env, "").strip()
+    if configured:
+        return float(configured)
+    return float((provider.rate_limits or {}).get(name, 0))
+
+
+def _max_tokens(current_code: str) -> int:
+    """Reply budget: room for the whole file twice over (about 4 characters a token), capped at 2000"""
+    return max(512, min(2000, len(current_code) // 2))
 
 
 class Architect:
     """The Brain - Uses AI to fix code"""
     
-    def __init__(self):
-        self.api_key = os.getenv("GROQ_API_KEY")
-        if not self.api_key:
-            raise ValueError("GROQ_API_KEY not found in environment variables")
+    def __init__(self, provider: Optional[LLMProvider] = None):
+        self.provider = provider or get_provider()
+        self.api_key = getattr(self.provider, "api_key", None)
+        self.model = self.provider.model
+        self.scheduler = RequestScheduler(
+            self.provider,
+            rpm=_rate_limit("LLM_RPM", self.provider, "rpm"),
+            tpm=_rate_limit("LLM_TPM", self.provider, "tpm"),
+            concurrency=int(os.getenv("LLM_CONCURRENCY", "4")),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "4")),
+            stream=os.getenv("LLM_STREAM", "off").lower() in ("on", "true", "1")
+        )
+        # "region" sends only the function to change plus a compact context; "full" sends the whole file
+        self.prompt_mode = os.getenv("PROMPT_MODE", "full").lower()
         
-        self.client = Groq(api_key=self.api_key)
-        self.model = "llama-3.3-70b-versatile"  # Fast and smart model
-        
-    def analyze_and_fix(self, error_log: str, current_code: str, mutation_type: str = "ERROR") -> Tuple[str, str]:
+    def analyze_and_fix(self, error_log: str, current_code: str, mutation_type: str = "ERROR",
+                        variant: int = 0, baseline: Optional[str] = None,
+                        log: Optional[Callable[[str], None]] = None) -> Tuple[str, str]:
         """
         Analyze error and generate fixed code.
         
@@ -26,40 +373,25 @@ class Architect:
             error_log: The error traceback or performance issue
             current_code: The current organism.py code
             mutation_type: "ERROR" for crashes, "OPTIMIZATION" for performance
+            variant: Candidate number, varies temperature and prompt when racing candidates
+            baseline: Last promoted code, the local provider's fallback
+            log: Receives progress notes: streaming stats (time to first token,
+                tokens/sec) and region replies that fell back to the full file
             
         Returns:
             Tuple of (fixed_code, explanation)
         """
         
-        if mutation_type == "OPTIMIZATION":
-            prompt = self._create_optimization_prompt(current_code, error_log)
-        else:
-            prompt = self._create_fix_prompt(error_log, current_code)
-        
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert Python debugger and optimizer. Return ONLY valid Python code without any markdown formatting, explanations, or code blocks. The code must be complete and ready to execute."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=2000
-            )
-            
-            fixed_code = response.choices[0].message.content.strip()
+            region = self._locate(error_log, current_code, mutation_type)
+            completion = self._submit(error_log, current_code, mutation_type, variant, baseline, region).result()
+            self._log_stream(completion, log)
             
-            # Remove markdown code blocks if present
-            if fixed_code.startswith("```python"):
-                fixed_code = fixed_code.split("```python")[1].split("```")[0].strip()
-            elif fixed_code.startswith("```"):
-                fixed_code = fixed_code.split("```")[1].split("```")[0].strip()
+            fixed_code = self._apply_reply(completion.text, current_code, region, log)
+            if fixed_code is None:
+                completion = self._submit(error_log, current_code, mutation_type, variant, baseline).result()
+                self._log_stream(completion, log)
+                fixed_code = self._extract_code(completion.text)
             
             # Generate explanation
             explanation = self._generate_explanation(error_log, mutation_type)
@@ -69,6 +401,142 @@ class Architect:
         except Exception as e:
             raise Exception(f"Failed to generate fix: {str(e)}")
     
+    async def aanalyze_and_fix(self, error_log: str, current_code: str, mutation_type: str = "ERROR",
+                               variant: int = 0, baseline: Optional[str] = None,
+                               log: Optional[Callable[[str], None]] = None) -> Tuple[str, str]:
+        """Async version of analyze_and_fix for the asyncio watch loop"""
+        try:
+            region = self._locate(error_log, current_code, mutation_type)
+            # Shielded: a cancelled caller must not cancel a call other callers were coalesced into
+            completion = await asyncio.shield(
+                asyncio.wrap_future(self._submit(error_log, current_code, mutation_type, variant, baseline, region))
+            )
+            self._log_stream(completion, log)
+            
+            fixed_code = self._apply_reply(completion.text, current_code, region, log)
+            if fixed_code is None:
+                completion = await asyncio.shield(
+                    asyncio.wrap_future(self._submit(error_log, current_code, mutation_type, variant, baseline))
+                )
+                self._log_stream(completion, log)
+                fixed_code = self._extract_code(completion.text)
+            explanation = self._generate_explanation(error_log, mutation_type)
+            
+            return fixed_code, explanation
+            
+        except Exception as e:
+            raise Exception(f"Failed to generate fix: {str(e)}")
+    
+    def _submit(self, error_log: str, current_code: str, mutation_type: str, variant: int,
+                baseline: Optional[str], region: Optional[Dict] = None) -> Future:
+        """Queue the completion for a mutation request (region-only when a region is given)"""
+        if region is not None:
+            messages = self._create_region_messages(error_log, current_code, mutation_type, region, variant)
+            max_tokens = _max_tokens(region["source"])
+        else:
+            messages = self._create_messages(error_log, current_code, mutation_type, variant)
+            max_tokens = _max_tokens(current_code)
+        return self.scheduler.submit(
+            mutation_type,
+            messages,
+            self._request(error_log, current_code, mutation_type, baseline),
+            temperature=CANDIDATE_TEMPERATURES[variant % len(CANDIDATE_TEMPERATURES)],
+            max_tokens=max_tokens
+        )
+    
+    def _log_stream(self, completion: Completion, log: Optional[Callable[[str], None]]):
+        """Report how fast a streamed reply arrived"""
+        if completion.stats is None or log is None:
+            return
+        stats = completion.stats
+        log(f"📡 Streamed ~{stats['tokens']} tokens: first token in {stats['first_token'] * 1000:.0f}ms, "
+            f"{stats['tokens_per_second']:.0f} tokens/s")
+    
+    def _locate(self, error_log: str, current_code: str, mutation_type: str) -> Optional[Dict]:
+        """The function to send in region mode, None to send the whole file"""
+        if self.prompt_mode != "region":
+            return None
+        region = locate_region(current_code, error_log, mutation_type)
+        # A region that is most of the file saves nothing and loses context
+        if region is None or len(region["source"]) > len(current_code) * 0.8:
+            return None
+        return region
+    
+    def _apply_reply(self, content: str, current_code: str, region: Optional[Dict],
+                     log: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        """Full code from a reply; None if a region reply cannot be applied (retry with the whole file)"""
+        if region is None:
+            return self._extract_code(content)
+        try:
+            return apply_region_reply(current_code, region, self._extract_code(content))
+        except ValueError as e:
+            if log is not None:
+                log(f"⚠️ Region reply for {region['name']}() did not apply ({e}), retrying with the full file")
+            return None
+    
+    def _request(self, error_log: str, current_code: str, mutation_type: str, baseline: Optional[str]) -> Dict:
+        """Structured context for providers that do not read prompts"""
+        return {
+            "error_log": error_log,
+            "current_code": current_code,
+            "mutation_type": mutation_type,
+            "baseline": baseline,
+        }
+    
+    def _create_messages(self, error_log: str, current_code: str, mutation_type: str, variant: int = 0) -> List[Dict]:
+        """Build the chat messages for a mutation request"""
+        if mutation_type == "OPTIMIZATION":
+            prompt = self._create_optimization_prompt(current_code, error_log)
+        else:
+            prompt = self._create_fix_prompt(error_log, current_code)
+        
+        hint = CANDIDATE_HINTS[variant % len(CANDIDATE_HINTS)]
+        if hint:
+            prompt = f"{prompt}\n\n{hint}"
+        
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert Python debugger and optimizer. Return ONLY valid Python code without any markdown formatting, explanations, or code blocks. The code must be complete and ready to execute."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _create_region_messages(self, error_log: str, current_code: str, mutation_type: str, region: Dict,
+                                variant: int = 0) -> List[Dict]:
+        """Build the chat messages for a region-only mutation request"""
+        prompt = self._create_region_prompt(error_log, current_code, mutation_type, region)
+        
+        hint = CANDIDATE_HINTS[variant % len(CANDIDATE_HINTS)]
+        if hint:
+            prompt = f"{prompt}\n\n{hint}"
+        
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert Python debugger and optimizer. Return ONLY the requested Python function (or a unified diff against it) without any markdown formatting or explanations."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _extract_code(self, content: str) -> str:
+        """Strip markdown code fences from a model response"""
+        fixed_code = content.strip()
+        
+        # Remove markdown code blocks if present
+        if fixed_code.startswith("```python"):
+            fixed_code = fixed_code.split("```python")[1].split("```")[0].strip()
+        elif fixed_code.startswith("```"):
+            fixed_code = fixed_code.split("```")[1].split("```")[0].strip()
+        
+        return fixed_code
+    
     def _create_fix_prompt(self, error_log: str, current_code: str) -> str:
         """Create prompt for fixing errors"""
         return f"""The following Python code crashed with this error:
@@ -98,13 +566,37 @@ CURRENT CODE:
 {current_code}
 
 Optimize the code to run faster. Focus on:
-1. Improving time complexity (e.g., replace O(n²) with O(n log n))
+1. Improving time complexity - the measured growth class above, if given, is what to beat (e.g., replace O(n²) with O(n log n))
 2. Using efficient built-in functions
 3. Maintaining the same functionality
 4. Keeping the code readable
 
 Return ONLY the optimized Python code, nothing else."""
     
+    def _create_region_prompt(self, error_log: str, current_code: str, mutation_type: str, region: Dict) -> str:
+        """Create prompt covering only the function to change"""
+        if mutation_type == "OPTIMIZATION":
+            problem = f"""The function `{region['name']}` in this Python module is running too slowly:
+
+PERFORMANCE ISSUE:
+{compact_error(error_log, max_lines=5)}"""
+            task = "Optimize it to run faster (better time complexity, efficient built-ins) with the same behaviour."
+        else:
+            problem = f"""The function `{region['name']}` in this Python module crashed:
+
+ERROR:
+{compact_error(error_log)}"""
+            task = "Fix the error with the same behaviour."
+        
+        return f"""{problem}
+
+FUNCTION (lines {region['start']}-{region['end']}):
+{region['source']}
+REST OF THE MODULE (bodies elided, do not change):
+{module_context(current_code, region)}
+
+{task} Return ONLY the complete `{region['name']}` function with the same name and signature, or a unified diff against it, nothing else."""
+    
     def _generate_explanation(self, context: str, mutation_type: str) -> str:
         """Generate human-readable explanation of the fix"""
         if mutation_type == "OPTIMIZATION":
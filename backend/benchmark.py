@@ -0,0 +1,329 @@
+"""
+benchmark.py - The Proving Ground
+Times two organism versions against the same seeded inputs and decides
+whether a mutation is measurably faster and still behaves the same, and
+profiles how a genome's process() scales across input sizes.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Sequence
+
+from metrics import percentile
+from runner import WarmRunner
+
+
+def _normalize_output(stdout: str) -> str:
+    """Drop output that legitimately differs between generations"""
+    stdout = re.sub(r"Generation \d+", "Generation N", stdout)
+    # Self-reported timings are expected to change
+    return "\n".join(
+        line for line in stdout.splitlines()
+        if not re.search(r"\d+\.\d+\s*m?s\b", line)
+    )
+
+
+def summarize(times: List[float]) -> Dict:
+    """Median, p95, mean and spread of a timing sample"""
+    return {
+        "median": statistics.median(times),
+        "p95": percentile(times, 95),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "min": min(times),
+        "trials": len(times),
+    }
+
+
+def bootstrap_speedup(old: List[float], new: List[float], resamples: int = 2000,
+                      confidence: float = 0.95, seed: int = 0) -> List[float]:
+    """Bootstrap confidence interval of median(old) / median(new)"""
+    rng = random.Random(seed)
+    ratios = []
+    for _ in range(resamples):
+        old_median = statistics.median(rng.choices(old, k=len(old)))
+        new_median = statistics.median(rng.choices(new, k=len(new)))
+        ratios.append(old_median / new_median if new_median > 0 else math.inf)
+    ratios.sort()
+    tail = (1 - confidence) / 2
+    return [ratios[int(tail * (resamples - 1))], ratios[int((1 - tail) * (resamples - 1))]]
+
+
+def benchmark_versions(old_source: str, new_source: str, path: str, trials: int = 7,
+                       seed: int = 1337, min_speedup: float = 1.05, timeout: float = 10.0) -> Dict:
+    """
+    Run both versions in their own warm workers, interleaving trials so
+    drift hits both equally. Trial i of each version is seeded with
+    seed + i. The new version is promoted only if every run succeeds,
+    outputs match trial by trial, and the lower bound of the speedup
+    confidence interval exceeds min_speedup.
+    """
+    runners = {"old": WarmRunner(path, timeout), "new": WarmRunner(path, timeout)}
+    sources = {"old": old_source, "new": new_source}
+    times: Dict[str, List[float]] = {"old": [], "new": []}
+    outputs: Dict[str, List[str]] = {"old": [], "new": []}
+
+    try:
+        # Warm-up run pays spawn and import outside the timed trials
+        for name, runner in runners.items():
+            runner.run(sources[name], seed)
+
+        for trial in range(trials):
+            for name, runner in runners.items():
+                result = runner.run(sources[name], seed + trial)
+                if result["returncode"] != 0:
+                    return {
+                        "promote": False,
+                        "reason": f"{name} version failed on trial {trial}: {result['stderr'][-200:]}",
+                    }
+                times[name].append(result["run_time"])
+                outputs[name].append(_normalize_output(result["stdout"]))
+    finally:
+        for runner in runners.values():
+            runner.close()
+
+    old_stats, new_stats = summarize(times["old"]), summarize(times["new"])
+    speedup = old_stats["median"] / new_stats["median"] if new_stats["median"] > 0 else math.inf
+    ci = bootstrap_speedup(times["old"], times["new"], seed=seed)
+    equivalent = outputs["old"] == outputs["new"]
+
+    if not equivalent:
+        reason = "outputs differ for the same seeded inputs"
+    elif ci[0] <= min_speedup:
+        reason = f"not measurably faster (CI lower bound {ci[0]:.2f}x <= {min_speedup:.2f}x)"
+    else:
+        reason = f"{speedup:.2f}x faster"
+
+    return {
+        "promote": equivalent and ci[0] > min_speedup,
+        "reason": reason,
+        "old": old_stats,
+        "new": new_stats,
+        "speedup": speedup,
+        "ci": ci,
+        "equivalent": equivalent,
+        "trials": trials,
+    }
+
+
+def format_report(verdict: Dict) -> str:
+    """One-line summary for logs"""
+    if "old" not in verdict:
+        return verdict["reason"]
+    old, new = verdict["old"], verdict["new"]
+    return (
+        f"median {old['median']:.4f}s -> {new['median']:.4f}s, "
+        f"p95 {old['p95']:.4f}s -> {new['p95']:.4f}s, "
+        f"speedup {verdict['speedup']:.2f}x (95% CI {verdict['ci'][0]:.2f}-{verdict['ci'][1]:.2f}x), "
+        f"{verdict['trials']} trials - {verdict['reason']}"
+    )
+
+
+# Geometric input sizes for scaling runs, 10 to 10^6
+SCALING_SIZES = tuple(10 ** k for k in range(1, 7))
+
+# Runs in a fresh interpreter per size: loads the genome from stdin, times process() on generated data
+_SCALING_PROBE = """
+import contextlib, hashlib, io, json, sys, time, types
+path, size, seed, distribution, trials = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), sys.argv[4], int(sys.argv[5])
+source = sys.stdin.read()
+module = types.ModuleType("organism")
+module.__file__ = path
+times, digest = [], None
+with contextlib.redirect_stdout(io.StringIO()):
+    exec(compile(source, path, "exec"), module.__dict__)
+    for trial in range(trials):
+        data = module.generate_data(size, seed + trial, distribution)
+        start = time.perf_counter()
+        result = module.process(data)
+        times.append(time.perf_counter() - start)
+        if trial == 0:
+            digest = hashlib.sha256(repr(result).encode()).hexdigest()[:16]
+print(json.dumps({"times": times, "checksum": digest}))
+"""
+
+
+def _probe(source: str, path: str, size: int, seed: int, distribution: str, trials: int,
+           timeout: float) -> Dict:
+    """Time process() at one size in its own interpreter; the timeout is the size's budget"""
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-c", _SCALING_PROBE, path, str(size), str(seed), distribution, str(trials)],
+            input=source, capture_output=True, text=True, timeout=timeout,
+            cwd=os.path.dirname(os.path.abspath(path))
+        )
+    except subprocess.TimeoutExpired:
+        return {"size": size, "status": "timeout"}
+    if proc.returncode != 0:
+        return {"size": size, "status": "error", "error": proc.stderr.strip()[-300:]}
+    measured = json.loads(proc.stdout.strip().splitlines()[-1])
+    times = measured["times"]
+    median = statistics.median(times)
+    return {
+        "size": size,
+        "status": "ok",
+        "median": median,
+        "min": min(times),
+        "ns_per_item": median / size * 1e9,
+        "checksum": measured["checksum"],
+    }
+
+
+def benchmark_scaling(source: str, path: str, sizes: Sequence[int] = SCALING_SIZES, seed: int = 1337,
+                      distribution: str = "uniform", trials: int = 3, budget: float = 5.0) -> Dict:
+    """
+    Time process(generate_data(size, seed + trial, distribution)) at each
+    size, smallest first. Each size gets `budget` seconds for all its
+    trials. After a size times out or fails, every larger size is marked
+    "skipped". Sizes are also skipped when the growth measured so far
+    predicts they would overrun. Same source, seed and sizes give the same
+    inputs; the checksums identify outputs.
+    """
+    rows: List[Dict] = []
+    stop = None
+    for size in sorted(sizes):
+        if stop is None and len(rows) >= 2 and rows[-1]["status"] == rows[-2]["status"] == "ok":
+            # Extrapolate with the exponent observed between the last two sizes
+            previous, last = rows[-2], rows[-1]
+            ratio = last["median"] / previous["median"] if previous["median"] > 0 else 1.0
+            exponent = max(1.0, math.log(max(ratio, 1e-9)) / math.log(last["size"] / previous["size"]))
+            predicted = last["median"] * (size / last["size"]) ** exponent * trials
+            if predicted > budget:
+                stop = f"predicted {predicted:.1f}s over the {budget:g}s budget"
+        if stop is not None:
+            rows.append({"size": size, "status": "skipped", "reason": stop})
+            continue
+        row = _probe(source, path, size, seed, distribution, trials, budget)
+        rows.append(row)
+        if row["status"] != "ok":
+            stop = f"size {size} {row['status']}"
+
+    return {
+        "seed": seed,
+        "distribution": distribution,
+        "trials": trials,
+        "budget": budget,
+        "python": platform.python_version(),
+        "rows": rows,
+    }
+
+
+def format_scaling_table(profile: Dict) -> str:
+    """Fixed-width runtime table"""
+    lines = [
+        f"seed={profile['seed']} distribution={profile['distribution']} trials={profile['trials']} "
+        f"budget={profile['budget']:g}s python={profile['python']}",
+        f"{'size':>10}  {'median s':>10}  {'min s':>10}  {'ns/item':>10}  status",
+    ]
+    for row in profile["rows"]:
+        if row["status"] == "ok":
+            lines.append(f"{row['size']:>10,}  {row['median']:>10.6f}  {row['min']:>10.6f}  "
+                         f"{row['ns_per_item']:>10.1f}  ok")
+        else:
+            lines.append(f"{row['size']:>10,}  {'-':>10}  {'-':>10}  {'-':>10}  "
+                         f"{row['status']} {row.get('reason', row.get('error', ''))}".rstrip())
+    return "\n".join(lines)
+
+
+def compare_scaling(old: Dict, new: Dict, tolerance: float = 1.1) -> Dict:
+    """
+    Per-size speedup (old median / new median) where both profiles
+    measured the size. Outputs must match size by size. The new profile
+    regresses if it is more than `tolerance` times slower at the largest
+    common size, or if it failed a size the old profile measured.
+    """
+    old_rows = {row["size"]: row for row in old["rows"]}
+    sizes = []
+    regressed = None
+    for row in new["rows"]:
+        before = old_rows.get(row["size"])
+        if before is None or before["status"] != "ok":
+            continue
+        if row["status"] != "ok":
+            if row["status"] != "skipped" and regressed is None:
+                regressed = f"size {row['size']} {row['status']} (old version measured it)"
+            continue
+        speedup = before["median"] / row["median"] if row["median"] > 0 else math.inf
+        sizes.append({"size": row["size"], "speedup": speedup, "equivalent": before["checksum"] == row["checksum"]})
+
+    equivalent = all(entry["equivalent"] for entry in sizes)
+    if regressed is None and sizes and sizes[-1]["speedup"] < 1 / tolerance:
+        regressed = f"{1 / sizes[-1]['speedup']:.2f}x slower at size {sizes[-1]['size']:,}"
+    return {
+        "sizes": sizes,
+        "equivalent": equivalent,
+        "regressed": regressed,
+        "ok": equivalent and regressed is None and bool(sizes),
+    }
+
+
+def _scaling_main(args: argparse.Namespace) -> int:
+    profiles = []
+    for genome in args.files:
+        with open(genome) as f:
+            source = f.read()
+        profile = benchmark_scaling(source, os.path.abspath(genome), args.sizes, args.seed,
+                                    args.distribution, args.trials, args.budget)
+        profiles.append(profile)
+        print(f"📈 {genome}")
+        print(format_scaling_table(profile))
+
+    report = {"profiles": profiles}
+    status = 0
+    if len(profiles) == 2:
+        comparison = compare_scaling(*profiles)
+        report["comparison"] = comparison
+        for entry in comparison["sizes"]:
+            print(f"{entry['size']:>10,}  {entry['speedup']:6.2f}x" + ("" if entry["equivalent"] else "  OUTPUT DIFFERS"))
+        if comparison["ok"]:
+            print("✅ No regression")
+        else:
+            print("❌ " + (comparison["regressed"] or "outputs differ"))
+            status = 1
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark organism genomes.")
+    parser.add_argument("files", nargs="+", help="OLD.py NEW.py (or one genome with --scaling)")
+    parser.add_argument("--scaling", action="store_true",
+                        help="profile process() across input sizes (and compare two genomes)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SCALING_SIZES))
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--distribution", default="uniform")
+    parser.add_argument("--trials", type=int, default=int(os.getenv("SCALING_TRIALS", "3")))
+    parser.add_argument("--budget", type=float, default=float(os.getenv("SCALING_BUDGET", "5")),
+                        help="seconds allowed per size")
+    parser.add_argument("--json", help="also write the profiles (and comparison) to this file")
+    args = parser.parse_args()
+
+    if args.scaling:
+        if len(args.files) > 2:
+            parser.error("--scaling takes one or two genomes")
+        sys.exit(_scaling_main(args))
+
+    if len(args.files) != 2:
+        parser.error("expected OLD.py NEW.py")
+
+    with open(args.files[0]) as f:
+        old_code = f.read()
+    with open(args.files[1]) as f:
+        new_code = f.read()
+
+    result = benchmark_versions(
+        old_code, new_code, os.path.abspath(args.files[1]),
+        trials=int(os.getenv("BENCH_TRIALS", "7")),
+        min_speedup=float(os.getenv("BENCH_MIN_SPEEDUP", "1.05"))
+    )
+    print(("✅ PROMOTE: " if result["promote"] else "❌ REJECT: ") + format_report(result))
+    sys.exit(0 if result["promote"] else 1)
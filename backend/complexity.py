@@ -0,0 +1,102 @@
+"""
+complexity.py - The Oracle
+Estimates how an organism's process() grows with input size from a
+scaling profile: a least-squares fit of log(time) against log(size) plus
+the best-fitting of a few growth classes (O(1) .. O(n^3)). The watcher
+triggers optimization when the class is worse than MAX_COMPLEXITY.
+"""
+import math
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Growth classes, best first
+MODELS: Tuple[Tuple[str, Callable[[float], float]], ...] = (
+    ("O(1)", lambda n: 1.0),
+    ("O(log n)", lambda n: math.log(n)),
+    ("O(n)", lambda n: n),
+    ("O(n log n)", lambda n: n * math.log(n)),
+    ("O(n^2)", lambda n: n * n),
+    ("O(n^3)", lambda n: n ** 3),
+)
+CLASSES = [name for name, _ in MODELS]
+
+# Medians below this are mostly call and timer overhead, not growth
+MIN_TIME = 1e-4
+
+
+def parse_class(text: str) -> str:
+    """Canonical class name from loose spellings ("n log n", "O(n²)", "nlogn", "n^2")"""
+    key = re.sub(r"\s+", "", text.lower()).replace("²", "^2").replace("³", "^3").replace("**", "^")
+    key = key[2:-1] if key.startswith("o(") and key.endswith(")") else key
+    for name in CLASSES:
+        if key == re.sub(r"\s+", "", name.lower())[2:-1]:
+            return name
+    raise ValueError(f"Unknown complexity class: {text} (expected one of {', '.join(CLASSES)})")
+
+
+def fit_loglog(sizes: Sequence[float], times: Sequence[float]) -> Tuple[float, float, float]:
+    """Least-squares line through (log size, log time): (slope, intercept, R²)"""
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(t) for t in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    slope = sxy / sxx if sxx else 0.0
+    intercept = mean_y - slope * mean_x
+    r2 = sxy * sxy / (sxx * syy) if sxx and syy else 1.0
+    return slope, intercept, r2
+
+
+def _model_error(sizes: Sequence[float], times: Sequence[float], f: Callable[[float], float]) -> float:
+    """Mean squared log-residual of time ≈ c·f(n), with c fitted"""
+    residuals = [math.log(t) - math.log(f(n)) for n, t in zip(sizes, times)]
+    c = sum(residuals) / len(residuals)
+    return sum((r - c) ** 2 for r in residuals) / len(residuals)
+
+
+def estimate_complexity(profile: Dict, min_time: float = MIN_TIME) -> Optional[Dict]:
+    """
+    Growth class of a benchmark_scaling profile, fitted on the measured
+    sizes whose median is at least min_time. None with fewer than two
+    such sizes (too fast or too broken to tell).
+    """
+    points = [(row["size"], row["median"]) for row in profile["rows"]
+              if row["status"] == "ok" and row["median"] >= min_time and row["size"] > 1]
+    if len(points) < 2:
+        return None
+    sizes = [n for n, _ in points]
+    times = [t for _, t in points]
+    slope, _, r2 = fit_loglog(sizes, times)
+    errors = {name: _model_error(sizes, times, f) for name, f in MODELS}
+    best = min(CLASSES, key=lambda name: errors[name])
+    return {
+        "class": best,
+        "rank": CLASSES.index(best),
+        "slope": round(slope, 3),
+        "r2": round(r2, 4),
+        "sizes": sizes,
+        "errors": {name: round(error, 5) for name, error in errors.items()},
+    }
+
+
+def exceeds(estimate: Optional[Dict], limit: str) -> bool:
+    """Whether the estimated class is worse than limit"""
+    return estimate is not None and estimate["rank"] > CLASSES.index(parse_class(limit))
+
+
+def describe(estimate: Dict, limit: Optional[str] = None) -> str:
+    """One-line summary for logs and prompts"""
+    sizes = estimate["sizes"]
+    summary = (f"process() grows as {estimate['class']} (log-log slope {estimate['slope']:.2f}, "
+               f"R² {estimate['r2']:.2f}, sizes {sizes[0]:,}..{sizes[-1]:,})")
+    if limit is not None:
+        summary += f"; target is {parse_class(limit)} or better"
+    return summary
+
+
+def profile_lines(profile: Dict) -> List[str]:
+    """Measured sizes as "size: median" lines, for prompts"""
+    return [f"n={row['size']:,}: {row['median']:.6f}s" for row in profile["rows"] if row["status"] == "ok"]
@@ -0,0 +1,211 @@
+"""
+genome_store.py - The Fossil Record
+Persistent, content-addressed store of every organism generation.
+Sources are stored once per content hash, as zlib-compressed line deltas
+against their parent with a full snapshot every MAX_CHAIN versions, so
+any generation is rebuilt from at most MAX_CHAIN deltas.
+"""
+import difflib
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from runner import source_hash
+
+
+MAX_CHAIN = 16  # Longest delta chain before a full snapshot is written
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    hash TEXT PRIMARY KEY,
+    base TEXT,
+    depth INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS generations (
+    organism_id TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    parent_hash TEXT,
+    timestamp TEXT NOT NULL,
+    context TEXT NOT NULL,
+    PRIMARY KEY (organism_id, generation)
+);
+"""
+
+
+def make_delta(base: str, source: str) -> List:
+    """Line delta turning base into source: ["c", start, end] copies, ["i", lines] inserts"""
+    base_lines = base.splitlines(keepends=True)
+    new_lines = source.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, base_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(["c", i1, i2])
+        elif j2 > j1:
+            ops.append(["i", new_lines[j1:j2]])
+    return ops
+
+
+def apply_delta(base: str, ops: List) -> str:
+    """Rebuild a source from its base and a delta"""
+    base_lines = base.splitlines(keepends=True)
+    out = []
+    for op in ops:
+        if op[0] == "c":
+            out.extend(base_lines[op[1]:op[2]])
+        else:
+            out.extend(op[1])
+    return "".join(out)
+
+
+class GenomeStore:
+    """SQLite-backed genome store shared by every organism"""
+
+    def __init__(self, path: str, cache_size: int = 64):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_size = cache_size
+
+    def _remember(self, digest: str, source: str):
+        """Keep recently used sources decoded"""
+        self._cache[digest] = source
+        self._cache.move_to_end(digest)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def put(self, source: str, base_hash: Optional[str] = None) -> str:
+        """Store a source (as a delta against base_hash when worthwhile), returning its hash"""
+        digest = source_hash(source)
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM objects WHERE hash = ?", (digest,)).fetchone():
+                return digest
+
+            full = zlib.compress(source.encode("utf-8"))
+            base, depth, payload = None, 0, full
+            row = None
+            if base_hash and base_hash != digest:
+                row = self._conn.execute("SELECT depth FROM objects WHERE hash = ?", (base_hash,)).fetchone()
+            if row and row[0] + 1 < MAX_CHAIN:
+                delta = zlib.compress(json.dumps(make_delta(self._get(base_hash), source)).encode("utf-8"))
+                if len(delta) < len(full):
+                    base, depth, payload = base_hash, row[0] + 1, delta
+
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO objects (hash, base, depth, payload) VALUES (?, ?, ?, ?)",
+                    (digest, base, depth, payload)
+                )
+            self._remember(digest, source)
+        return digest
+
+    def _get(self, digest: str) -> str:
+        """Decode a source by walking its delta chain (caller holds the lock)"""
+        if digest in self._cache:
+            self._cache.move_to_end(digest)
+            return self._cache[digest]
+
+        chain = []
+        current = digest
+        while True:
+            row = self._conn.execute("SELECT base, payload FROM objects WHERE hash = ?", (current,)).fetchone()
+            if row is None:
+                raise KeyError(f"Unknown genome object: {current}")
+            base, payload = row
+            if base is None or base in self._cache:
+                break
+            chain.append(payload)
+            current = base
+
+        if base is None:
+            source = zlib.decompress(payload).decode("utf-8")
+        else:
+            source = apply_delta(self._cache[base], json.loads(zlib.decompress(payload)))
+        for payload in reversed(chain):
+            source = apply_delta(source, json.loads(zlib.decompress(payload)))
+
+        self._remember(digest, source)
+        return source
+
+    def get(self, digest: str) -> str:
+        """Source for a content hash"""
+        with self._lock:
+            return self._get(digest)
+
+    def record(self, organism_id: str, generation: int, source: str, context: str,
+               parent_hash: Optional[str] = None) -> str:
+        """Store the source of a generation, returning its hash"""
+        digest = self.put(source, parent_hash)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO generations "
+                "(organism_id, generation, hash, parent_hash, timestamp, context) VALUES (?, ?, ?, ?, ?, ?)",
+                (organism_id, generation, digest, parent_hash, datetime.now().isoformat(), context[:200])
+            )
+        return digest
+
+    def _version(self, row) -> Dict:
+        return {
+            "generation": row[0],
+            "hash": row[1],
+            "parent_hash": row[2],
+            "timestamp": row[3],
+            "context": row[4],
+        }
+
+    def get_generation(self, organism_id: str, generation: int) -> Optional[Dict]:
+        """Metadata and source of one generation"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generation, hash, parent_hash, timestamp, context FROM generations "
+                "WHERE organism_id = ? AND generation = ?",
+                (organism_id, generation)
+            ).fetchone()
+            if row is None:
+                return None
+            version = self._version(row)
+            version["code"] = self._get(version["hash"])
+            return version
+
+    def latest(self, organism_id: str) -> Optional[Dict]:
+        """Metadata of the newest generation"""
+        history = self.history(organism_id, limit=1)
+        return history[0] if history else None
+
+    def history(self, organism_id: str, limit: int = 50) -> List[Dict]:
+        """Metadata of the newest generations, oldest first (no sources are decoded)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT generation, hash, parent_hash, timestamp, context FROM generations "
+                "WHERE organism_id = ? ORDER BY generation DESC LIMIT ?",
+                (organism_id, limit)
+            ).fetchall()
+        return [self._version(row) for row in reversed(rows)]
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+
+# Global genome store
+genome_store = None
+
+
+def get_genome_store() -> GenomeStore:
+    """Get or create the genome store (GENOME_DB, default backend/genome.db)"""
+    global genome_store
+    if genome_store is None:
+        default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "genome.db")
+        genome_store = GenomeStore(os.getenv("GENOME_DB", default_path))
+    return genome_store
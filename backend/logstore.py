@@ -0,0 +1,84 @@
+"""
+logstore.py - The Memory
+Fixed-capacity ring buffer of structured log entries with monotonic
+sequence numbers, so clients can page through logs with a cursor.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+
+class LogEntry(NamedTuple):
+    seq: int
+    timestamp: float
+    level: str
+    generation: int
+    message: str
+
+    def format(self) -> str:
+        """Render the entry the way the terminal shows it"""
+        clock = datetime.fromtimestamp(self.timestamp).strftime("%H:%M:%S.%f")[:-3]
+        return f"[{clock}] {self.message}"
+
+    def to_dict(self) -> Dict:
+        """JSON-friendly representation"""
+        return {
+            "seq": self.seq,
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(),
+            "level": self.level,
+            "generation": self.generation,
+            "message": self.message,
+            "line": self.format(),
+        }
+
+
+class LogStore:
+    """
+    Ring buffer of LogEntry. Appends overwrite the oldest slot in O(1);
+    reads by sequence number are O(k) in the number of entries returned.
+    Entry N always lives in slot (N - 1) % capacity.
+    """
+
+    def __init__(self, capacity: int = 5000):
+        if capacity < 1:
+            raise ValueError("Log capacity must be at least 1")
+        self.capacity = capacity
+        self.last_seq = 0
+        self._slots: List[Optional[LogEntry]] = [None] * capacity
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self.last_seq, self.capacity)
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained entry (last_seq + 1 when empty)"""
+        return max(1, self.last_seq - self.capacity + 1) if self.last_seq else 1
+
+    def append(self, message: str, level: str = "INFO", generation: int = 0) -> LogEntry:
+        """Store a new entry and return it"""
+        with self._lock:
+            self.last_seq += 1
+            entry = LogEntry(self.last_seq, time.time(), level, generation, message)
+            self._slots[(entry.seq - 1) % self.capacity] = entry
+        return entry
+
+    def _range(self, start: int, end: int) -> List[LogEntry]:
+        """Entries with start <= seq <= end (caller holds the lock)"""
+        return [self._slots[(seq - 1) % self.capacity] for seq in range(start, end + 1)]
+
+    def since(self, seq: int, limit: Optional[int] = None) -> List[LogEntry]:
+        """Entries newer than seq, oldest first, at most limit of them"""
+        with self._lock:
+            start = max(seq + 1, self.first_seq)
+            end = self.last_seq if limit is None else min(self.last_seq, start + limit - 1)
+            return self._range(start, end)
+
+    def tail(self, limit: int) -> List[LogEntry]:
+        """The newest limit entries, oldest first"""
+        with self._lock:
+            if limit <= 0:
+                return []
+            start = max(self.first_seq, self.last_seq - limit + 1)
+            return self._range(start, self.last_seq)
@@ -2,19 +2,26 @@
 main.py - FastAPI Entry Point
 The API that exposes the Organism's internal state to the God View.
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
+import asyncio
 import uvicorn
 import os
 from dotenv import load_dotenv
 
-from watcher import start_watcher, watcher
-
-# Load environment variables
+# Load environment variables (before the watcher reads its configuration)
 load_dotenv()
 
+from watcher import start_watcher, scheduler
+from stream import event_stream, hub
+from mutation_cache import get_mutation_cache
+from architect import get_architect
+from metrics import metrics
+from snapshot import Snapshot, etag_matches
+
 # Initialize FastAPI
 app = FastAPI(
     title="Project Ouroboros API",
@@ -43,20 +50,41 @@ class ChaosRequest(BaseModel):
 
 
 class StatusResponse(BaseModel):
+    organism_id: str
     generation: int
     status: str
     last_mutation: str
     crash_count: int
     successful_runs: int
+    skipped_runs: int
     avg_execution_time: float
     recent_execution_times: List[float]
     uptime: int
     last_error: Optional[str]
+    runner_mode: str
+    cold_starts: int
+    worker_restarts: int
+    avg_cold_start_time: float
+    last_cold_start_time: Optional[float]
+    complexity: Optional[str] = None
+
+
+class LogEntryModel(BaseModel):
+    seq: int
+    timestamp: str
+    level: str
+    generation: int
+    message: str
+    line: str
 
 
 class LogsResponse(BaseModel):
     logs: List[str]
+    entries: List[LogEntryModel]
     count: int
+    next_seq: int
+    first_seq: int
+    truncated: bool
 
 
 class ChaosResponse(BaseModel):
@@ -64,10 +92,22 @@ class ChaosResponse(BaseModel):
     chaos_type: str
 
 
+class RunNowResponse(BaseModel):
+    message: str
+    organism_id: str
+    in_flight: bool
+
+
 class GenomeVersion(BaseModel):
     generation: int
     timestamp: str
     context: str
+    hash: str
+    parent_hash: Optional[str]
+
+
+class GenomeSourceResponse(GenomeVersion):
+    code: str
 
 
 class GenomeHistoryResponse(BaseModel):
@@ -75,17 +115,109 @@ class GenomeHistoryResponse(BaseModel):
     count: int
 
 
+class CacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+    size: int
+    capacity: int
+    evictions: int
+    expirations: int
+
+
+class LLMQueueResponse(BaseModel):
+    provider: str
+    model: str
+    queued: int
+    in_flight: int
+    coalesced: int
+    rate_limited: int
+    paused_for: float
+
+
+class PhaseSummary(BaseModel):
+    organism: str
+    phase: str
+    count: int
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+
+
+class MetricsSummaryResponse(BaseModel):
+    phases: List[PhaseSummary]
+
+
+class OrganismHistory(BaseModel):
+    organism_id: str
+    resolution: str
+    runs: int
+    run: Dict[str, List[float]]
+    cold_start: Dict[str, List[float]]
+
+
+class MetricsHistoryResponse(BaseModel):
+    organisms: List[OrganismHistory]
+    count: int
+
+
+class ScalingBaseline(BaseModel):
+    generation: int
+    profile: Dict
+
+
+class ScalingResponse(BaseModel):
+    organism_id: str
+    generation: int
+    profile: Dict
+    table: str
+    baseline: Optional[ScalingBaseline] = None
+    comparison: Optional[Dict] = None
+
+
+class OrganismListResponse(BaseModel):
+    organisms: List[StatusResponse]
+    count: int
+
+
+def get_watcher(organism_id: Optional[str] = None):
+    """Resolve an organism id to its watcher (default organism when omitted)"""
+    if organism_id is None:
+        return scheduler.default
+    organism = scheduler.get(organism_id)
+    if organism is None:
+        raise HTTPException(status_code=404, detail=f"Unknown organism: {organism_id}")
+    return organism
+
+
+def snapshot_response(snapshot: Snapshot, if_none_match: Optional[str]) -> Response:
+    """Serve a pre-serialized snapshot, or 304 Not Modified if the client already has it"""
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Start the watcher when the API starts"""
     print("🚀 Starting Project Ouroboros...")
     print("=" * 60)
+    hub.attach(asyncio.get_running_loop())
     start_watcher()
-    print("✅ Watcher thread started")
+    mode = "event loop" if scheduler.asynchronous else "thread"
+    print(f"✅ Scheduler started on {mode} ({len(scheduler.watchers)} organisms, {scheduler.max_workers} workers)")
     print("🌐 API ready to serve")
     print("=" * 60)
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the scheduler and its worker processes"""
+    await scheduler.astop()
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -94,59 +226,158 @@ async def root():
         "status": "alive",
         "message": "The Living Software is running",
         "endpoints": {
+            "organisms": "/organisms",
             "status": "/status",
             "logs": "/logs",
-            "chaos": "/chaos"
+            "stream": "/stream",
+            "chaos": "/chaos",
+            "llm": "/llm",
+            "metrics": "/metrics"
         }
     }
 
 
+@app.get("/organisms", response_model=OrganismListResponse)
+async def list_organisms():
+    """
+    List every organism managed by the scheduler.
+    
+    Returns:
+        - organisms: Status of each organism
+        - count: Number of organisms
+    """
+    try:
+        organisms = [StatusResponse(**w.status_snapshot.data) for w in scheduler.watchers.values()]
+        return OrganismListResponse(organisms=organisms, count=len(organisms))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/status", response_model=StatusResponse)
-async def get_status():
+@app.get("/organisms/{organism_id}/status", response_model=StatusResponse)
+async def get_status(organism_id: Optional[str] = None, if_none_match: Optional[str] = Header(None)):
     """
-    Get the current status of the organism.
+    Get the current status of an organism (default organism for /status).
+    Served from a snapshot published on each state change, with an ETag;
+    If-None-Match with the current ETag gets 304 Not Modified.
     
     Returns:
+        - organism_id: Id of the organism
         - generation: Current generation number
         - status: ALIVE, CRASHED, MUTATING, etc.
         - last_mutation: Description of last mutation
         - crash_count: Total number of crashes
         - successful_runs: Total successful cycles
-        - avg_execution_time: Average execution time
+        - skipped_runs: Cycles skipped because known-good source was unchanged (SOURCE_WATCH)
+        - avg_execution_time: Average execution time (warm run time in warm mode)
         - recent_execution_times: Last 5 execution times
         - uptime: Number of log entries (proxy for uptime)
         - last_error: Last error message if any
+        - runner_mode: "warm" (pre-warmed worker) or "subprocess"
+        - cold_starts: Number of runs that paid interpreter startup or re-import
+        - worker_restarts: Warm workers respawned after a crash or freeze (0 in subprocess mode)
+        - avg_cold_start_time: Average startup + import cost of cold runs
+        - last_cold_start_time: Startup + import cost of the latest cold run
     """
-    try:
-        status = watcher.get_status()
-        return StatusResponse(**status)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    watcher = get_watcher(organism_id)
+    return snapshot_response(watcher.status_snapshot, if_none_match)
 
 
 @app.get("/logs", response_model=LogsResponse)
-async def get_logs(limit: int = 50):
+@app.get("/organisms/{organism_id}/logs", response_model=LogsResponse)
+async def get_logs(limit: int = 50, since: Optional[int] = None, organism_id: Optional[str] = None):
     """
-    Get recent execution logs.
+    Get execution logs of an organism.
     
     Args:
         limit: Number of log entries to return (default: 50)
+        since: Cursor - return entries with seq greater than this, oldest
+            first. Omit to get the newest `limit` entries.
     
     Returns:
-        - logs: List of log entries
+        - logs: List of formatted log lines
+        - entries: Structured entries (seq, timestamp, level, generation, message)
         - count: Number of log entries returned
+        - next_seq: Cursor to pass as `since` on the next call
+        - first_seq: Oldest seq still retained
+        - truncated: True if entries after `since` were already overwritten, or
+          if `since` is from before a restart (the newest entries are returned instead)
     """
+    watcher = get_watcher(organism_id)
     try:
-        logs = watcher.get_logs(limit)
-        return LogsResponse(logs=logs, count=len(logs))
+        store = watcher.log_store
+        # A cursor past the newest entry predates a restart: start over from the tail
+        reset = since is not None and since > store.last_seq
+        if reset:
+            since = None
+        entries = watcher.get_log_entries(since, limit)
+        next_seq = entries[-1].seq if entries else (since if since is not None else store.last_seq)
+        return LogsResponse(
+            logs=[entry.format() for entry in entries],
+            entries=[LogEntryModel(**entry.to_dict()) for entry in entries],
+            count=len(entries),
+            next_seq=next_seq,
+            first_seq=store.first_seq,
+            truncated=reset or (since is not None and since + 1 < store.first_seq)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def stream_response(watchers: list, organism_id: Optional[str], limit: int,
+                    last_event_id: Optional[str] = None) -> StreamingResponse:
+    """Open an SSE stream over the given watchers"""
+    def load():
+        snapshot, replay = {}, {}
+        for w in watchers:
+            if last_event_id is not None and last_event_id.isdigit():
+                # Reconnect - send only the lines the client missed
+                snapshot[w.organism_id] = {"status": w.status_snapshot.data}
+                replay[w.organism_id] = w.log_store.since(int(last_event_id))
+            else:
+                snapshot[w.organism_id] = {"status": w.status_snapshot.data, "logs": w.get_log_entries(None, limit)}
+        return snapshot, replay
+    
+    return StreamingResponse(
+        event_stream(hub, organism_id, lambda o: scheduler.get(o).status_snapshot.data, load),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/stream")
+@app.get("/organisms/{organism_id}/stream")
+async def stream_events(
+    limit: int = 20,
+    organism_id: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Server-Sent Events stream of an organism, replacing /status and /logs polling.
+    
+    Events:
+        - snapshot: Full status and the last `limit` log lines (on connect;
+          without logs when resuming from Last-Event-ID)
+        - log: One new structured log entry, the SSE id is its seq
+        - status: Only the status fields that changed
+        - lagged: Events were dropped because the client fell behind;
+          carries the cursors to resume from with /logs?since=
+    """
+    watcher = get_watcher(organism_id)
+    return stream_response([watcher], watcher.organism_id, limit, last_event_id)
+
+
+@app.get("/organisms/stream")
+async def stream_all_events(limit: int = 20):
+    """Server-Sent Events stream covering every organism (same events as /stream)"""
+    return stream_response(list(scheduler.watchers.values()), None, limit)
+
+
 @app.post("/chaos", response_model=ChaosResponse)
-async def inject_chaos(request: ChaosRequest):
+@app.post("/organisms/{organism_id}/chaos", response_model=ChaosResponse)
+async def inject_chaos(request: ChaosRequest, organism_id: Optional[str] = None):
     """
-    Inject chaos into the organism (Chaos Monkey).
+    Inject chaos into an organism (Chaos Monkey) and run it right away.
     
     Supported chaos types:
         - delete_line: Delete a random line of code
@@ -161,6 +392,7 @@ async def inject_chaos(request: ChaosRequest):
         - message: Confirmation message
         - chaos_type: Type of chaos injected
     """
+    watcher = get_watcher(organism_id)
     try:
         chaos_type = request.chaos_type or "random"
         
@@ -170,6 +402,8 @@ async def inject_chaos(request: ChaosRequest):
             chaos_type = random.choice(["delete_line", "syntax_error", "division_by_zero"])
         
         watcher.inject_chaos(chaos_type)
+        # Let the organism crash (and heal) now, not after its backed-off interval
+        scheduler.run_now(watcher.organism_id)
         
         return ChaosResponse(
             message=f"Chaos injected successfully",
@@ -179,6 +413,144 @@ async def inject_chaos(request: ChaosRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/run", response_model=RunNowResponse)
+@app.post("/organisms/{organism_id}/run", response_model=RunNowResponse)
+async def run_now(organism_id: Optional[str] = None):
+    """
+    Run an organism's next cycle now instead of waiting out its adaptive interval.
+    
+    Returns:
+        - message: Confirmation message
+        - organism_id: Id of the organism
+        - in_flight: True if a cycle was already running; another one
+          starts as soon as it finishes
+    """
+    watcher = get_watcher(organism_id)
+    in_flight = scheduler.run_now(watcher.organism_id)
+    return RunNowResponse(
+        message="Cycle queued after the running one" if in_flight else "Cycle scheduled",
+        organism_id=watcher.organism_id,
+        in_flight=in_flight
+    )
+
+
+@app.get("/cache", response_model=CacheStatsResponse)
+async def get_cache_stats():
+    """
+    Mutation cache metrics.
+    
+    Returns:
+        - hits / misses / hit_rate: Lookups served without an LLM call
+        - size / capacity: Stored mutations and the LRU limit
+        - evictions / expirations: Entries dropped by LRU and TTL
+    """
+    try:
+        return CacheStatsResponse(**get_mutation_cache().stats())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/llm", response_model=LLMQueueResponse)
+async def get_llm_queue():
+    """
+    LLM request scheduler state.
+    
+    Returns:
+        - provider / model: The configured LLM backend
+        - queued / in_flight: Calls waiting for budget and calls running
+        - coalesced: Requests that joined an identical in-flight call
+        - rate_limited / paused_for: 429 responses so far and seconds left in the current pause
+    """
+    try:
+        architect = get_architect()
+        return LLMQueueResponse(provider=architect.provider.name, model=architect.model,
+                                **architect.scheduler.stats())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus scrape endpoint.
+    
+    Exports:
+        - ouroboros_phase_seconds: Histogram per organism and phase
+          (spawn, run, llm, validation, write, heal = crash to next healthy run)
+        - ouroboros_mutations_total: Mutations by type and outcome
+        - ouroboros_mutation_cache_lookups_total: Cache hits and misses
+        - ouroboros_llm_requests_total: LLM calls by outcome
+        - ouroboros_llm_first_token_seconds / ouroboros_llm_tokens_per_second: Streamed replies
+        - ouroboros_crashes_total / ouroboros_timeouts_total: Failed runs
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/metrics/summary", response_model=MetricsSummaryResponse)
+async def get_metrics_summary():
+    """
+    Percentiles of each phase over its last 1024 samples.
+    
+    Returns:
+        - phases: count, mean, p50, p95 and p99 per organism and phase
+    """
+    return MetricsSummaryResponse(phases=[PhaseSummary(**s) for s in metrics.phase_seconds.summary()])
+
+
+@app.get("/metrics/history", response_model=MetricsHistoryResponse)
+@app.get("/organisms/{organism_id}/metrics/history", response_model=MetricsHistoryResponse)
+async def get_metrics_history(resolution: str = "minute", since: Optional[float] = None,
+                              limit: Optional[int] = None, organism_id: Optional[str] = None):
+    """
+    Long-horizon run and cold-start timings, every organism unless one is named.
+    
+    Args:
+        resolution: "minute" (last 24h), "hour" (last 30 days) or "raw" (newest samples)
+        since: Only points after this Unix timestamp
+        limit: Only the newest limit points (0 or omitted for all)
+    
+    Returns:
+        - organisms: Per organism, columnar series - t, count, mean, min, max
+          for rollups; t, value for raw samples
+    """
+    if resolution not in ("raw", "minute", "hour"):
+        raise HTTPException(status_code=400, detail=f"Unknown resolution: {resolution}")
+    if limit is not None and limit < 0:
+        raise HTTPException(status_code=400, detail="limit must not be negative")
+    watchers = [get_watcher(organism_id)] if organism_id else list(scheduler.watchers.values())
+    histories = [OrganismHistory(**w.get_history(resolution, since, limit)) for w in watchers]
+    return MetricsHistoryResponse(organisms=histories, count=len(histories))
+
+
+@app.get("/scaling", response_model=ScalingResponse)
+@app.get("/organisms/{organism_id}/scaling", response_model=ScalingResponse)
+async def get_scaling(compare_to: Optional[int] = None, organism_id: Optional[str] = None):
+    """
+    Runtime of the current generation's process() across input sizes 10 to
+    10^6 (seeded inputs, one fresh interpreter per size). Measured once per
+    code version; the first call for a new version takes up to
+    SCALING_BUDGET seconds per size.
+    
+    Args:
+        compare_to: Also profile this earlier generation and compare
+    
+    Returns:
+        - profile: seed, distribution, trials, budget and one row per size -
+          median, min, ns_per_item, checksum, status (ok/timeout/error/skipped)
+        - table: The same rows as a fixed-width text table
+        - baseline, comparison: With compare_to - per-size speedups, output
+          equivalence and a regression verdict
+    """
+    watcher = get_watcher(organism_id)
+    try:
+        result = await asyncio.to_thread(watcher.scaling_profile, compare_to)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Unknown generation: {compare_to}")
+    return ScalingResponse(**result)
+
+
 @app.get("/health")
 async def health_check():
     """Kubernetes/Railway health check endpoint"""
@@ -186,27 +558,46 @@ async def health_check():
 
 
 @app.get("/genome", response_model=GenomeHistoryResponse)
-async def get_genome_history():
+@app.get("/organisms/{organism_id}/genome", response_model=GenomeHistoryResponse)
+async def get_genome_history(limit: int = 50, organism_id: Optional[str] = None,
+                             if_none_match: Optional[str] = Header(None)):
+    """
+    Get the genome history (previous code versions) of an organism.
+    Cached until the next generation is recorded; supports ETag/If-None-Match.
+    
+    Args:
+        limit: Number of newest generations to return (default: 50)
+    
+    Returns:
+        - versions: Generation metadata, oldest first (fetch code via /genome/{generation})
+        - count: Number of versions returned
+    """
+    watcher = get_watcher(organism_id)
+    try:
+        snapshot = watcher.genome_snapshot(limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return snapshot_response(snapshot, if_none_match)
+
+
+@app.get("/genome/{generation}", response_model=GenomeSourceResponse)
+@app.get("/organisms/{organism_id}/genome/{generation}", response_model=GenomeSourceResponse)
+async def get_genome(generation: int, organism_id: Optional[str] = None):
     """
-    Get the genome history (previous code versions).
+    Get the source code of one generation.
     
     Returns:
-        - versions: List of previous code versions
-        - count: Number of versions in history
+        - generation, timestamp, context, hash, parent_hash: Version metadata
+        - code: Source of that generation
     """
+    watcher = get_watcher(organism_id)
     try:
-        history = watcher.genome_history
-        versions = [
-            GenomeVersion(
-                generation=v["generation"],
-                timestamp=v["timestamp"],
-                context=v["context"]
-            )
-            for v in history
-        ]
-        return GenomeHistoryResponse(versions=versions, count=len(versions))
+        version = watcher.get_genome(generation)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if version is None:
+        raise HTTPException(status_code=404, detail=f"Unknown generation: {generation}")
+    return GenomeSourceResponse(**version)
 
 
 if __name__ == "__main__":
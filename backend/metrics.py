@@ -0,0 +1,186 @@
+"""
+metrics.py - The Vital Signs
+Per-phase latency histograms and event counters for every organism,
+rendered in the Prometheus text format. Recording is a bisect plus a few
+appends under a lock, cheap enough to sit inside the watch loop.
+"""
+import bisect
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, List, Tuple
+
+
+# Upper bounds in seconds, from sub-millisecond validation to slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return "+Inf" if value == math.inf else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter, one series per label set"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_labels(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class _Series:
+    """Bucket counts plus a window of recent samples for percentiles"""
+
+    def __init__(self, buckets: int, window: int):
+        self.counts = [0] * (buckets + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram, one series per label set. The last
+    `window` samples of each series are kept to report exact percentiles.
+    """
+
+    def __init__(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS, window: int = 1024):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.window = window
+        self._series: Dict[Labels, _Series] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.buckets), self.window)
+            series.counts[index] += 1
+            series.total += value
+            series.count += 1
+            series.recent.append(value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of a block (works around awaits too)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def summary(self) -> List[Dict]:
+        """Count, mean and p50/p95/p99 of every series"""
+        with self._lock:
+            items = [(key, series.count, series.total, list(series.recent)) for key, series in self._series.items()]
+        result = []
+        for key, count, total, recent in sorted(items):
+            result.append({
+                **dict(key),
+                "count": count,
+                "mean": total / count if count else 0.0,
+                "p50": percentile(recent, 50),
+                "p95": percentile(recent, 95),
+                "p99": percentile(recent, 99),
+            })
+        return result
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (math.inf,), series.counts):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(key, (('le', _format_value(bound)),))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(series.total)}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Every metric the backend exports"""
+
+    def __init__(self):
+        self.phase_seconds = Histogram(
+            "ouroboros_phase_seconds",
+            "Duration of each phase of a watch cycle (spawn, run, llm, validation, write, heal)"
+        )
+        self.mutations = Counter(
+            "ouroboros_mutations_total",
+            "Mutations attempted, by mutation type and outcome (promoted, rejected, conflict, failed)"
+        )
+        self.cache_lookups = Counter(
+            "ouroboros_mutation_cache_lookups_total",
+            "Mutation cache lookups, by result (hit, miss)"
+        )
+        self.llm_requests = Counter(
+            "ouroboros_llm_requests_total",
+            "LLM calls by outcome (completed, failed, aborted = streamed reply abandoned, "
+            "rate_limited = retried after a 429, coalesced = joined a duplicate)"
+        )
+        self.llm_first_token = Histogram(
+            "ouroboros_llm_first_token_seconds",
+            "Time from sending a streamed LLM request to its first token"
+        )
+        self.llm_throughput = Histogram(
+            "ouroboros_llm_tokens_per_second",
+            "Generation speed of streamed LLM replies after the first token (about 4 characters a token)",
+            buckets=(10, 25, 50, 100, 200, 400, 800, 1600)
+        )
+        self.crashes = Counter("ouroboros_crashes_total", "Organism runs that exited with an error")
+        self.timeouts = Counter("ouroboros_timeouts_total", "Organism runs that exceeded the timeout")
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        for metric in (self.phase_seconds, self.mutations, self.cache_lookups, self.llm_requests,
+                       self.llm_first_token, self.llm_throughput, self.crashes, self.timeouts):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+metrics = MetricsRegistry()
@@ -0,0 +1,162 @@
+"""
+mutation_cache.py - The Immune Memory
+Remembers validated mutations keyed by (normalized error signature, code
+hash, mutation type), so a repeat of a known failure heals without an
+LLM round-trip.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from runner import source_hash
+
+
+_NOISE = [
+    (re.compile(r'File "[^"]*[\\/]([^"\\/]+)"'), r'File "\1"'),  # absolute paths -> file name
+    (re.compile(r"\bline \d+"), "line N"),  # line numbers
+    (re.compile(r"0x[0-9a-fA-F]+"), "0x?"),  # object addresses
+    (re.compile(r"^\s*[~^]+\s*$", re.MULTILINE), ""),  # caret markers under the failing expression
+    (re.compile(r"\d{2}:\d{2}:\d{2}(\.\d+)?"), "HH:MM:SS"),  # timestamps
+    (re.compile(r"\s+"), " "),
+]
+
+
+def error_signature(error_log: str, mutation_type: str) -> str:
+    """Normalize an error log so repeats of the same failure compare equal"""
+    if mutation_type == "OPTIMIZATION":
+        # The performance context is organism output, which is noise for caching
+        return "OPTIMIZATION"
+    signature = error_log
+    for pattern, replacement in _NOISE:
+        signature = pattern.sub(replacement, signature)
+    return signature.strip()
+
+
+class MutationCache:
+    """
+    Two-level LRU cache with TTL: an in-memory OrderedDict in front of a
+    SQLite table so entries survive restarts. Only mutations that passed
+    validation are stored.
+    """
+
+    def __init__(self, path: str, capacity: int = 1000, ttl: float = 7 * 24 * 3600):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._memory: "OrderedDict[str, Tuple[str, str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS mutations ("
+            "key TEXT PRIMARY KEY, fixed_code TEXT NOT NULL, explanation TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def key(self, error_log: str, current_code: str, mutation_type: str) -> str:
+        """Cache key of a mutation request"""
+        material = "\0".join([mutation_type, error_signature(error_log, mutation_type), source_hash(current_code)])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, entry: Tuple[str, str, float]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def get(self, error_log: str, current_code: str, mutation_type: str) -> Optional[Tuple[str, str]]:
+        """Cached (fixed_code, explanation) or None"""
+        key = self.key(error_log, current_code, mutation_type)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._conn.execute(
+                    "SELECT fixed_code, explanation, created_at FROM mutations WHERE key = ?", (key,)
+                ).fetchone()
+                entry = tuple(row) if row else None
+
+            if entry is not None and now - entry[2] > self.ttl:
+                self._delete(key)
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._remember(key, entry)
+            with self._conn:
+                self._conn.execute("UPDATE mutations SET last_used = ? WHERE key = ?", (now, key))
+            return entry[0], entry[1]
+
+    def put(self, error_log: str, current_code: str, mutation_type: str, fixed_code: str, explanation: str):
+        """Remember a validated mutation, evicting the least recently used entries past capacity"""
+        key = self.key(error_log, current_code, mutation_type)
+        now = time.time()
+        with self._lock:
+            self._remember(key, (fixed_code, explanation, now))
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO mutations (key, fixed_code, explanation, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, fixed_code, explanation, now, now)
+                )
+                evicted = self._conn.execute(
+                    "DELETE FROM mutations WHERE key IN ("
+                    "SELECT key FROM mutations ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.capacity,)
+                ).rowcount
+            self.evictions += max(0, evicted)
+
+    def invalidate(self, error_log: str, current_code: str, mutation_type: str):
+        """Forget a mutation that turned out to be bad"""
+        with self._lock:
+            self._delete(self.key(error_log, current_code, mutation_type))
+
+    def _delete(self, key: str):
+        self._memory.pop(key, None)
+        with self._conn:
+            self._conn.execute("DELETE FROM mutations WHERE key = ?", (key,))
+
+    def stats(self) -> Dict:
+        """Hit-rate metrics"""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM mutations").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "size": size,
+            "capacity": self.capacity,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+# Global mutation cache
+mutation_cache = None
+
+
+def get_mutation_cache() -> MutationCache:
+    """Get or create the mutation cache (MUTATION_CACHE_DB, default backend/mutation_cache.db)"""
+    global mutation_cache
+    if mutation_cache is None:
+        default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mutation_cache.db")
+        mutation_cache = MutationCache(
+            os.getenv("MUTATION_CACHE_DB", default_path),
+            capacity=int(os.getenv("MUTATION_CACHE_SIZE", "1000")),
+            ttl=float(os.getenv("MUTATION_CACHE_TTL", str(7 * 24 * 3600)))
+        )
+    return mutation_cache
@@ -2,32 +2,75 @@
 organism.py - The Living Worker
 This script performs tasks and can be mutated by the Architect.
 """
-import time
+import os
 import random
+import time
 
 
-def run():
-    """Main execution loop of the organism"""
-    print("🧬 Organism Generation 1 - ALIVE")
-    print("=" * 50)
-    
-    # Simulating work - sorting task
-    data = [random.randint(1, 100) for _ in range(10)]
-    print(f"📊 Processing data: {data}")
-    
-    # Bubble sort (intentionally slow - the AI will optimize this)
-    sorted_data = data.copy()
+def process(data):
+    """
+    The organism's work: return the data sorted. Kept free of I/O so the
+    benchmark suite can time it on its own.
+    """
+    sorted_data = list(data)
     n = len(sorted_data)
+    # Bubble sort (intentionally slow - the AI will optimize this)
     for i in range(n):
         for j in range(0, n - i - 1):
             if sorted_data[j] > sorted_data[j + 1]:
                 sorted_data[j], sorted_data[j + 1] = sorted_data[j + 1], sorted_data[j]
-    
-    print(f"✅ Sorted: {sorted_data}")
-    
+    return sorted_data
+
+
+def generate_data(size=10, seed=None, distribution="uniform"):
+    """
+    Workload of `size` ints in 1..100 (1..size for larger inputs).
+    distribution: uniform, sorted, reversed, nearly_sorted or few_unique.
+    seed=None draws from the global random state.
+    """
+    rng = random.Random(seed) if seed is not None else random
+    high = max(100, size)
+    if distribution == "few_unique":
+        return [rng.randint(1, 5) for _ in range(size)]
+    data = [rng.randint(1, high) for _ in range(size)]
+    if distribution in ("sorted", "nearly_sorted"):
+        data.sort()
+    elif distribution == "reversed":
+        data.sort(reverse=True)
+    if distribution == "nearly_sorted":
+        for _ in range(max(1, size // 100)):
+            a, b = rng.randrange(size), rng.randrange(size)
+            data[a], data[b] = data[b], data[a]
+    elif distribution not in ("uniform", "sorted", "reversed"):
+        raise ValueError(f"Unknown distribution: {distribution}")
+    return data
+
+
+def run(size=None, seed=None, distribution=None):
+    """Main execution loop of the organism (ORGANISM_SIZE / ORGANISM_DISTRIBUTION set the workload)"""
+    size = size if size is not None else int(os.getenv("ORGANISM_SIZE", "10"))
+    distribution = distribution or os.getenv("ORGANISM_DISTRIBUTION", "uniform")
+
+    print("🧬 Organism Generation 1 - ALIVE")
+    print("=" * 50)
+
+    # Simulating work - sorting task
+    data = generate_data(size, seed, distribution)
+    if size <= 20:
+        print(f"📊 Processing data: {data}")
+    else:
+        print(f"📊 Processing {size:,} values ({distribution})")
+
+    sorted_data = process(data)
+
+    if size <= 20:
+        print(f"✅ Sorted: {sorted_data}")
+    else:
+        print(f"✅ Sorted {len(sorted_data):,} values: {sorted_data[0]} .. {sorted_data[-1]}")
+
     # Simulating computation time
-    time.sleep(0.5)
-    
+    time.sleep(float(os.getenv("ORGANISM_DELAY", "0.5")))
+
     print("💚 Work cycle complete")
     print("=" * 50)
 
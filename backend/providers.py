@@ -0,0 +1,245 @@
+"""
+providers.py - The Synapses
+LLM backends behind one interface. GroqProvider talks to the Groq API;
+LocalProvider is a deterministic, offline stand-in that repairs the chaos
+types from inject_chaos with rule-based source edits, so the healing
+pipeline can be load-tested without a network or an API key.
+"""
+import ast
+import os
+import re
+import time
+from typing import Dict, Iterator, List, Optional
+
+
+class TruncatedCompletion(Exception):
+    """The model stopped because it ran out of reply tokens"""
+
+
+class LLMProvider:
+    """
+    Interface for code-generating backends. `messages` is the chat prompt;
+    `request` carries the structured context behind it (error_log,
+    current_code, mutation_type and optionally baseline, the last promoted
+    code) for providers that do not read prompts.
+    """
+
+    name = "base"
+    model = ""
+    streams = False  # Whether stream() yields tokens as they are generated
+    rate_limits: Optional[Dict[str, float]] = None  # Default {"rpm", "tpm"} budget; None is unlimited
+
+    def complete(self, messages: List[Dict], request: Dict, temperature: float = 0.3,
+                 max_tokens: int = 2000) -> str:
+        """Return the model's reply (code, possibly wrapped in markdown fences)"""
+        raise NotImplementedError
+
+    def stream(self, messages: List[Dict], request: Dict, temperature: float = 0.3,
+               max_tokens: int = 2000) -> Iterator[str]:
+        """
+        Yield the reply in pieces as it is generated; closing the generator
+        abandons the call. Raises TruncatedCompletion if the reply was cut
+        off at max_tokens. By default the whole reply arrives as one piece.
+        """
+        yield self.complete(messages, request, temperature, max_tokens)
+
+
+class GroqProvider(LLMProvider):
+    """Hosted Groq models"""
+
+    name = "groq"
+    streams = True
+    rate_limits = {"rpm": 30, "tpm": 6000}  # Free tier
+
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+        self.api_key = api_key or os.getenv("GROQ_API_KEY")
+        if not self.api_key:
+            raise ValueError("GROQ_API_KEY not found in environment variables")
+
+        from groq import Groq
+
+        self.client = Groq(api_key=self.api_key)
+        self.model = model or os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")  # Fast and smart model
+
+    def complete(self, messages: List[Dict], request: Dict, temperature: float = 0.3,
+                 max_tokens: int = 2000) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content
+
+    def stream(self, messages: List[Dict], request: Dict, temperature: float = 0.3,
+               max_tokens: int = 2000) -> Iterator[str]:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        try:
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.delta.content:
+                    yield choice.delta.content
+                if choice.finish_reason == "length":
+                    raise TruncatedCompletion(f"reply cut off at max_tokens={max_tokens}")
+        finally:
+            response.close()  # Abandoning the generator drops the HTTP stream too
+
+
+def rate_limit_delay(error: Exception) -> Optional[float]:
+    """
+    None unless the error is a provider rate limit (HTTP 429); otherwise
+    the server's Retry-After in seconds, or 0.0 if it sent none.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429 and type(error).__name__ != "RateLimitError":
+        return None
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _is_zero(node: ast.AST) -> bool:
+    return isinstance(node, ast.Constant) and not isinstance(node.value, bool) and node.value == 0
+
+
+def _divides_by_zero(stmt: ast.stmt) -> bool:
+    """Whether a simple statement divides by a literal zero"""
+    return any(
+        isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Div, ast.FloorDiv, ast.Mod)) and _is_zero(node.right)
+        for node in ast.walk(stmt)
+    )
+
+
+def _is_bubble_sort(stmt: ast.stmt) -> Optional[str]:
+    """Name of the list sorted in place by a nested-loop exchange sort, if stmt is one"""
+    if not (isinstance(stmt, ast.For) and len(stmt.body) == 1 and isinstance(stmt.body[0], ast.For)):
+        return None
+    inner = stmt.body[0]
+    if not (len(inner.body) == 1 and isinstance(inner.body[0], ast.If)):
+        return None
+    check = inner.body[0]
+    if not (isinstance(check.test, ast.Compare) and len(check.body) == 1 and isinstance(check.body[0], ast.Assign)):
+        return None
+    swap = check.body[0]
+    if not (isinstance(swap.targets[0], ast.Tuple) and isinstance(swap.value, ast.Tuple)):
+        return None
+    names = {
+        element.value.id for element in swap.targets[0].elts
+        if isinstance(element, ast.Subscript) and isinstance(element.value, ast.Name)
+    }
+    return names.pop() if len(names) == 1 else None
+
+
+def _blocks(tree: ast.AST):
+    """Every statement list in the tree"""
+    for node in ast.walk(tree):
+        for field in ("body", "orelse", "finalbody"):
+            block = getattr(node, field, None)
+            if isinstance(block, list) and block and isinstance(block[0], ast.stmt):
+                yield block
+
+
+def _replace_lines(lines: List[str], stmt: ast.stmt, replacement: str) -> None:
+    """Replace a statement's source lines, keeping its indentation"""
+    indent = re.match(r"\s*", lines[stmt.lineno - 1]).group(0)
+    lines[stmt.lineno - 1:stmt.end_lineno] = [f"{indent}{replacement}\n"] if replacement else []
+
+
+class LocalProvider(LLMProvider):
+    """
+    Offline stand-in. Crash fixes drop lines that do not parse and
+    statements that divide by zero; optimizations swap exchange sorts for
+    list.sort(). Anything else falls back to the baseline genome. Edits are
+    line-based so comments and layout survive. LOCAL_LLM_LATENCY adds a
+    simulated round-trip delay.
+    """
+
+    name = "local"
+    model = "local-rules"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def complete(self, messages: List[Dict], request: Dict, temperature: float = 0.3,
+                 max_tokens: int = 2000) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._mutate(request)
+
+    def _mutate(self, request: Dict) -> str:
+        code = request["current_code"]
+        fixed = self._optimize(code) if request.get("mutation_type") == "OPTIMIZATION" else self._fix(code)
+        if fixed is not None and fixed != code:
+            return fixed
+
+        baseline = request.get("baseline")
+        if baseline and baseline != code:
+            return baseline
+        raise ValueError("Local provider has no rule for this mutation and no baseline genome")
+
+    def _fix(self, code: str) -> Optional[str]:
+        lines = code.splitlines(keepends=True)
+
+        # Syntax errors: drop the offending line until the module parses
+        for _ in range(5):
+            try:
+                tree = ast.parse("".join(lines))
+                break
+            except SyntaxError as e:
+                if not e.lineno or e.lineno > len(lines):
+                    return None
+                del lines[e.lineno - 1]
+        else:
+            return None
+
+        # Runtime chaos: statements dividing by a literal zero
+        doomed = []
+        for block in _blocks(tree):
+            hits = [stmt for stmt in block if not hasattr(stmt, "body") and _divides_by_zero(stmt)]
+            doomed.extend((stmt, "pass" if len(hits) == len(block) else "") for stmt in hits)
+        for stmt, replacement in sorted(doomed, key=lambda item: item[0].lineno, reverse=True):
+            _replace_lines(lines, stmt, replacement)
+
+        return "".join(lines)
+
+    def _optimize(self, code: str) -> Optional[str]:
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            return None
+
+        lines = code.splitlines(keepends=True)
+        sorts = [
+            (stmt, name) for block in _blocks(tree) for stmt in block
+            if (name := _is_bubble_sort(stmt))
+        ]
+        for stmt, name in sorted(sorts, key=lambda item: item[0].lineno, reverse=True):
+            _replace_lines(lines, stmt, f"{name}.sort()")
+        return "".join(lines)
+
+
+PROVIDERS = {
+    "groq": GroqProvider,
+    "local": LocalProvider,
+}
+
+
+def get_provider(name: Optional[str] = None) -> LLMProvider:
+    """Create the provider named by LLM_PROVIDER (groq or local)"""
+    name = (name or os.getenv("LLM_PROVIDER", "groq")).lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown LLM provider: {name} (expected one of {', '.join(PROVIDERS)})")
+    if name == "local":
+        return LocalProvider(latency=float(os.getenv("LOCAL_LLM_LATENCY", "0")))
+    return PROVIDERS[name]()
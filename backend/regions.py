@@ -0,0 +1,204 @@
+"""
+regions.py - The Scalpel
+Finds the function a mutation should touch (from the traceback, or the
+most deeply nested loops for optimizations), builds a compact view of the
+rest of the module, and splices a model's reply - a replacement function
+or a unified diff - back into the full source.
+"""
+import ast
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+_FRAME = re.compile(r'File "[^"]*", line (\d+)(?:, in (\S+))?')
+
+
+def compact_error(error_log: str, max_lines: int = 20, max_chars: int = 1500) -> str:
+    """Traceback without blank or caret lines, trimmed from the top (the end holds the exception)"""
+    lines = [line.rstrip() for line in error_log.strip().splitlines() if line.strip()]
+    # Caret lines under the failing expression add nothing for the model
+    lines = [line for line in lines if not re.fullmatch(r"\s*[~^]+\s*", line)]
+    if len(lines) > max_lines:
+        lines = lines[:1] + ["..."] + lines[-(max_lines - 2):]
+    text = "\n".join(lines)
+    return text if len(text) <= max_chars else "..." + text[-max_chars:]
+
+
+def _functions(tree: ast.AST) -> List[Dict]:
+    """Top-level functions and methods with their line spans (decorators included)"""
+    found = []
+    for node in tree.body:
+        members = [node] + (node.body if isinstance(node, ast.ClassDef) else [])
+        for member in members:
+            if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                start = min([member.lineno] + [d.lineno for d in member.decorator_list])
+                found.append({"name": member.name, "start": start, "end": member.end_lineno, "node": member})
+    return found
+
+
+def _loop_depth(node: ast.AST) -> int:
+    """Deepest loop nesting inside a node"""
+    depth = 0
+    for child in ast.iter_child_nodes(node):
+        inner = _loop_depth(child)
+        if isinstance(child, (ast.For, ast.While, ast.AsyncFor)):
+            inner += 1
+        depth = max(depth, inner)
+    return depth
+
+
+def _region(lines: List[str], name: str, start: int, end: int) -> Dict:
+    return {
+        "name": name,
+        "start": start,
+        "end": end,
+        "source": "".join(lines[start - 1:end]),
+        "indent": re.match(r"\s*", lines[start - 1]).group(0),
+    }
+
+
+def _scan_function(lines: List[str], line: int) -> Optional[Dict]:
+    """Enclosing top-level def by indentation, for code that does not parse"""
+    start = next((i for i in range(min(line, len(lines)), 0, -1) if re.match(r"(async\s+)?def\s+\w+", lines[i - 1])), None)
+    if start is None:
+        return None
+    end = start
+    for i in range(start + 1, len(lines) + 1):
+        text = lines[i - 1]
+        if text.strip() and not text[0].isspace():
+            break
+        if text.strip():
+            end = i
+    if line > end:
+        return None
+    name = re.match(r"(?:async\s+)?def\s+(\w+)", lines[start - 1]).group(1)
+    return _region(lines, name, start, end)
+
+
+def locate_region(code: str, error_log: str, mutation_type: str) -> Optional[Dict]:
+    """
+    The function to mutate: for crashes the innermost traceback frame that
+    falls inside a function of this module, for optimizations the function
+    with the deepest loop nesting. None means "send the whole file".
+    """
+    lines = code.splitlines(keepends=True)
+    try:
+        functions = _functions(ast.parse(code))
+    except SyntaxError:
+        functions = None
+
+    if mutation_type == "OPTIMIZATION":
+        if not functions:
+            return None
+        best = max(functions, key=lambda f: (_loop_depth(f["node"]), f["end"] - f["start"]))
+        if _loop_depth(best["node"]) == 0:
+            return None
+        return _region(lines, best["name"], best["start"], best["end"])
+
+    for match in reversed(list(_FRAME.finditer(error_log))):
+        line, func = int(match.group(1)), match.group(2)
+        if functions is None:
+            region = _scan_function(lines, line)
+            if region:
+                return region
+            continue
+        for f in functions:
+            if f["start"] <= line <= f["end"] and (func is None or func == f["name"]):
+                return _region(lines, f["name"], f["start"], f["end"])
+    return None
+
+
+def module_context(code: str, region: Dict) -> str:
+    """Imports, signatures and module-level lines outside the region, with bodies elided"""
+    lines = code.splitlines()
+    marker = f"# ... {region['name']}() shown above ..."
+    outside = lines[:region["start"] - 1] + [region["indent"] + marker] + lines[region["end"]:]
+    context = []
+    in_body = False
+    for line in outside:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#") and stripped != marker:
+            continue
+        if re.match(r"\s*(async\s+)?(def|class)\s", line) or not line[0].isspace():
+            in_body = re.match(r"\s*(async\s+)?(def|class)\s", line) is not None
+            context.append(line)
+        elif not in_body or stripped == marker:
+            context.append(line)
+    return "\n".join(context)
+
+
+def _looks_like_diff(reply: str) -> bool:
+    return bool(re.search(r"^@@.*@@", reply, re.MULTILINE))
+
+
+def apply_unified_diff(code: str, diff: str) -> str:
+    """Apply a unified diff by matching each hunk's context (line numbers are not trusted)"""
+    lines = code.splitlines()
+    hunks: List[Tuple[List[str], List[str]]] = []
+    current = None
+    for line in diff.splitlines():
+        if line.startswith("@@"):
+            current = ([], [])
+            hunks.append(current)
+        elif current is None or line.startswith(("---", "+++")):
+            continue
+        elif line.startswith("-"):
+            current[0].append(line[1:])
+        elif line.startswith("+"):
+            current[1].append(line[1:])
+        elif line.startswith(" ") or line == "":
+            current[0].append(line[1:])
+            current[1].append(line[1:])
+
+    position = 0
+    for old, new in hunks:
+        index = _find_block(lines, old, position)
+        if index is None:
+            raise ValueError("Diff hunk does not match the current code")
+        lines[index:index + len(old)] = new
+        position = index + len(new)
+    return "\n".join(lines) + "\n"
+
+
+def _find_block(lines: List[str], block: List[str], start: int) -> Optional[int]:
+    """First index at or after start where block matches (ignoring trailing whitespace)"""
+    if not block:
+        return start
+    target = [line.rstrip() for line in block]
+    for i in range(start, len(lines) - len(block) + 1):
+        if [line.rstrip() for line in lines[i:i + len(block)]] == target:
+            return i
+    return None
+
+
+def _replacement_function(reply: str, name: str) -> Optional[str]:
+    """Source of the function `name` in the reply, dedented to column zero"""
+    try:
+        tree = ast.parse(reply)
+    except SyntaxError:
+        return None
+    reply_lines = reply.splitlines(keepends=True)
+    for f in _functions(tree):
+        if f["name"] == name:
+            text = reply_lines[f["start"] - 1:f["end"]]
+            indent = re.match(r"\s*", text[0]).group(0)
+            return "".join(line[len(indent):] if line.startswith(indent) else line for line in text)
+    return None
+
+
+def apply_region_reply(code: str, region: Dict, reply: str) -> str:
+    """Splice the model's reply (diff, replacement function, or whole file) into the full source"""
+    if _looks_like_diff(reply):
+        return apply_unified_diff(code, reply)
+
+    function = _replacement_function(reply, region["name"])
+    if function is None:
+        raise ValueError(f"Reply does not contain a function named {region['name']}")
+    indented = "".join(
+        region["indent"] + line if line.strip() else line
+        for line in function.splitlines(keepends=True)
+    )
+    if not indented.endswith("\n"):
+        indented += "\n"
+    lines = code.splitlines(keepends=True)
+    return "".join(lines[:region["start"] - 1]) + indented + "".join(lines[region["end"]:])
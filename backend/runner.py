@@ -0,0 +1,512 @@
+"""
+runner.py - The Incubator
+Executes organism.py either in a fresh subprocess or inside a long-lived,
+pre-warmed worker that only re-imports the organism when its source changes.
+"""
+import asyncio
+import contextlib
+import faulthandler
+import hashlib
+import io
+import json
+import linecache
+import os
+import random
+import select
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+import types
+from typing import Dict, Optional
+
+
+RUNNER_PATH = os.path.abspath(__file__)
+# Bytes of a dead worker's stderr kept in its crash result
+STDERR_TAIL = 4096
+
+
+def source_hash(source: str) -> str:
+    """Content hash used to detect organism changes"""
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def _worker_command() -> list:
+    """Command line that starts a warm worker"""
+    return [sys.executable, "-u", RUNNER_PATH, "--worker"]
+
+
+def _run_request(path: str, source: Optional[str] = None, seed: Optional[int] = None) -> str:
+    """Encode a run request for the worker (source overrides the file, seed fixes random)"""
+    return json.dumps({"op": "run", "path": path, "source": source, "seed": seed}) + "\n"
+
+
+def _stderr_tail(log) -> str:
+    """
+    End of a worker's stderr file. Organism output is captured in-process,
+    so what lands here is what bypassed Python: fatal errors, faulthandler
+    tracebacks and fd-level writes.
+    """
+    if log is None or log.closed:
+        return ""
+    size = log.seek(0, os.SEEK_END)
+    log.seek(max(0, size - STDERR_TAIL))
+    return log.read().decode("utf-8", errors="replace").strip()
+
+
+def _worker_crash_result(error: Exception, spawn_time: float, stderr: str = "") -> Dict:
+    """Result reported when the worker itself died mid-run"""
+    return {
+        "returncode": -1,
+        "stdout": "",
+        "stderr": f"{error}\n{stderr}" if stderr else str(error),
+        "run_time": 0.0,
+        "cold": True,
+        "cold_start_time": spawn_time,
+    }
+
+
+def _warm_result(response: Dict, spawn_time: float) -> Dict:
+    """Convert a worker response into a runner result"""
+    return {
+        "returncode": response["returncode"],
+        "stdout": response["stdout"],
+        "stderr": response["stderr"],
+        "run_time": response["run_time"],
+        "cold": spawn_time > 0 or response["imported"],
+        "cold_start_time": spawn_time + response["import_time"],
+    }
+
+
+class SubprocessRunner:
+    """Cold runner - spawns a fresh interpreter for every cycle"""
+
+    mode = "subprocess"
+    worker_restarts = 0  # No persistent worker to restart
+
+    def __init__(self, path: str, timeout: float = 10.0):
+        self.path = os.path.abspath(path)
+        self.timeout = timeout
+        self.cold_starts = 0
+
+    def run(self) -> Dict:
+        """Run the organism once, raising subprocess.TimeoutExpired on freeze"""
+        start_time = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, os.path.basename(self.path)],
+            capture_output=True,
+            text=True,
+            timeout=self.timeout,
+            cwd=os.path.dirname(self.path)
+        )
+        elapsed = time.perf_counter() - start_time
+        self.cold_starts += 1
+
+        # Startup and execution cannot be separated here, the whole run is cold
+        return {
+            "returncode": result.returncode,
+            "stdout": result.stdout,
+            "stderr": result.stderr,
+            "run_time": elapsed,
+            "cold": True,
+            "cold_start_time": elapsed,
+        }
+
+    def close(self):
+        """Nothing to release"""
+
+
+class WarmRunner:
+    """
+    Warm runner - keeps one child interpreter alive and asks it to run
+    the organism over a pipe. The child re-imports organism.py only when
+    its content hash changes, so interpreter startup and imports are paid
+    once instead of every cycle. A crash or freeze only kills the child,
+    which is respawned on the next run.
+    """
+
+    mode = "warm"
+
+    def __init__(self, path: str, timeout: float = 10.0):
+        self.path = os.path.abspath(path)
+        self.timeout = timeout
+        self.process: Optional[subprocess.Popen] = None
+        self.cold_starts = 0
+        self.worker_spawns = 0
+        self._spawn_time = 0.0
+        self._stderr = None  # Temporary file the current worker's stderr goes to
+
+    @property
+    def worker_restarts(self) -> int:
+        """Workers started after the first one - each crash or freeze costs one"""
+        return max(0, self.worker_spawns - 1)
+
+    def _spawn(self):
+        """Start a worker and wait until its interpreter is ready"""
+        start_time = time.perf_counter()
+        self._close_stderr()
+        # A file rather than a pipe: nobody reads it until the worker dies, so it must never fill up
+        self._stderr = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            _worker_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            text=True,
+            bufsize=1,
+            cwd=os.path.dirname(self.path)
+        )
+        self._read_response(self.timeout)
+        self._spawn_time = time.perf_counter() - start_time
+        self.worker_spawns += 1
+
+    def _close_stderr(self):
+        if self._stderr is not None:
+            self._stderr.close()
+            self._stderr = None
+
+    def _read_response(self, timeout: float) -> Dict:
+        """Read one JSON line from the worker or fail on freeze/death"""
+        ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+        if not ready:
+            self._kill()
+            raise subprocess.TimeoutExpired(RUNNER_PATH, timeout)
+
+        line = self.process.stdout.readline()
+        if not line:
+            returncode = self.process.wait()
+            self.process = None
+            raise ChildProcessError(f"Worker process died (exit code {returncode})")
+        return json.loads(line)
+
+    def _kill(self):
+        """Terminate the worker, it will be respawned on demand"""
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+
+    def run(self, source: Optional[str] = None, seed: Optional[int] = None) -> Dict:
+        """
+        Run the organism once, raising subprocess.TimeoutExpired on freeze.
+        Passing source runs that code instead of the file; seed seeds
+        random before the run so different versions see the same inputs.
+        """
+        spawn_time = 0.0
+        if self.process is None or self.process.poll() is not None:
+            self._spawn()
+            spawn_time = self._spawn_time
+
+        try:
+            self.process.stdin.write(_run_request(self.path, source, seed))
+            self.process.stdin.flush()
+            response = self._read_response(self.timeout)
+        except (BrokenPipeError, ChildProcessError) as e:
+            # Hard crash (segfault, os._exit) - isolated to the worker
+            self._kill()
+            return _worker_crash_result(e, spawn_time, _stderr_tail(self._stderr))
+
+        result = _warm_result(response, spawn_time)
+        if result["cold"]:
+            self.cold_starts += 1
+        return result
+
+    def close(self):
+        """Shut the worker down"""
+        self._kill()
+        self._close_stderr()
+
+
+class AsyncSubprocessRunner:
+    """Cold runner for the asyncio watch loop"""
+
+    mode = "subprocess"
+    worker_restarts = 0  # No persistent worker to restart
+
+    def __init__(self, path: str, timeout: float = 10.0):
+        self.path = os.path.abspath(path)
+        self.timeout = timeout
+        self.cold_starts = 0
+
+    async def run(self) -> Dict:
+        """Run the organism once, raising subprocess.TimeoutExpired on freeze"""
+        start_time = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, os.path.basename(self.path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=os.path.dirname(self.path)
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), self.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise subprocess.TimeoutExpired(self.path, self.timeout)
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+        elapsed = time.perf_counter() - start_time
+        self.cold_starts += 1
+
+        return {
+            "returncode": process.returncode,
+            "stdout": stdout.decode(errors="replace"),
+            "stderr": stderr.decode(errors="replace"),
+            "run_time": elapsed,
+            "cold": True,
+            "cold_start_time": elapsed,
+        }
+
+    def close(self):
+        """Nothing to release"""
+
+    async def aclose(self):
+        """Nothing to release"""
+
+
+class AsyncWarmRunner:
+    """Warm runner for the asyncio watch loop - same worker protocol as WarmRunner"""
+
+    mode = "warm"
+
+    def __init__(self, path: str, timeout: float = 10.0):
+        self.path = os.path.abspath(path)
+        self.timeout = timeout
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.cold_starts = 0
+        self.worker_spawns = 0
+        self._stderr = None  # Temporary file the current worker's stderr goes to
+
+    @property
+    def worker_restarts(self) -> int:
+        """Workers started after the first one - each crash or freeze costs one"""
+        return max(0, self.worker_spawns - 1)
+
+    async def _spawn(self) -> float:
+        """Start a worker and wait until its interpreter is ready"""
+        start_time = time.perf_counter()
+        self._close_stderr()
+        self._stderr = tempfile.TemporaryFile()
+        self.process = await asyncio.create_subprocess_exec(
+            *_worker_command(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=self._stderr,
+            cwd=os.path.dirname(self.path),
+            limit=2 ** 24
+        )
+        await self._read_response(self.timeout)
+        self.worker_spawns += 1
+        return time.perf_counter() - start_time
+
+    def _close_stderr(self):
+        if self._stderr is not None:
+            self._stderr.close()
+            self._stderr = None
+
+    async def _read_response(self, timeout: float) -> Dict:
+        """Read one JSON line from the worker or fail on freeze/death"""
+        try:
+            line = await asyncio.wait_for(self.process.stdout.readline(), timeout)
+        except asyncio.TimeoutError:
+            await self._kill()
+            raise subprocess.TimeoutExpired(RUNNER_PATH, timeout)
+        except asyncio.CancelledError:
+            # The worker may be mid-run, never reuse it
+            await self._kill()
+            raise
+
+        if not line:
+            returncode = await self.process.wait()
+            self.process = None
+            raise ChildProcessError(f"Worker process died (exit code {returncode})")
+        return json.loads(line)
+
+    async def run(self, source: Optional[str] = None, seed: Optional[int] = None) -> Dict:
+        """Run the organism (or the given source) once, raising subprocess.TimeoutExpired on freeze"""
+        spawn_time = 0.0
+        if self.process is None or self.process.returncode is not None:
+            spawn_time = await self._spawn()
+
+        try:
+            self.process.stdin.write(_run_request(self.path, source, seed).encode())
+            await self.process.stdin.drain()
+            response = await self._read_response(self.timeout)
+        except (BrokenPipeError, ConnectionResetError, ChildProcessError) as e:
+            await self._kill()
+            return _worker_crash_result(e, spawn_time, _stderr_tail(self._stderr))
+
+        result = _warm_result(response, spawn_time)
+        if result["cold"]:
+            self.cold_starts += 1
+        return result
+
+    def close(self):
+        """Kill the worker without waiting for it (for callers outside the event loop)"""
+        if self.process is not None:
+            if self.process.returncode is None:
+                self.process.kill()
+            self.process = None
+        self._close_stderr()
+
+    async def _kill(self):
+        """Kill the worker and reap it, it will be respawned on demand"""
+        process, self.process = self.process, None
+        if process is not None:
+            if process.returncode is None:
+                process.kill()
+            await process.wait()
+
+    async def aclose(self):
+        """Shut the worker down and reap it"""
+        await self._kill()
+        self._close_stderr()
+
+
+def trial_run(source: str, path: str, timeout: float = 10.0) -> Dict:
+    """Run candidate source once in a throwaway sandbox worker"""
+    sandbox = WarmRunner(path, timeout)
+    try:
+        return sandbox.run(source)
+    finally:
+        sandbox.close()
+
+
+async def atrial_run(source: str, path: str, timeout: float = 10.0) -> Dict:
+    """Async version of trial_run"""
+    sandbox = AsyncWarmRunner(path, timeout)
+    try:
+        return await sandbox.run(source)
+    finally:
+        await sandbox.aclose()
+
+
+def get_runner(path: str, timeout: float = 10.0, asynchronous: bool = False):
+    """Create the runner selected by ORGANISM_RUNNER (warm or subprocess)"""
+    mode = os.getenv("ORGANISM_RUNNER", "warm")
+    if asynchronous:
+        if mode == "subprocess":
+            return AsyncSubprocessRunner(path, timeout)
+        return AsyncWarmRunner(path, timeout)
+    if mode == "subprocess":
+        return SubprocessRunner(path, timeout)
+    return WarmRunner(path, timeout)
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+def _load_organism(path: str, source: str) -> Dict:
+    """Compile and import organism source into a fresh module"""
+    code = compile(source, path, "exec")
+    # Tracebacks must quote the source that ran, which may not be what is on disk
+    linecache.cache[path] = (len(source), None, source.splitlines(keepends=True), path)
+    # Sibling modules import as they would under `python path`
+    directory = os.path.dirname(path)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    module = types.ModuleType("organism")
+    module.__file__ = path
+    exec(code, module.__dict__)
+    return {"hash": source_hash(source), "code": code, "module": module}
+
+
+def _execute(request: Dict, loaded: Dict) -> Dict:
+    """Handle a single run request inside the worker"""
+    path = request["path"]
+    source = request.get("source")
+    seed = request.get("seed")
+    stdout, stderr = io.StringIO(), io.StringIO()
+    returncode = 0
+    imported = False
+    import_time = 0.0
+    run_time = 0.0
+
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            if source is None:
+                with open(path, "r") as f:
+                    source = f.read()
+
+            organism = loaded.get(path)
+            if organism is None or organism["hash"] != source_hash(source):
+                loaded.pop(path, None)
+                start_time = time.perf_counter()
+                organism = _load_organism(path, source)
+                import_time = time.perf_counter() - start_time
+                loaded[path] = organism
+                imported = True
+
+            if seed is not None:
+                random.seed(seed)
+
+            start_time = time.perf_counter()
+            try:
+                entry = getattr(organism["module"], "run", None)
+                if callable(entry):
+                    entry()
+                else:
+                    # No run() entry point - behave like `python organism.py`, argv included,
+                    # so a CLI in the organism never sees the worker's own flags
+                    argv = sys.argv
+                    sys.argv = [path]
+                    try:
+                        exec(organism["code"], {"__name__": "__main__", "__file__": path})
+                    finally:
+                        sys.argv = argv
+            finally:
+                run_time = time.perf_counter() - start_time
+
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                returncode = e.code
+            elif e.code is not None:
+                print(e.code, file=sys.stderr)
+                returncode = 1
+        except BaseException as e:
+            returncode = 1
+            # Drop the worker's own frames so tracebacks look like `python organism.py`
+            tb = e.__traceback__
+            while tb is not None and tb.tb_frame.f_code.co_filename == RUNNER_PATH:
+                tb = tb.tb_next
+            traceback.print_exception(type(e), e, tb)
+
+    return {
+        "returncode": returncode,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "imported": imported,
+        "import_time": import_time,
+        "run_time": run_time,
+    }
+
+
+def _worker_main():
+    """Serve run requests from the parent until stdin closes"""
+    # Keep private copies of the pipes so stray fd-level writes from the
+    # organism cannot corrupt the protocol stream
+    proto_in = os.fdopen(os.dup(0), "r")
+    proto_out = os.fdopen(os.dup(1), "w")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    # A segfault in the organism leaves a traceback on stderr for the crash report
+    faulthandler.enable()
+
+    loaded: Dict = {}
+    proto_out.write(json.dumps({"ready": True}) + "\n")
+    proto_out.flush()
+
+    for line in proto_in:
+        response = _execute(json.loads(line), loaded)
+        proto_out.write(json.dumps(response) + "\n")
+        proto_out.flush()
+
+
+if __name__ == "__main__":
+    if "--worker" in sys.argv:
+        _worker_main()
@@ -0,0 +1,42 @@
+"""
+snapshot.py - The Mirror
+Immutable, pre-serialized views of organism state. Writers publish a new
+Snapshot when state changes; readers share it by reference, so a request
+costs a pointer read and an ETag comparison instead of a rebuild, and a
+reader never sees a half-updated status.
+"""
+import hashlib
+import json
+from typing import Any, Hashable, NamedTuple, Optional, Sequence
+
+
+class Snapshot(NamedTuple):
+    """State at one point in time with its JSON body and ETag. `data` must not be mutated."""
+    key: Hashable
+    data: Any
+    body: bytes
+    etag: str
+
+
+def make_snapshot(data: Any, key: Hashable = None, volatile: Sequence[str] = ()) -> Snapshot:
+    """
+    Serialize once; the ETag is a hash of the body, so identical state gets
+    the same tag. Top-level `volatile` fields (counters that tick without
+    a real change) are served but left out of the ETag.
+    """
+    body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    tagged = body
+    if volatile:
+        stable = {name: value for name, value in data.items() if name not in volatile}
+        tagged = json.dumps(stable, separators=(",", ":")).encode("utf-8")
+    return Snapshot(key, data, body, '"' + hashlib.sha1(tagged).hexdigest()[:20] + '"')
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header covers the ETag (weak comparison, as RFC 9110 requires for GET)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
@@ -0,0 +1,152 @@
+"""
+source_watch.py - The Senses
+Notices edits to organism sources the moment they land: Linux inotify
+(through ctypes, no extra dependency) with an mtime-polling fallback.
+A change is only reported when the file's content hash actually differs.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from runner import source_hash
+
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _file_hash(path: str) -> Optional[str]:
+    """Content hash of a file, None if it is missing or unreadable"""
+    try:
+        with open(path, "r") as f:
+            return source_hash(f.read())
+    except OSError:
+        return None
+
+
+class Inotify:
+    """Directory watches on a non-blocking inotify descriptor"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, str] = {}
+
+    def add_directory(self, directory: str):
+        """Watch files written, created or renamed into a directory"""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self._dirs[wd] = directory
+
+    def read(self) -> List[str]:
+        """Paths named by all pending events"""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        paths = []
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if wd in self._dirs and name:
+                paths.append(os.path.join(self._dirs[wd], os.fsdecode(name)))
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+class SourceMonitor:
+    """
+    Background thread calling on_change(path) when a watched file's content
+    changes. mode is "inotify", "poll" or "auto" (inotify, falling back to
+    polling every poll_interval seconds).
+    """
+
+    def __init__(self, paths: List[str], on_change: Callable[[str], None], mode: str = "auto",
+                 poll_interval: float = 0.5):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.hashes: Dict[str, Optional[str]] = {path: _file_hash(path) for path in self.paths}
+        self._stats: Dict[str, Optional[Tuple[int, int]]] = {path: self._stat(path) for path in self.paths}
+        self._inotify: Optional[Inotify] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        if mode in ("auto", "inotify"):
+            try:
+                self._inotify = Inotify()
+                for directory in sorted({os.path.dirname(path) for path in self.paths}):
+                    self._inotify.add_directory(directory)
+            except (OSError, AttributeError, TypeError):
+                if self._inotify is not None:
+                    self._inotify.close()
+                self._inotify = None
+                if mode == "inotify":
+                    raise
+        self.mode = "inotify" if self._inotify is not None else "poll"
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _check(self, path: str):
+        """Report the path if its content hash moved"""
+        digest = _file_hash(path)
+        if digest is not None and digest != self.hashes.get(path):
+            self.hashes[path] = digest
+            self.on_change(path)
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._inotify is not None:
+                ready, _, _ = select.select([self._inotify.fd], [], [], self.poll_interval)
+                if ready:
+                    for path in set(self._inotify.read()):
+                        if path in self.hashes:
+                            self._check(path)
+            else:
+                self._stop.wait(self.poll_interval)
+                for path in self.paths:
+                    stat = self._stat(path)
+                    if stat != self._stats[path]:
+                        self._stats[path] = stat
+                        self._check(path)
+
+    def start(self):
+        """Start watching on a daemon thread"""
+        self._thread = threading.Thread(target=self._run, name="source-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching and release the inotify descriptor"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
@@ -0,0 +1,169 @@
+"""
+stream.py - The Nervous System
+Pushes log lines and status deltas to dashboards as Server-Sent Events,
+so clients stop polling /status and /logs.
+"""
+import asyncio
+import json
+import os
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from logstore import LogEntry
+
+
+class Subscription:
+    """One connected client: a bounded event queue plus its cursor"""
+
+    def __init__(self, organism_id: Optional[str], max_queue: int):
+        self.organism_id = organism_id  # None = all organisms
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.cursors: Dict[str, int] = {}  # organism id -> seq of the last line sent
+        self.dropped = 0  # events discarded because the client fell behind
+
+    def offer(self, event: Dict):
+        """Enqueue without ever blocking the producer"""
+        if self.organism_id is not None and event["organism_id"] != self.organism_id:
+            return
+        if self.queue.full():
+            # Backpressure: a slow client loses its oldest events, not our memory
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class EventHub:
+    """
+    Fan-out of watcher log lines to SSE subscribers. Producers (watchers,
+    possibly on worker threads) call publish(); delivery happens on the
+    API's event loop, one bounded queue per client.
+    """
+
+    def __init__(self, max_queue: int = 500):
+        self.max_queue = max_queue
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.subscribers: List[Subscription] = []
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        """Bind the hub to the loop that serves the stream endpoints"""
+        self.loop = loop
+
+    def publish(self, organism_id: str, entry: LogEntry):
+        """Broadcast a log entry (safe to call from any thread)"""
+        if self.loop is None or not self.subscribers:
+            return
+
+        event = {"organism_id": organism_id, "entry": entry}
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self.loop:
+            self._deliver(event)
+        else:
+            self.loop.call_soon_threadsafe(self._deliver, event)
+
+    def _deliver(self, event: Dict):
+        for subscription in self.subscribers:
+            subscription.offer(event)
+
+    def subscribe(self, organism_id: Optional[str] = None) -> Subscription:
+        """Register a new client"""
+        subscription = Subscription(organism_id, self.max_queue)
+        self.subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Forget a disconnected client"""
+        if subscription in self.subscribers:
+            self.subscribers.remove(subscription)
+
+
+def _sse(event: str, data: Dict, event_id: Optional[int] = None) -> str:
+    """Format one Server-Sent Event"""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _log_frame(subscription: Subscription, organism_id: str, entry: LogEntry) -> str:
+    """Log frame for one entry, empty if the client already has it"""
+    if entry.seq <= subscription.cursors.get(organism_id, 0):
+        return ""
+    subscription.cursors[organism_id] = entry.seq
+    # Per-organism streams carry the seq as SSE id so EventSource can resume
+    event_id = entry.seq if subscription.organism_id is not None else None
+    return _sse("log", {"organism_id": organism_id, **entry.to_dict()}, event_id)
+
+
+async def event_stream(
+    hub: EventHub,
+    organism_id: Optional[str],
+    get_status: Callable[[str], Dict],
+    load: Callable[[], Tuple[Dict[str, Dict], Dict[str, List[LogEntry]]]],
+    heartbeat: float = 15.0,
+    batch_size: int = 100
+) -> AsyncIterator[str]:
+    """
+    Yield SSE frames for one client: an initial snapshot (or the lines
+    missed since Last-Event-ID), then log lines as they happen and only
+    the status fields that changed since the last frame sent to this
+    client. Lines at or below the client's cursor are never sent twice.
+    The client is subscribed only once the body starts, and `load` (which
+    returns the snapshot and replay) runs after subscribing so no line
+    falls between the two.
+    """
+    last_status: Dict[str, Dict] = {}
+    subscription = hub.subscribe(organism_id)
+    try:
+        snapshot, replay = load()
+        frames = []
+        for organism_id, data in snapshot.items():
+            last_status[organism_id] = data["status"]
+            logs = data.get("logs")
+            if logs is not None:
+                subscription.cursors[organism_id] = logs[-1].seq if logs else 0
+                data = {**data, "logs": [entry.format() for entry in logs]}
+            frames.append(_sse("snapshot", {"organism_id": organism_id, **data}))
+        for organism_id, entries in replay.items():
+            frames.extend(_log_frame(subscription, organism_id, entry) for entry in entries)
+        yield "".join(frames)
+
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            # Drain whatever else is already queued into one write
+            events = [event]
+            while len(events) < batch_size and not subscription.queue.empty():
+                events.append(subscription.queue.get_nowait())
+
+            frames = []
+            if subscription.dropped:
+                frames.append(_sse("lagged", {"dropped": subscription.dropped, "cursors": subscription.cursors}))
+                subscription.dropped = 0
+
+            touched = []
+            for event in events:
+                frames.append(_log_frame(subscription, event["organism_id"], event["entry"]))
+                if event["organism_id"] not in touched:
+                    touched.append(event["organism_id"])
+
+            for organism_id in touched:
+                status = get_status(organism_id)
+                previous = last_status.get(organism_id, {})
+                changes = {k: v for k, v in status.items() if previous.get(k) != v}
+                if changes:
+                    last_status[organism_id] = status
+                    frames.append(_sse("status", {"organism_id": organism_id, "changes": changes}))
+
+            yield "".join(frames)
+    finally:
+        hub.unsubscribe(subscription)
+
+
+# Global hub instance
+hub = EventHub(max_queue=int(os.getenv("STREAM_QUEUE_SIZE", "500")))
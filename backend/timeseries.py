@@ -0,0 +1,167 @@
+"""
+timeseries.py - The Pulse
+Long-horizon history of an organism's timings in fixed memory: a ring of
+raw samples plus per-minute and per-hour rollups (count, sum, min, max),
+all stored in flat array('d') buffers. Recording is O(1); a history read
+copies pre-aggregated buckets without touching the raw samples.
+"""
+import math
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional
+
+
+RESOLUTIONS = {"minute": 60.0, "hour": 3600.0}
+
+
+def _check_limit(limit: Optional[int]) -> Optional[int]:
+    """History readers take the newest `limit` points; None and 0 both mean no limit"""
+    if limit is not None and limit < 0:
+        raise ValueError(f"limit must not be negative: {limit}")
+    return limit or None
+
+
+class RingSeries:
+    """Fixed-capacity ring of (timestamp, value) samples. Sample N lives in slot N % capacity."""
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("Series capacity must be at least 1")
+        self.capacity = capacity
+        self.count = 0
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, timestamp: float, value: float):
+        slot = self.count % self.capacity
+        self._times[slot] = timestamp
+        self._values[slot] = value
+        self.count += 1
+
+    def _slots(self, n: int) -> List[int]:
+        """Slots of the newest n samples, oldest first"""
+        n = min(n, len(self))
+        return [(self.count - n + i) % self.capacity for i in range(n)]
+
+    def last(self, n: int) -> List[float]:
+        """Values of the newest n samples, oldest first"""
+        return [self._values[slot] for slot in self._slots(n)]
+
+    def columns(self, since: Optional[float] = None, limit: Optional[int] = None) -> Dict[str, List[float]]:
+        """Samples newer than since (at most the newest limit; 0 or None for all) as {"t": [...], "value": [...]}"""
+        limit = _check_limit(limit)
+        slots = self._slots(len(self))
+        if since is not None:
+            slots = [slot for slot in slots if self._times[slot] > since]
+        if limit is not None:
+            slots = slots[-limit:]
+        return {"t": [self._times[slot] for slot in slots], "value": [self._values[slot] for slot in slots]}
+
+
+class Rollup:
+    """
+    Fixed-width time buckets kept in a ring of `capacity` slots. A slot is
+    reset when a sample for a newer bucket lands on it, so the ring always
+    holds the most recent `capacity` bucket widths.
+    """
+
+    def __init__(self, width: float, capacity: int):
+        self.width = width
+        self.capacity = capacity
+        self._start = array("d", [-1.0]) * capacity
+        self._count = array("d", bytes(8 * capacity))
+        self._sum = array("d", bytes(8 * capacity))
+        self._min = array("d", bytes(8 * capacity))
+        self._max = array("d", bytes(8 * capacity))
+
+    def add(self, timestamp: float, value: float):
+        bucket = math.floor(timestamp / self.width)
+        slot = bucket % self.capacity
+        start = bucket * self.width
+        if self._start[slot] != start:
+            if self._start[slot] > start:
+                return  # Older than the whole window
+            self._start[slot] = start
+            self._count[slot] = 0.0
+            self._sum[slot] = 0.0
+            self._min[slot] = value
+            self._max[slot] = value
+        self._count[slot] += 1
+        self._sum[slot] += value
+        self._min[slot] = min(self._min[slot], value)
+        self._max[slot] = max(self._max[slot], value)
+
+    def columns(self, since: Optional[float] = None, now: Optional[float] = None) -> Dict[str, List[float]]:
+        """Buckets within the window (and after since), oldest first, as parallel lists"""
+        now = time.time() if now is None else now
+        oldest = (math.floor(now / self.width) - self.capacity + 1) * self.width
+        if since is not None:
+            oldest = max(oldest, math.floor(since / self.width) * self.width)
+        slots = sorted(
+            (slot for slot in range(self.capacity) if self._start[slot] >= oldest),
+            key=lambda slot: self._start[slot]
+        )
+        return {
+            "t": [self._start[slot] for slot in slots],
+            "count": [int(self._count[slot]) for slot in slots],
+            "mean": [self._sum[slot] / self._count[slot] for slot in slots],
+            "min": [self._min[slot] for slot in slots],
+            "max": [self._max[slot] for slot in slots],
+        }
+
+
+class TimeSeries:
+    """
+    One metric's history: the newest `raw` samples, a day of minute buckets
+    and a month of hour buckets by default, plus lifetime count and sum.
+    """
+
+    def __init__(self, raw: int = 4096, minutes: int = 1440, hours: int = 720):
+        self.raw = RingSeries(raw)
+        self.rollups = {
+            "minute": Rollup(RESOLUTIONS["minute"], minutes),
+            "hour": Rollup(RESOLUTIONS["hour"], hours),
+        }
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.raw.count
+
+    def record(self, value: float, timestamp: Optional[float] = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self.raw.append(timestamp, value)
+            for rollup in self.rollups.values():
+                rollup.add(timestamp, value)
+            self.total += value
+
+    def recent(self, n: int) -> List[float]:
+        """The newest n values, oldest first"""
+        with self._lock:
+            return self.raw.last(n)
+
+    def mean(self, n: Optional[int] = None) -> float:
+        """Mean of the newest n values, or of every value ever recorded"""
+        if n is None:
+            return self.total / self.raw.count if self.raw.count else 0.0
+        values = self.recent(n)
+        return sum(values) / len(values) if values else 0.0
+
+    def history(self, resolution: str = "minute", since: Optional[float] = None,
+                limit: Optional[int] = None) -> Dict[str, List[float]]:
+        """Columnar series: raw samples or minute/hour buckets, the newest limit points (0 or None for all)"""
+        limit = _check_limit(limit)
+        with self._lock:
+            if resolution == "raw":
+                return self.raw.columns(since, limit)
+            if resolution not in self.rollups:
+                raise ValueError(f"Unknown resolution: {resolution} (expected raw, {', '.join(self.rollups)})")
+            columns = self.rollups[resolution].columns(since)
+        if limit is not None:
+            columns = {name: values[-limit:] for name, values in columns.items()}
+        return columns
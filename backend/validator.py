@@ -0,0 +1,134 @@
+"""
+validator.py - The Gatekeeper
+Staged checks that reject a bad mutation before it touches disk, cheapest
+first: syntax, required entry points, import resolution, then a smoke run
+in a throwaway sandbox worker with a short timeout.
+"""
+import ast
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Set
+
+from runner import atrial_run, trial_run
+
+
+# Functions callers rely on: the organism's run() and the root main.py's fibonacci()
+ENTRY_POINTS = ("run", "fibonacci")
+
+_DEF = re.compile(r"^(?:async\s+)?def\s+(\w+)\s*\(", re.MULTILINE)
+
+
+def required_entry_points(reference: Optional[str]) -> List[str]:
+    """Entry points defined at top level of the reference code (works on code that does not parse)"""
+    if not reference:
+        return []
+    return [name for name in ENTRY_POINTS if name in _DEF.findall(reference)]
+
+
+def _module_exists(name: str, directory: Optional[str]) -> bool:
+    """Whether a top-level module can be imported from the organism's directory"""
+    if name in sys.builtin_module_names or name in getattr(sys, "stdlib_module_names", ()):
+        return True
+    if directory and (os.path.exists(os.path.join(directory, name + ".py"))
+                      or os.path.isdir(os.path.join(directory, name))):
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _catches_import_error(handler: ast.ExceptHandler) -> bool:
+    if handler.type is None:
+        return True
+    names = handler.type.elts if isinstance(handler.type, ast.Tuple) else [handler.type]
+    return any(isinstance(name, ast.Name) and name.id in ("ImportError", "ModuleNotFoundError", "Exception")
+               for name in names)
+
+
+def _optional_imports(tree: ast.AST) -> Set[int]:
+    """ids of import nodes inside try/except ImportError - optional dependencies may be missing"""
+    guarded = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Try) and any(_catches_import_error(h) for h in node.handlers):
+            for stmt in node.body:
+                guarded.update(id(n) for n in ast.walk(stmt) if isinstance(n, (ast.Import, ast.ImportFrom)))
+    return guarded
+
+
+def _result(valid: bool, stage: str, start: float, error: str = "") -> Dict:
+    return {"valid": valid, "stage": stage, "error": error, "time": time.perf_counter() - start}
+
+
+def check_static(code: str, reference: Optional[str] = None, path: Optional[str] = None) -> Dict:
+    """Syntax, entry point and import checks - no code is executed"""
+    start = time.perf_counter()
+    try:
+        tree = ast.parse(code)
+        compile(tree, path or "<string>", "exec")
+    except (SyntaxError, ValueError) as e:
+        return _result(False, "syntax", start, str(e))
+
+    defined = {
+        node.name for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+    missing = [name for name in required_entry_points(reference) if name not in defined]
+    if missing:
+        return _result(False, "entry_points", start, f"missing top-level function(s): {', '.join(missing)}")
+
+    directory = os.path.dirname(path) if path else None
+    optional = _optional_imports(tree)
+    for node in ast.walk(tree):
+        if id(node) in optional:
+            continue
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            if not _module_exists(name.split(".")[0], directory):
+                return _result(False, "imports", start, f"cannot resolve import: {name}")
+
+    return _result(True, "static", start)
+
+
+def _smoke_result(run: Dict, start: float) -> Dict:
+    if run["returncode"] != 0:
+        return _result(False, "smoke", start, run["stderr"].strip()[-500:])
+    return _result(True, "smoke", start)
+
+
+def validate_code(code: str, path: str, reference: Optional[str] = None, smoke: bool = True,
+                  timeout: float = 3.0) -> Dict:
+    """
+    Run every stage, stopping at the first failure. Returns
+    {"valid", "stage" (failing or last stage run), "error", "time"}.
+    """
+    start = time.perf_counter()
+    result = check_static(code, reference, path)
+    if not result["valid"] or not smoke:
+        return result
+    try:
+        return _smoke_result(trial_run(code, path, timeout), start)
+    except subprocess.TimeoutExpired:
+        return _result(False, "smoke", start, f"no exit within {timeout}s")
+
+
+async def avalidate_code(code: str, path: str, reference: Optional[str] = None, smoke: bool = True,
+                         timeout: float = 3.0) -> Dict:
+    """Async version of validate_code (the smoke run does not block the event loop)"""
+    start = time.perf_counter()
+    result = check_static(code, reference, path)
+    if not result["valid"] or not smoke:
+        return result
+    try:
+        return _smoke_result(await atrial_run(code, path, timeout), start)
+    except subprocess.TimeoutExpired:
+        return _result(False, "smoke", start, f"no exit within {timeout}s")
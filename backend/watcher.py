@@ -1,291 +1,1220 @@
 """
 watcher.py - The Immune System
-Monitors organism.py and triggers mutations when errors occur.
+Monitors organisms and triggers mutations when errors occur.
 """
 import subprocess
-import sys
 import time
 import os
-import shutil
-from datetime import datetime
-from typing import Dict, List
+import random
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import threading
 
 from architect import get_architect
+from complexity import describe, estimate_complexity, exceeds, parse_class, profile_lines
+from benchmark import SCALING_SIZES, benchmark_scaling, benchmark_versions, compare_scaling, format_report, format_scaling_table
+from genome_store import get_genome_store
+from mutation_cache import get_mutation_cache
+from logstore import LogEntry, LogStore
+from metrics import metrics
+from runner import atrial_run, get_runner, source_hash, trial_run
+from source_watch import SourceMonitor
+from validator import avalidate_code, check_static, validate_code
+from stream import hub
+from snapshot import Snapshot, make_snapshot
+from timeseries import TimeSeries
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# "async" runs the watch loop on the server's event loop, "thread" on a background thread
+WATCHER_MODE = os.getenv("WATCHER_MODE", "async")
+
+
+class AdaptiveInterval:
+    """
+    Delay before an organism's next cycle. Right after a mutation the
+    organism is re-checked quickly to confirm the fix; a stable organism
+    backs off exponentially up to max_interval; repeated failures back off
+    the same way so a broken LLM is not hammered. Jitter spreads many
+    organisms apart.
+    """
+    
+    def __init__(self, base: float = 3.0, min_interval: float = 0.5, max_interval: float = 60.0,
+                 jitter: float = 0.1, rng: Optional[random.Random] = None):
+        self.base = base
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.streak = -1  # Consecutive cycles with the same outcome, minus one
+        self.healthy = True
+    
+    def next(self, healthy: bool, mutated: bool) -> float:
+        """Interval after a cycle with the given outcome"""
+        if mutated:
+            self.streak = -1
+            interval = self.min_interval
+        else:
+            self.streak = min(self.streak + 1, 32) if healthy == self.healthy else 0
+            interval = min(self.max_interval, self.base * 2 ** self.streak)
+        self.healthy = healthy
+        return interval * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+    
+    def reset(self):
+        """Forget the backoff (e.g. after a manual run)"""
+        self.streak = -1
+
+
+def _adaptive_interval(base: float, rng: Optional[random.Random] = None) -> AdaptiveInterval:
+    """AdaptiveInterval configured from CYCLE_MIN_INTERVAL, CYCLE_MAX_INTERVAL and CYCLE_JITTER"""
+    return AdaptiveInterval(
+        base,
+        min_interval=float(os.getenv("CYCLE_MIN_INTERVAL", "0.5")),
+        max_interval=float(os.getenv("CYCLE_MAX_INTERVAL", "60")),
+        jitter=float(os.getenv("CYCLE_JITTER", "0.1")),
+        rng=rng
+    )
 
 
 class OrganismWatcher:
-    """The Immune System that watches and heals the Organism"""
+    """The Immune System that watches and heals one Organism"""
     
-    def __init__(self):
+    def __init__(self, organism_id: str = "organism", path: Optional[str] = None, asynchronous: bool = False):
+        self.organism_id = organism_id
+        self.path = os.path.abspath(path or os.path.join(BASE_DIR, "organism.py"))
+        self.file_lock = threading.RLock()  # Guards every read-modify-write of the organism file
         self.generation = 1
         self.status = "INITIALIZING"
         self.last_mutation = "None"
-        self.logs: List[str] = []
-        self.max_logs = 100
-        self.execution_times: List[float] = []
+        self.log_store = LogStore(int(os.getenv("LOG_CAPACITY", "5000")))
+        # Published on state transitions (status, generation, run counters) and at cycle end;
+        # readers share it by reference
+        self.status_snapshot: Optional[Snapshot] = None
+        self._snapshot_lock = threading.Lock()
+        self._genome_snapshots: Dict[int, Snapshot] = {}  # limit -> history snapshot
+        # Run and cold-start timings: raw samples plus minute/hour rollups
+        history_samples = int(os.getenv("HISTORY_SAMPLES", "4096"))
+        self.execution_times = TimeSeries(raw=history_samples)
+        self.cold_start_times = TimeSeries(raw=history_samples)
         self.target_latency = float(os.getenv("TARGET_LATENCY", "1.0"))
+        # What triggers an OPTIMIZATION mutation: "complexity" (measured growth class worse than
+        # MAX_COMPLEXITY), "latency" (5 runs in a row over TARGET_LATENCY) or "both"
+        self.optimization_trigger = os.getenv("OPTIMIZATION_TRIGGER", "complexity")
+        self.max_complexity = parse_class(os.getenv("MAX_COMPLEXITY", "O(n log n)"))
+        self.complexity: Optional[Dict] = None  # Growth estimate of the last profiled code
+        self._complexity_checked: set = set()  # Source hashes already profiled for the trigger
+        self.bench_trials = int(os.getenv("BENCH_TRIALS", "7"))
+        self.bench_min_speedup = float(os.getenv("BENCH_MIN_SPEEDUP", "1.05"))
+        self.mutation_candidates = max(1, int(os.getenv("MUTATION_CANDIDATES", "1")))
+        self.smoke_timeout = float(os.getenv("SMOKE_TIMEOUT", "3"))
+        # Scaling profiles of process() over SCALING_SIZES, one per source hash
+        self.scaling_trials = int(os.getenv("SCALING_TRIALS", "3"))
+        self.scaling_budget = float(os.getenv("SCALING_BUDGET", "5"))
+        self._scaling_profiles: Dict[str, Dict] = {}
+        self._scaling_lock = threading.Lock()  # One profile at a time; each size already takes a core
         self.crash_count = 0
         self.successful_runs = 0
+        self.skipped_runs = 0
+        self.known_good_hash: Optional[str] = None  # Source hash of the last healthy run
+        self.good_genome: Optional[Tuple[str, str, int]] = None  # (hash, code, generation) last confirmed healthy
+        self.last_promotion: Optional[Tuple[str, str, str]] = None  # Cache key of the newest mutation
         self.is_running = False
         self.last_error = None
-        self.genome_history: List[Dict] = []  # Track code versions
+        self.mutation_type: Optional[str] = None  # Type of the latest mutation
+        self.crashed_at: Optional[float] = None  # When the current outage began, for time-to-heal
+        self.genome_store = get_genome_store()  # Persistent code versions
+        self.genome_hash = self._restore_genome()  # Hash of the current generation's code
         self.architect = None  # Lazy load to avoid startup errors
+        self.mutation_cache = get_mutation_cache()  # Shared across organisms
+        self.runner = get_runner(self.path, timeout=10, asynchronous=asynchronous)
+        self._publish_status()
         
-    def log(self, message: str):
+    def log(self, message: str, level: str = "INFO"):
         """Add a log entry with timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        log_entry = f"[{timestamp}] {message}"
-        print(log_entry)
-        self.logs.append(log_entry)
-        if len(self.logs) > self.max_logs:
-            self.logs.pop(0)
+        entry = self.log_store.append(message, level, self.generation)
+        print(f"<{self.organism_id}> {entry.format()}")
+        if self.status_snapshot is not None and self.status_snapshot.key != self._status_key():
+            self._publish_status()
+        hub.publish(self.organism_id, entry)
+    
+    def _status_key(self) -> Tuple:
+        """The state a status snapshot reflects; log lines alone do not change it"""
+        return (self.status, self.generation, self.last_mutation, self.crash_count, self.successful_runs,
+                self.skipped_runs, len(self.execution_times), len(self.cold_start_times), self.last_error,
+                self.runner.cold_starts, self.complexity["class"] if self.complexity else None)
+    
+    def _publish_status(self):
+        """Replace the status snapshot (under a lock, so snapshots are published in order)"""
+        with self._snapshot_lock:
+            # uptime counts log lines, so it would change the ETag on every line
+            self.status_snapshot = make_snapshot(self.get_status(), self._status_key(), volatile=("uptime",))
     
     def run_organism(self) -> Dict:
-        """Execute organism.py as a subprocess"""
-        start_time = time.time()
+        """Execute the organism through the configured runner (warm worker or subprocess)"""
+        run_hash = self._source_hash()
+        try:
+            report, trigger = self._process_run(self.runner.run())
+        except subprocess.TimeoutExpired:
+            report, trigger = self._process_timeout()
+        except Exception as e:
+            return self._process_error(e)
         
+        if report["success"] and trigger is None:
+            trigger = self._complexity_trigger(run_hash, report)
+        if self._after_run(run_hash, report, trigger):
+            self.mutate_code(*trigger)
+        return report
+    
+    async def arun_organism(self) -> Dict:
+        """Async version of run_organism - runner, sleeps and LLM calls never block the event loop"""
+        run_hash = self._source_hash()
         try:
-            result = subprocess.run(
-                [sys.executable, "organism.py"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                cwd=os.path.dirname(os.path.abspath(__file__))
-            )
-            
-            execution_time = time.time() - start_time
-            self.execution_times.append(execution_time)
-            
-            # Keep only last 10 execution times
-            if len(self.execution_times) > 10:
-                self.execution_times.pop(0)
+            report, trigger = self._process_run(await self.runner.run())
+        except subprocess.TimeoutExpired:
+            report, trigger = self._process_timeout()
+        except Exception as e:
+            return self._process_error(e)
+        
+        if report["success"] and trigger is None:
+            trigger = await asyncio.to_thread(self._complexity_trigger, run_hash, report)
+        if self._after_run(run_hash, report, trigger):
+            await self.amutate_code(*trigger)
+        return report
+    
+    def _complexity_trigger(self, run_hash: Optional[str], report: Dict) -> Optional[Tuple[str, str]]:
+        """
+        Profile each new healthy genome once and ask for an optimization if
+        its process() grows faster than MAX_COMPLEXITY. The estimate goes
+        into the error log, which becomes the optimization prompt.
+        """
+        if self.optimization_trigger not in ("complexity", "both") or run_hash is None:
+            return None
+        if run_hash in self._complexity_checked:
+            return None
+        with self.file_lock:
+            code = self._read_source()
+        if source_hash(code) != run_hash:
+            return None  # Changed since the run; the next cycle profiles the new code
+        if len(self._complexity_checked) >= 256:
+            self._complexity_checked.clear()
+        self._complexity_checked.add(run_hash)
+        
+        profile = self._scaling_profile(code)
+        self.complexity = estimate_complexity(profile)
+        if self.complexity is None:
+            self.log("📐 Growth class unknown (fewer than two measurable sizes)")
+            return None
+        self.log(f"📐 {describe(self.complexity)}")
+        if not exceeds(self.complexity, self.max_complexity):
+            return None
+        
+        self.log(f"🧬 Triggering optimization mutation: {self.complexity['class']} is worse than {self.max_complexity}")
+        performance = "\n".join(["OPTIMIZATION_NEEDED: " + describe(self.complexity, self.max_complexity),
+                                  "Measured runtime of process():"] + profile_lines(profile))
+        return performance, report["output"]
+    
+    def _describe_trigger(self) -> str:
+        """The optimization trigger in words, for the startup log"""
+        triggers = []
+        if self.optimization_trigger in ("complexity", "both"):
+            triggers.append(f"growth worse than {self.max_complexity}")
+        if self.optimization_trigger in ("latency", "both"):
+            triggers.append(f"5 runs over {self.target_latency}s")
+        return " or ".join(triggers) or "off"
+    
+    def _after_run(self, run_hash: Optional[str], report: Dict, trigger: Optional[Tuple[str, str]]) -> bool:
+        """Track known-good code and roll back crashing new generations; True if a mutation is still needed"""
+        self.known_good_hash = run_hash if report["success"] and not trigger else None
+        if report["success"]:
+            if run_hash is not None and run_hash == self.genome_hash and (
+                    self.good_genome is None or self.good_genome[0] != run_hash):
+                code = self._read_source()
+                if source_hash(code) == run_hash:
+                    self.good_genome = (run_hash, code, self.generation)
+            return trigger is not None
+        return not self._rollback(run_hash)
+    
+    def _rollback(self, run_hash: Optional[str]) -> bool:
+        """
+        Restore the last generation confirmed healthy when the newest,
+        not yet confirmed, generation is the code that crashed. The good
+        source is kept in memory, so this costs one atomic file write
+        instead of an LLM round-trip.
+        """
+        if self.good_genome is None or run_hash is None:
+            return False
+        good_hash, good_code, good_generation = self.good_genome
+        if run_hash != self.genome_hash or run_hash == good_hash:
+            return False  # Not a fresh generation (e.g. chaos) - heal it normally
+        
+        with self.file_lock:
+            if self._source_hash() != run_hash:
+                return False  # Edited since the run, let the next cycle judge the new code
+            self._write_source(good_code)
+        
+        if self.last_promotion is not None:
+            self.mutation_cache.invalidate(*self.last_promotion)
+            self.last_promotion = None
+        
+        bad_generation = self.generation
+        self.generation += 1
+        self.genome_hash = self.genome_store.record(
+            self.organism_id, self.generation, good_code, f"Rollback to generation {good_generation}", run_hash
+        )
+        self.last_mutation = f"Rolled back generation {bad_generation} to generation {good_generation}"
+        metrics.mutations.inc(organism=self.organism_id, type="ROLLBACK", outcome="promoted")
+        self.status = "ALIVE"
+        self.log(f"⏪ Generation {bad_generation} crashed - rolled back to generation {good_generation} "
+                 f"({good_hash[:12]}) as generation {self.generation}", "WARNING")
+        return True
+    
+    def _read_source(self) -> str:
+        """Current organism source"""
+        with self.file_lock:
+            with open(self.path, "r") as f:
+                return f.read()
+    
+    def _write_source(self, code: str):
+        """Replace the organism source atomically: write a temp file, fsync, rename over"""
+        directory, name = os.path.split(self.path)
+        with self.file_lock:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(code)
+                    f.flush()
+                    os.fsync(f.fileno())
+                if os.path.exists(self.path):
+                    os.chmod(tmp_path, os.stat(self.path).st_mode & 0o7777)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+    
+    def _process_run(self, result: Dict) -> Tuple[Dict, Optional[Tuple[str, str]]]:
+        """Record a finished run, returning the cycle report and the mutation to trigger (if any)"""
+        # In warm mode this is the organism's own run time, startup is tracked separately
+        execution_time = result["run_time"]
+        self.execution_times.record(execution_time)
+        metrics.phase_seconds.observe(execution_time, organism=self.organism_id, phase="run")
+        
+        if result["cold"]:
+            self.cold_start_times.record(result["cold_start_time"])
+            metrics.phase_seconds.observe(result["cold_start_time"], organism=self.organism_id, phase="spawn")
+            self.log(f"🥶 Cold start ({self.runner.mode}): {result['cold_start_time']:.3f}s")
+        
+        # Log the output
+        if result["stdout"]:
+            for line in result["stdout"].strip().split('\n'):
+                self.log(f"🧬 {line}")
+        
+        if result["returncode"] == 0:
+            self.status = "ALIVE"
+            self.successful_runs += 1
+            self.log(f"✅ Cycle complete in {execution_time:.3f}s")
+            if self.crashed_at is not None:
+                heal_time = time.time() - self.crashed_at
+                metrics.phase_seconds.observe(heal_time, organism=self.organism_id, phase="heal")
+                self.log(f"❤️  Healed in {heal_time:.2f}s")
+                self.crashed_at = None
             
-            # Log the output
-            if result.stdout:
-                for line in result.stdout.strip().split('\n'):
-                    self.log(f"🧬 {line}")
+            trigger = None
+            # Check if optimization is needed
+            if execution_time > self.target_latency and self.optimization_trigger in ("latency", "both"):
+                self.log(f"⚠️  Slow execution detected: {execution_time:.3f}s > {self.target_latency}s", "WARNING")
+                recent = self.execution_times.recent(5)
+                if len(recent) >= 5 and all(t > self.target_latency for t in recent):
+                    self.log("🧬 Triggering optimization mutation...")
+                    trigger = ("OPTIMIZATION_NEEDED", result["stdout"])
             
-            if result.returncode == 0:
-                self.status = "ALIVE"
-                self.successful_runs += 1
-                self.log(f"✅ Cycle complete in {execution_time:.3f}s")
-                
-                # Check if optimization is needed
-                if execution_time > self.target_latency:
-                    self.log(f"⚠️  Slow execution detected: {execution_time:.3f}s > {self.target_latency}s")
-                    if len(self.execution_times) >= 5 and all(t > self.target_latency for t in self.execution_times[-5:]):
-                        self.log("🧬 Triggering optimization mutation...")
-                        self.mutate_code("OPTIMIZATION_NEEDED", result.stdout)
-                
-                return {
-                    "success": True,
-                    "execution_time": execution_time,
-                    "output": result.stdout
-                }
-            else:
-                # Organism crashed
-                self.status = "CRASHED"
-                self.crash_count += 1
-                self.last_error = result.stderr
-                self.log(f"💀 CRASH DETECTED (Exit code: {result.returncode})")
-                self.log(f"📋 Error: {result.stderr}")
-                
-                # Trigger mutation
-                self.mutate_code(result.stderr, result.stdout)
-                
-                return {
-                    "success": False,
-                    "error": result.stderr,
-                    "execution_time": execution_time
-                }
-                
-        except subprocess.TimeoutExpired:
-            self.status = "TIMEOUT"
-            self.log("⏱️  TIMEOUT - Organism frozen")
-            self.mutate_code("TIMEOUT_ERROR", "Process exceeded 10 second limit")
-            return {"success": False, "error": "Timeout"}
+            return {
+                "success": True,
+                "execution_time": execution_time,
+                "output": result["stdout"]
+            }, trigger
         
-        except Exception as e:
-            self.status = "ERROR"
-            self.log(f"🚨 Watcher Error: {str(e)}")
-            return {"success": False, "error": str(e)}
+        # Organism crashed
+        self.status = "CRASHED"
+        self.crash_count += 1
+        metrics.crashes.inc(organism=self.organism_id)
+        if self.crashed_at is None:
+            self.crashed_at = time.time()
+        self.last_error = result["stderr"]
+        self.log(f"💀 CRASH DETECTED (Exit code: {result['returncode']})", "ERROR")
+        self.log(f"📋 Error: {result['stderr']}", "ERROR")
+        
+        return {
+            "success": False,
+            "error": result["stderr"],
+            "execution_time": execution_time
+        }, (result["stderr"], result["stdout"])
+    
+    def _process_timeout(self) -> Tuple[Dict, Tuple[str, str]]:
+        """Record a frozen organism"""
+        self.status = "TIMEOUT"
+        metrics.timeouts.inc(organism=self.organism_id)
+        if self.crashed_at is None:
+            self.crashed_at = time.time()
+        self.log("⏱️  TIMEOUT - Organism frozen", "ERROR")
+        return {"success": False, "error": "Timeout"}, ("TIMEOUT_ERROR", "Process exceeded 10 second limit")
+    
+    def _process_error(self, error: Exception) -> Dict:
+        """Record a failure of the watcher itself"""
+        self.status = "ERROR"
+        self.log(f"🚨 Watcher Error: {str(error)}", "ERROR")
+        return {"success": False, "error": str(error)}
     
     def mutate_code(self, error_log: str, output: str = ""):
         """
         Use AI to mutate the code and fix errors.
         Now with REAL Groq LLM integration!
         """
+        try:
+            current_code, mutation_type = self._begin_mutation(error_log)
+            
+            cached = self._cached_mutation(error_log, current_code, mutation_type)
+            verdict = None
+            raced = not cached and self.mutation_candidates > 1
+            if cached:
+                fixed_code, explanation = cached
+            elif raced:
+                fixed_code, explanation, verdict = self._race_candidates(error_log, current_code, mutation_type)
+            else:
+                # Get AI-generated fix
+                with metrics.phase_seconds.time(organism=self.organism_id, phase="llm"):
+                    fixed_code, explanation = self.architect.analyze_and_fix(
+                        error_log, 
+                        current_code, 
+                        mutation_type,
+                        baseline=self._baseline(),
+                        log=self.log
+                    )
+            
+            # Raced candidates already survived a sandbox run
+            with metrics.phase_seconds.time(organism=self.organism_id, phase="validation"):
+                validation = validate_code(fixed_code, self.path, current_code, smoke=not raced,
+                                           timeout=self.smoke_timeout)
+            
+            if validation["valid"] and mutation_type == "OPTIMIZATION" and verdict is None:
+                verdict = self._benchmark(current_code, fixed_code)
+            
+            self._apply_mutation(current_code, fixed_code, explanation, error_log, mutation_type,
+                                 validation, bool(cached), verdict)
+            
+        except Exception as e:
+            self._mutation_failed(e)
+    
+    async def amutate_code(self, error_log: str, output: str = ""):
+        """Async version of mutate_code using the provider's async client"""
+        try:
+            current_code, mutation_type = self._begin_mutation(error_log)
+            
+            cached = self._cached_mutation(error_log, current_code, mutation_type)
+            verdict = None
+            raced = not cached and self.mutation_candidates > 1
+            if cached:
+                fixed_code, explanation = cached
+            elif raced:
+                fixed_code, explanation, verdict = await self._arace_candidates(error_log, current_code, mutation_type)
+            else:
+                with metrics.phase_seconds.time(organism=self.organism_id, phase="llm"):
+                    fixed_code, explanation = await self.architect.aanalyze_and_fix(
+                        error_log,
+                        current_code,
+                        mutation_type,
+                        baseline=self._baseline(),
+                        log=self.log
+                    )
+            
+            with metrics.phase_seconds.time(organism=self.organism_id, phase="validation"):
+                validation = await avalidate_code(fixed_code, self.path, current_code, smoke=not raced,
+                                                  timeout=self.smoke_timeout)
+            
+            if validation["valid"] and mutation_type == "OPTIMIZATION" and verdict is None:
+                # Rare and long-running: keep the repeated timed trials off the event loop
+                verdict = await asyncio.to_thread(self._benchmark, current_code, fixed_code)
+            
+            self._apply_mutation(current_code, fixed_code, explanation, error_log, mutation_type,
+                                 validation, bool(cached), verdict)
+            
+        except Exception as e:
+            self._mutation_failed(e)
+    
+    def _begin_mutation(self, error_log: str) -> Tuple[str, str]:
+        """Snapshot the current genome and pick the mutation type"""
         self.status = "MUTATING"
+        self.mutation_type = "OPTIMIZATION" if "OPTIMIZATION_NEEDED" in error_log else "ERROR"
         
         self.log("=" * 60)
         self.log("🧬 MUTATION TRIGGERED")
         self.log("=" * 60)
         self.log(f"📊 Error Context: {error_log[:200]}")
         
+        # Initialize architect if needed
+        if self.architect is None:
+            self.log("🤖 Initializing AI Brain...")
+            self.architect = get_architect()
+        
+        # Read current code
+        current_code = self._read_source()
+        
+        mutation_type = self.mutation_type
+        self.log(f"🎯 Mutation Type: {mutation_type}")
+        
+        return current_code, mutation_type
+    
+    def _baseline(self) -> Optional[str]:
+        """Code of the current generation as last promoted (before any chaos)"""
+        return self.genome_store.get(self.genome_hash) if self.genome_hash else None
+    
+    def _cached_mutation(self, error_log: str, current_code: str, mutation_type: str) -> Optional[Tuple[str, str]]:
+        """Look the failure up in the mutation cache before asking the LLM"""
+        cached = self.mutation_cache.get(error_log, current_code, mutation_type)
+        metrics.cache_lookups.inc(result="hit" if cached else "miss")
+        if cached:
+            self.log("⚡ Mutation cache hit - reusing a known fix")
+        else:
+            self.log(f"🧠 Calling {self.architect.provider.name} AI ({self.architect.model})...")
+        return cached
+    
+    def _trial_candidate(self, variant: int, fixed_code: str, explanation: str,
+                         result: Optional[Dict]) -> Optional[Tuple[str, str]]:
+        """Log one candidate's sandbox run, returning it if the organism survived"""
+        if result is None:
+            self.log(f"🧪 Candidate {variant + 1}: invalid code", "WARNING")
+            return None
+        if result["returncode"] != 0:
+            self.log(f"🧪 Candidate {variant + 1}: crashed in sandbox ({result['stderr'].strip()[-120:]})", "WARNING")
+            return None
+        self.log(f"🧪 Candidate {variant + 1}: passed in {result['run_time']:.3f}s")
+        return fixed_code, explanation
+    
+    def _generate_candidate(self, error_log: str, current_code: str, mutation_type: str,
+                            variant: int) -> Optional[Tuple[str, str]]:
+        """Ask the LLM for one candidate and run it once in its own sandbox"""
         try:
-            # Initialize architect if needed
-            if self.architect is None:
-                self.log("🤖 Initializing AI Brain (Groq)...")
-                self.architect = get_architect()
-            
-            # Read current code
-            with open("organism.py", "r") as f:
-                current_code = f.read()
-            
-            # Save current version to genome history
-            self._save_genome_version(current_code, error_log)
-            
-            # Determine mutation type
-            mutation_type = "OPTIMIZATION" if "OPTIMIZATION_NEEDED" in error_log else "ERROR"
-            
-            self.log(f"🧠 Calling Groq AI ({self.architect.model})...")
-            self.log(f"🎯 Mutation Type: {mutation_type}")
-            
-            # Get AI-generated fix
-            fixed_code, explanation = self.architect.analyze_and_fix(
-                error_log, 
-                current_code, 
-                mutation_type
-            )
-            
-            # Validate the fixed code
-            if not self._validate_code(fixed_code):
-                self.log("❌ AI generated invalid code, reverting...")
+            with metrics.phase_seconds.time(organism=self.organism_id, phase="llm"):
+                fixed_code, explanation = self.architect.analyze_and_fix(error_log, current_code, mutation_type,
+                                                                       variant, self._baseline(), self.log)
+            valid = self._validate_code(fixed_code, current_code)
+            result = trial_run(fixed_code, self.path, self.runner.timeout) if valid else None
+        except subprocess.TimeoutExpired:
+            self.log(f"🧪 Candidate {variant + 1}: froze in sandbox", "WARNING")
+            return None
+        except Exception as e:
+            self.log(f"🧪 Candidate {variant + 1}: {e}", "WARNING")
+            return None
+        return self._trial_candidate(variant, fixed_code, explanation, result)
+    
+    async def _agenerate_candidate(self, error_log: str, current_code: str, mutation_type: str,
+                                   variant: int) -> Optional[Tuple[str, str]]:
+        """Async version of _generate_candidate"""
+        try:
+            with metrics.phase_seconds.time(organism=self.organism_id, phase="llm"):
+                fixed_code, explanation = await self.architect.aanalyze_and_fix(error_log, current_code, mutation_type,
+                                                                              variant, self._baseline(), self.log)
+            valid = self._validate_code(fixed_code, current_code)
+            result = await atrial_run(fixed_code, self.path, self.runner.timeout) if valid else None
+        except subprocess.TimeoutExpired:
+            self.log(f"🧪 Candidate {variant + 1}: froze in sandbox", "WARNING")
+            return None
+        except Exception as e:
+            self.log(f"🧪 Candidate {variant + 1}: {e}", "WARNING")
+            return None
+        return self._trial_candidate(variant, fixed_code, explanation, result)
+    
+    def _pick_optimization(self, current_code: str, survivors: List[Tuple[str, str]]) -> Tuple[str, str, Optional[Dict]]:
+        """Benchmark surviving optimization candidates one at a time and keep the fastest"""
+        best = None
+        for fixed_code, explanation in survivors:
+            verdict = self._benchmark(current_code, fixed_code)
+            if verdict is None:
+                continue
+            score = (verdict["promote"], verdict.get("speedup", 0.0))
+            if best is None or score > best[0]:
+                best = (score, fixed_code, explanation, verdict)
+        if best is None:
+            raise Exception("No optimization candidate could be benchmarked")
+        return best[1], best[2], best[3]
+    
+    def _race_candidates(self, error_log: str, current_code: str,
+                         mutation_type: str) -> Tuple[str, str, Optional[Dict]]:
+        """
+        Generate MUTATION_CANDIDATES fixes concurrently, each with its own
+        temperature and prompt hint, and run each in a sandbox worker. A
+        crash fix promotes the first candidate that survives; an
+        optimization benchmarks every survivor and keeps the fastest.
+        """
+        self.log(f"🏁 Racing {self.mutation_candidates} candidates...")
+        pool = ThreadPoolExecutor(max_workers=self.mutation_candidates)
+        futures = [
+            pool.submit(self._generate_candidate, error_log, current_code, mutation_type, variant)
+            for variant in range(self.mutation_candidates)
+        ]
+        survivors = []
+        try:
+            for future in as_completed(futures):
+                candidate = future.result()
+                if candidate is None:
+                    continue
+                if mutation_type != "OPTIMIZATION":
+                    return candidate[0], candidate[1], None
+                survivors.append(candidate)
+        finally:
+            # Losers still finish their sandbox run in the background, but nobody waits for them
+            pool.shutdown(wait=False, cancel_futures=True)
+        
+        if not survivors:
+            raise Exception("No candidate survived its sandbox run")
+        return self._pick_optimization(current_code, survivors)
+    
+    async def _arace_candidates(self, error_log: str, current_code: str,
+                                mutation_type: str) -> Tuple[str, str, Optional[Dict]]:
+        """Async version of _race_candidates - losing candidates are cancelled"""
+        self.log(f"🏁 Racing {self.mutation_candidates} candidates...")
+        tasks = [
+            asyncio.ensure_future(self._agenerate_candidate(error_log, current_code, mutation_type, variant))
+            for variant in range(self.mutation_candidates)
+        ]
+        survivors = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                candidate = await next_done
+                if candidate is None:
+                    continue
+                if mutation_type != "OPTIMIZATION":
+                    return candidate[0], candidate[1], None
+                survivors.append(candidate)
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        if not survivors:
+            raise Exception("No candidate survived its sandbox run")
+        # Timed trials must not compete with each other, so benchmarks run one at a time
+        return await asyncio.to_thread(self._pick_optimization, current_code, survivors)
+    
+    def _benchmark(self, current_code: str, fixed_code: str) -> Optional[Dict]:
+        """Time an optimization candidate against the current code on the same seeded inputs"""
+        try:
+            compile(fixed_code, self.path, 'exec')
+        except SyntaxError:
+            return None  # Rejected by validation anyway
+        
+        if self.complexity is not None and self._scaling_profiles.get(source_hash(current_code)) is not None \
+                and exceeds(self.complexity, self.max_complexity):
+            # Growth-triggered: whole-run timings at the default size cannot show the gain
+            return self._scaling_verdict(current_code, fixed_code)
+        
+        self.log(f"⏱️  Benchmarking candidate ({self.bench_trials} trials per version)...")
+        return benchmark_versions(
+            current_code, fixed_code, self.path,
+            trials=self.bench_trials,
+            min_speedup=self.bench_min_speedup
+        )
+    
+    def _scaling_verdict(self, current_code: str, fixed_code: str) -> Dict:
+        """Promotion verdict from scaling profiles: same outputs, faster at the largest common size"""
+        self.log("⏱️  Benchmarking candidate across input sizes...")
+        comparison = compare_scaling(self._scaling_profile(current_code), self._scaling_profile(fixed_code))
+        sizes = comparison["sizes"]
+        speedup = sizes[-1]["speedup"] if sizes else 0.0
+        estimate = estimate_complexity(self._scaling_profile(fixed_code))
+        growth = estimate["class"] if estimate else "unknown growth"
+        if not sizes:
+            reason = "no size measured by both versions"
+        elif not comparison["equivalent"]:
+            reason = "outputs differ for the same seeded inputs"
+        elif comparison["regressed"]:
+            reason = comparison["regressed"]
+        elif speedup <= self.bench_min_speedup:
+            reason = f"not measurably faster ({speedup:.2f}x at n={sizes[-1]['size']:,}, {growth})"
+        else:
+            reason = f"{speedup:.2f}x faster at n={sizes[-1]['size']:,}, now {growth}"
+        return {
+            "promote": comparison["ok"] and speedup > self.bench_min_speedup,
+            "reason": reason,
+            "speedup": speedup,
+            "complexity": estimate,
+        }
+    
+    def _apply_mutation(self, current_code: str, fixed_code: str, explanation: str, error_log: str,
+                        mutation_type: str, validation: Dict, from_cache: bool = False,
+                        verdict: Optional[Dict] = None):
+        """Promote validated AI-generated code to the next generation"""
+        if not validation["valid"]:
+            self.log(f"⚠️ Validation failed at {validation['stage']} stage in {validation['time'] * 1000:.0f}ms: "
+                     f"{validation['error']}", "WARNING")
+            self.log("❌ AI generated invalid code, reverting...", "ERROR")
+            if from_cache:
+                self.mutation_cache.invalidate(error_log, current_code, mutation_type)
+            metrics.mutations.inc(organism=self.organism_id, type=mutation_type, outcome="rejected")
+            self.status = "ALIVE"
+            return
+        
+        # Optimizations must prove they are faster and still behave the same
+        if verdict is not None:
+            self.log(f"📈 Benchmark: {format_report(verdict)}")
+            if not verdict["promote"]:
+                self.log("🐢 Optimization rejected, keeping current generation", "WARNING")
+                if from_cache:
+                    self.mutation_cache.invalidate(error_log, current_code, mutation_type)
+                metrics.mutations.inc(organism=self.organism_id, type=mutation_type, outcome="rejected")
+                self.status = "ALIVE"
+                return
+        
+        if not from_cache:
+            self.mutation_cache.put(error_log, current_code, mutation_type, fixed_code, explanation)
+        
+        with self.file_lock:
+            # Compare-and-swap: only replace the code this mutation was derived from
+            if self._read_source() != current_code:
+                self.log("⚠️ Source changed during mutation, discarding it - next cycle judges the new code", "WARNING")
+                metrics.mutations.inc(organism=self.organism_id, type=mutation_type, outcome="conflict")
                 self.status = "ALIVE"
                 return
             
-            # Save the fixed code
+            # Save both the code that failed and its successor to the genome store
             self.generation += 1
-            backup_path = f"organism_v{self.generation}.py"
-            
-            # Backup current version
-            shutil.copy("organism.py", backup_path)
+            parent_hash = self._save_genome_version(current_code, fixed_code, error_log)
             
             # Write fixed code
-            with open("organism.py", "w") as f:
-                f.write(fixed_code)
-            
-            self.last_mutation = explanation
-            
-            self.log("✅ AI mutation successful!")
-            self.log(f"💾 Saved as: {backup_path}")
-            self.log(f"🧬 Generation: {self.generation}")
-            self.log(f"📝 Changes: {explanation}")
-            self.log("=" * 60)
-            
-        except Exception as e:
-            self.log(f"❌ Mutation failed: {str(e)}")
-            self.log("🔄 Continuing with current code...")
-            self.status = "ALIVE"
+            with metrics.phase_seconds.time(organism=self.organism_id, phase="write"):
+                self._write_source(fixed_code)
+        
+        self.last_promotion = (error_log, current_code, mutation_type)
+        self.last_mutation = explanation
+        metrics.mutations.inc(organism=self.organism_id, type=mutation_type, outcome="promoted")
+        
+        self.log("✅ AI mutation successful!" + (" (cached)" if from_cache else ""))
+        self.log(f"💾 Saved as: generation {self.generation} ({self.genome_hash[:12]}, parent {parent_hash[:12]})")
+        self.log(f"🧬 Generation: {self.generation}")
+        self.log(f"📝 Changes: {explanation}")
+        self.log("=" * 60)
     
-    def _validate_code(self, code: str) -> bool:
-        """Validate that the code is syntactically correct"""
-        try:
-            compile(code, '<string>', 'exec')
-            return True
-        except SyntaxError as e:
-            self.log(f"⚠️ Validation failed: {str(e)}")
-            return False
+    def _mutation_failed(self, error: Exception):
+        """Keep the current code alive after a failed mutation"""
+        self.log(f"❌ Mutation failed: {str(error)}", "ERROR")
+        metrics.mutations.inc(organism=self.organism_id, type=self.mutation_type or "UNKNOWN", outcome="failed")
+        self.log("🔄 Continuing with current code...")
+        self.status = "ALIVE"
     
-    def _save_genome_version(self, code: str, context: str):
-        """Save code version to genome history"""
-        self.genome_history.append({
-            "generation": self.generation,
-            "timestamp": datetime.now().isoformat(),
-            "code": code,
-            "context": context[:200]
-        })
+    def _validate_code(self, code: str, reference: str) -> bool:
+        """Static checks only (syntax, entry points, imports) - for candidates about to be run anyway"""
+        result = check_static(code, reference, self.path)
+        if not result["valid"]:
+            self.log(f"⚠️ Validation failed at {result['stage']} stage: {result['error']}", "WARNING")
+        return result["valid"]
+    
+    def _save_genome_version(self, parent_code: str, code: str, context: str) -> str:
+        """Record the new generation, delta-encoded against the code it was mutated from"""
+        # The parent is usually the current generation plus a small corruption
+        parent_hash = self.genome_store.put(parent_code, self.genome_hash)
+        self.genome_hash = self.genome_store.record(
+            self.organism_id, self.generation, code, context, parent_hash
+        )
+        return parent_hash
+    
+    def _restore_genome(self) -> Optional[str]:
+        """Resume the generation counter from the genome store, seeding it on first run"""
+        if not os.path.exists(self.path):
+            return None
+        
+        latest = self.genome_store.latest(self.organism_id)
+        if latest is not None:
+            self.generation = latest["generation"]
+            return latest["hash"]
         
-        # Keep only last 10 versions
-        if len(self.genome_history) > 10:
-            self.genome_history.pop(0)
+        return self.genome_store.record(self.organism_id, self.generation, self._read_source(), "Initial genome")
+    
+    def get_genome_history(self, limit: int = 50) -> List[Dict]:
+        """Metadata of the newest generations"""
+        return self.genome_store.history(self.organism_id, limit)
+    
+    def genome_snapshot(self, limit: int = 50) -> Snapshot:
+        """get_genome_history as a snapshot, rebuilt only after a new generation is recorded"""
+        # Read the key before the store so a concurrent promotion can only make the entry stale-keyed
+        key = (self.generation, self.genome_hash)
+        snapshot = self._genome_snapshots.get(limit)
+        if snapshot is None or snapshot.key != key:
+            versions = self.get_genome_history(limit)
+            snapshot = make_snapshot({"versions": versions, "count": len(versions)}, key)
+            if len(self._genome_snapshots) >= 16:
+                self._genome_snapshots.clear()  # Bounded: clients rarely use more than a few limits
+            self._genome_snapshots[limit] = snapshot
+        return snapshot
+    
+    def get_genome(self, generation: int) -> Optional[Dict]:
+        """Source and metadata of one generation"""
+        return self.genome_store.get_generation(self.organism_id, generation)
+    
+    def _scaling_profile(self, code: str) -> Dict:
+        """Scaling profile of one source, measured once per hash (same seed and sizes, so reproducible)"""
+        digest = source_hash(code)
+        with self._scaling_lock:
+            profile = self._scaling_profiles.get(digest)
+            if profile is None:
+                self.log(f"📈 Profiling scaling of {digest[:8]} ({len(SCALING_SIZES)} sizes)...")
+                profile = benchmark_scaling(code, self.path, SCALING_SIZES,
+                                            trials=self.scaling_trials, budget=self.scaling_budget)
+                profile["hash"] = digest
+                if len(self._scaling_profiles) >= 16:
+                    self._scaling_profiles.clear()
+                self._scaling_profiles[digest] = profile
+        return profile
+    
+    def scaling_profile(self, compare_to: Optional[int] = None) -> Optional[Dict]:
+        """
+        Runtime table of the current generation across input sizes,
+        optionally compared against an earlier generation's table.
+        None if compare_to names an unknown generation.
+        """
+        with self.file_lock:
+            code = self._read_source()
+            generation = self.generation
+        result = {"organism_id": self.organism_id, "generation": generation,
+                  "profile": self._scaling_profile(code)}
+        result["table"] = format_scaling_table(result["profile"])
+        if compare_to is not None:
+            version = self.get_genome(compare_to)
+            if version is None:
+                return None
+            baseline = self._scaling_profile(version["code"])
+            result["baseline"] = {"generation": compare_to, "profile": baseline}
+            result["comparison"] = compare_scaling(baseline, result["profile"])
+        return result
     
     def inject_chaos(self, chaos_type: str = "random"):
         """Simulate an error by corrupting organism.py"""
-        self.log(f"☢️  CHAOS INJECTED: {chaos_type}")
+        self.log(f"☢️  CHAOS INJECTED: {chaos_type}", "WARNING")
+        
+        with self.file_lock:
+            try:
+                lines = self._read_source().splitlines(keepends=True)
+                
+                if chaos_type == "delete_line":
+                    # Delete a random line
+                    if len(lines) > 10:
+                        idx = random.randint(5, len(lines) - 5)
+                        deleted = lines.pop(idx)
+                        self.log(f"🗑️  Deleted line {idx}: {deleted.strip()}")
+                
+                elif chaos_type == "syntax_error":
+                    # Add a syntax error
+                    lines.insert(10, "this is not valid python!!!\n")
+                    self.log("💥 Injected syntax error")
+                
+                elif chaos_type == "division_by_zero":
+                    # Add division by zero
+                    lines.insert(15, "    result = 1 / 0  # Chaos!\n")
+                    self.log("💥 Injected division by zero")
+                
+                self._write_source("".join(lines))
+                
+                self.log("☢️  Organism corrupted successfully")
+                
+            except Exception as e:
+                self.log(f"❌ Chaos injection failed: {str(e)}", "ERROR")
+    
+    def _source_hash(self) -> Optional[str]:
+        """Content hash of the organism file as it is now"""
+        try:
+            return source_hash(self._read_source())
+        except OSError:
+            return None
+    
+    def _skip_unchanged(self) -> Optional[Dict]:
+        """Report for a cycle that can be skipped because known-good code has not changed"""
+        if self.known_good_hash is None or self._source_hash() != self.known_good_hash:
+            return None
+        self.skipped_runs += 1
+        self.log(f"⏭️  Source unchanged since last healthy run ({self.known_good_hash[:12]}) - skipping")
+        return {"success": True, "skipped": True}
+    
+    def run_cycle(self, skip_unchanged: bool = False) -> Dict:
+        """Run a single watch cycle (optionally skipped if the known-good source is unchanged)"""
+        skipped = self._skip_unchanged() if skip_unchanged else None
+        if skipped:
+            return skipped
+        
+        self.log("\n" + "=" * 60)
+        self.log(f"🔄 CYCLE START - Generation {self.generation}")
+        self.log("=" * 60)
         
         try:
-            with open("organism.py", "r") as f:
-                lines = f.readlines()
-            
-            if chaos_type == "delete_line":
-                # Delete a random line
-                import random
-                if len(lines) > 10:
-                    idx = random.randint(5, len(lines) - 5)
-                    deleted = lines.pop(idx)
-                    self.log(f"🗑️  Deleted line {idx}: {deleted.strip()}")
-            
-            elif chaos_type == "syntax_error":
-                # Add a syntax error
-                lines.insert(10, "this is not valid python!!!\n")
-                self.log("💥 Injected syntax error")
-            
-            elif chaos_type == "division_by_zero":
-                # Add division by zero
-                lines.insert(15, "    result = 1 / 0  # Chaos!\n")
-                self.log("💥 Injected division by zero")
-            
-            with open("organism.py", "w") as f:
-                f.writelines(lines)
-            
-            self.log("☢️  Organism corrupted successfully")
-            
-        except Exception as e:
-            self.log(f"❌ Chaos injection failed: {str(e)}")
+            return self.run_organism()
+        finally:
+            self._publish_status()
     
-    def start_watch_loop(self):
-        """Main watch loop (runs in background thread)"""
-        self.is_running = True
-        self.log("👁️  Watcher initialized")
-        self.log(f"🎯 Target latency: {self.target_latency}s")
+    async def arun_cycle(self, skip_unchanged: bool = False) -> Dict:
+        """Run a single watch cycle on the event loop"""
+        skipped = self._skip_unchanged() if skip_unchanged else None
+        if skipped:
+            return skipped
         
-        while self.is_running:
-            self.log("\n" + "=" * 60)
-            self.log(f"🔄 CYCLE START - Generation {self.generation}")
-            self.log("=" * 60)
-            
-            result = self.run_organism()
-            
-            # Wait before next cycle
-            time.sleep(3)
+        self.log("\n" + "=" * 60)
+        self.log(f"🔄 CYCLE START - Generation {self.generation}")
+        self.log("=" * 60)
+        
+        try:
+            return await self.arun_organism()
+        finally:
+            self._publish_status()
     
     def stop(self):
         """Stop the watch loop"""
         self.is_running = False
+        self.runner.close()
+        self.log("🛑 Watcher stopped")
+    
+    async def astop(self):
+        """Stop from the event loop, reaping the worker process"""
+        self.is_running = False
+        aclose = getattr(self.runner, "aclose", None)
+        if aclose is not None:
+            await aclose()
+        else:
+            self.runner.close()
         self.log("🛑 Watcher stopped")
     
     def get_status(self) -> Dict:
         """Get current status for API"""
-        avg_execution_time = sum(self.execution_times) / len(self.execution_times) if self.execution_times else 0
+        # Short-window averages; long-horizon trends come from get_history
+        avg_execution_time = self.execution_times.mean(10)
+        avg_cold_start_time = self.cold_start_times.mean(10)
+        last_cold_start = self.cold_start_times.recent(1)
         
         return {
+            "organism_id": self.organism_id,
             "generation": self.generation,
             "status": self.status,
             "last_mutation": self.last_mutation,
             "crash_count": self.crash_count,
             "successful_runs": self.successful_runs,
+            "skipped_runs": self.skipped_runs,
             "avg_execution_time": round(avg_execution_time, 3),
-            "recent_execution_times": [round(t, 3) for t in self.execution_times[-5:]],
-            "uptime": len(self.logs),
-            "last_error": self.last_error
+            "recent_execution_times": [round(t, 3) for t in self.execution_times.recent(5)],
+            "uptime": self.log_store.last_seq,
+            "last_error": self.last_error,
+            "runner_mode": self.runner.mode,
+            "cold_starts": self.runner.cold_starts,
+            "worker_restarts": self.runner.worker_restarts,
+            "avg_cold_start_time": round(avg_cold_start_time, 3),
+            "last_cold_start_time": round(last_cold_start[0], 3) if last_cold_start else None,
+            "complexity": self.complexity["class"] if self.complexity else None
+        }
+    
+    def get_history(self, resolution: str = "minute", since: Optional[float] = None,
+                    limit: Optional[int] = None) -> Dict:
+        """Run and cold-start timings as columnar series (raw samples or minute/hour rollups)"""
+        return {
+            "organism_id": self.organism_id,
+            "resolution": resolution,
+            "runs": len(self.execution_times),
+            "run": self.execution_times.history(resolution, since, limit),
+            "cold_start": self.cold_start_times.history(resolution, since, limit),
         }
     
     def get_logs(self, limit: int = 50) -> List[str]:
         """Get recent logs"""
-        return self.logs[-limit:]
+        return [entry.format() for entry in self.log_store.tail(limit)]
+    
+    def get_log_entries(self, since: Optional[int] = None, limit: int = 50) -> List[LogEntry]:
+        """Get structured log entries after the since cursor (or the newest ones)"""
+        if since is None:
+            return self.log_store.tail(limit)
+        return self.log_store.since(since, limit)
 
 
-# Global watcher instance
-watcher = OrganismWatcher()
+class OrganismScheduler:
+    """
+    The Colony - runs the watch cycles of many organisms on a bounded
+    worker pool. Each organism keeps its own generation, genome history
+    and metrics; cycles of different organisms run in parallel (each in
+    its own child process), while cycles of one organism never overlap.
+    """
+    
+    def __init__(self, paths: List[str], max_workers: Optional[int] = None, cycle_interval: float = 3.0,
+                 asynchronous: bool = False, source_watch: str = "off"):
+        self.asynchronous = asynchronous
+        self.source_watch = source_watch
+        self.watchers: Dict[str, OrganismWatcher] = {}
+        for path in paths:
+            organism_id = os.path.splitext(os.path.basename(path))[0]
+            if organism_id in self.watchers:
+                raise ValueError(f"Duplicate organism id: {organism_id}")
+            self.watchers[organism_id] = OrganismWatcher(organism_id, path, asynchronous)
+        
+        self.max_workers = max_workers or min(32, os.cpu_count() or 1)
+        self.cycle_interval = cycle_interval
+        self.is_running = False
+        rng = random.Random()
+        self._intervals: Dict[str, AdaptiveInterval] = {
+            organism_id: _adaptive_interval(cycle_interval, rng) for organism_id in self.watchers
+        }
+        # Initial jitter so organisms do not all start in the same instant
+        self._next_run: Dict[str, float] = {
+            organism_id: rng.uniform(0, self._intervals[organism_id].jitter * cycle_interval)
+            for organism_id in self.watchers
+        }
+        self._in_flight: set = set()
+        self._rerun: set = set()  # Organisms asked to run again as soon as their cycle finishes
+        self._forced: set = set()  # Organisms whose next cycle must run even if the source is unchanged
+        self._monitor: Optional[SourceMonitor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._async_wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def default(self) -> OrganismWatcher:
+        """The first configured organism (served by the legacy endpoints)"""
+        return next(iter(self.watchers.values()))
+    
+    def get(self, organism_id: str) -> Optional[OrganismWatcher]:
+        """Look up an organism's watcher by id"""
+        return self.watchers.get(organism_id)
+    
+    def _schedule_next(self, watcher: OrganismWatcher, report: Dict, generation: int):
+        """Pick the organism's next run time from the outcome of its cycle"""
+        organism_id = watcher.organism_id
+        self._in_flight.discard(organism_id)
+        if organism_id in self._rerun:
+            self._rerun.discard(organism_id)
+            self._next_run[organism_id] = 0.0
+            return
+        delay = self._intervals[organism_id].next(report.get("success", False), watcher.generation != generation)
+        self._next_run[organism_id] = time.monotonic() + delay
+    
+    def _skip_unchanged(self, organism_id: str) -> bool:
+        """Whether a due cycle may be skipped - only when file events stand in for polling"""
+        if organism_id in self._forced:
+            self._forced.discard(organism_id)
+            return False
+        return self._monitor is not None
+    
+    def _run_cycle(self, watcher: OrganismWatcher, skip_unchanged: bool = False):
+        """Run one cycle and schedule the organism's next one"""
+        generation, report = watcher.generation, {}
+        try:
+            report = watcher.run_cycle(skip_unchanged)
+        except Exception as e:
+            watcher.log(f"🚨 Cycle failed: {str(e)}", "ERROR")
+        finally:
+            with self._lock:
+                self._schedule_next(watcher, report, generation)
+            self._wakeup.set()
+    
+    async def _arun_cycle(self, watcher: OrganismWatcher, semaphore: asyncio.Semaphore, skip_unchanged: bool = False):
+        """Run one cycle on the event loop and schedule the organism's next one"""
+        generation, report = watcher.generation, {}
+        try:
+            async with semaphore:
+                report = await watcher.arun_cycle(skip_unchanged)
+        except Exception as e:
+            watcher.log(f"🚨 Cycle failed: {str(e)}", "ERROR")
+        finally:
+            self._schedule_next(watcher, report, generation)
+            self._async_wakeup.set()
+    
+    def run_now(self, organism_id: str) -> bool:
+        """
+        Run an organism on the next dispatch instead of waiting out its
+        interval. Returns True if a cycle is already in flight, in which
+        case another one starts as soon as it finishes.
+        """
+        with self._lock:
+            self._intervals[organism_id].reset()
+            self._forced.add(organism_id)
+            in_flight = organism_id in self._in_flight
+            if in_flight:
+                self._rerun.add(organism_id)
+            else:
+                self._next_run[organism_id] = 0.0
+        
+        if self._async_wakeup is not None:
+            self._async_wakeup.set()
+        self._wakeup.set()
+        return in_flight
+    
+    def next_run_in(self, organism_id: str) -> Optional[float]:
+        """Seconds until the organism's next cycle (None while one is running)"""
+        if organism_id in self._in_flight:
+            return None
+        return max(0.0, self._next_run[organism_id] - time.monotonic())
+    
+    def _source_changed(self, path: str):
+        """File event from the source monitor thread: run the organism now"""
+        watcher = next((w for w in self.watchers.values() if w.path == path), None)
+        if watcher is None:
+            return
+        watcher.log("👀 Source changed - running now")
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self.run_now, watcher.organism_id)
+        else:
+            self.run_now(watcher.organism_id)
+    
+    def _start_monitor(self):
+        """Watch organism sources when SOURCE_WATCH is enabled"""
+        if self.source_watch == "off":
+            return
+        self._monitor = SourceMonitor([w.path for w in self.watchers.values()], self._source_changed, self.source_watch)
+        self._monitor.start()
+        for watcher in self.watchers.values():
+            watcher.log(f"👀 Watching source for changes ({self._monitor.mode})")
+    
+    def _stop_monitor(self):
+        if self._monitor is not None:
+            self._monitor.stop()
+            self._monitor = None
+    
+    def _initialize_watchers(self):
+        """Mark every organism as running"""
+        self.is_running = True
+        for watcher in self.watchers.values():
+            watcher.is_running = True
+            watcher.log("👁️  Watcher initialized")
+            watcher.log(f"🎯 Optimization trigger: {watcher._describe_trigger()}")
+        self._start_monitor()
+    
+    async def run_async(self):
+        """
+        Dispatch due organisms as asyncio tasks on the running event loop.
+        Concurrency is bounded by max_workers; cancelling this coroutine
+        cancels every in-flight cycle and kills their worker processes.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._initialize_watchers()
+        self._async_wakeup = asyncio.Event()
+        semaphore = asyncio.Semaphore(self.max_workers)
+        tasks = set()
+        
+        try:
+            while self.is_running:
+                now = time.monotonic()
+                for organism_id, watcher in self.watchers.items():
+                    if organism_id not in self._in_flight and self._next_run[organism_id] <= now:
+                        self._in_flight.add(organism_id)
+                        task = asyncio.create_task(
+                            self._arun_cycle(watcher, semaphore, self._skip_unchanged(organism_id))
+                        )
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                pending = [t for o, t in self._next_run.items() if o not in self._in_flight]
+                
+                # Cancellable sleep until the next organism is due or a cycle finishes
+                timeout = max(0.0, min(pending) - now) if pending else None
+                try:
+                    await asyncio.wait_for(self._async_wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._async_wakeup.clear()
+        finally:
+            self._stop_monitor()
+            self._loop = None
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for watcher in self.watchers.values():
+                await watcher.astop()
+    
+    def start_async(self) -> asyncio.Task:
+        """Start run_async as a task on the current event loop"""
+        self._task = asyncio.get_running_loop().create_task(self.run_async())
+        return self._task
+    
+    async def astop(self):
+        """Stop the scheduler from the event loop, cancelling in-flight cycles"""
+        if self._task is None:
+            self.stop()
+            return
+        self.is_running = False
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+    
+    def start_watch_loop(self):
+        """Dispatch due organisms to the worker pool (runs in background thread)"""
+        self._initialize_watchers()
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="organism") as pool:
+            while self.is_running:
+                now = time.monotonic()
+                with self._lock:
+                    for organism_id, watcher in self.watchers.items():
+                        if organism_id not in self._in_flight and self._next_run[organism_id] <= now:
+                            self._in_flight.add(organism_id)
+                            pool.submit(self._run_cycle, watcher, self._skip_unchanged(organism_id))
+                    pending = [t for o, t in self._next_run.items() if o not in self._in_flight]
+                
+                # Sleep until the next organism is due or a cycle finishes
+                timeout = max(0.0, min(pending) - now) if pending else None
+                self._wakeup.wait(timeout)
+                self._wakeup.clear()
+    
+    def stop(self):
+        """Stop dispatching and shut every organism down"""
+        self.is_running = False
+        self._wakeup.set()
+        self._stop_monitor()
+        for watcher in self.watchers.values():
+            watcher.stop()
+
+
+def _organism_paths(spec: Optional[str] = None) -> List[str]:
+    """
+    Resolve ORGANISMS (comma-separated files or directories, relative to
+    the backend) to organism files. Blank entries are skipped; the backend
+    directory itself is refused, since every module in it would become an
+    organism.
+    """
+    spec = os.getenv("ORGANISMS", "organism.py") if spec is None else spec
+    paths = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        entry = os.path.abspath(os.path.join(BASE_DIR, entry))
+        if entry == BASE_DIR:
+            raise ValueError("ORGANISMS must not name the backend directory itself")
+        if os.path.isdir(entry):
+            paths.extend(
+                os.path.join(entry, name) for name in sorted(os.listdir(entry))
+                if name.endswith(".py") and not re.search(r"_v\d+\.py$", name)
+            )
+        else:
+            paths.append(entry)
+    return paths or [os.path.join(BASE_DIR, "organism.py")]
+
+
+# Global scheduler instance
+scheduler = OrganismScheduler(
+    _organism_paths(),
+    max_workers=int(os.getenv("ORGANISM_WORKERS", "0")) or None,
+    cycle_interval=float(os.getenv("CYCLE_INTERVAL", "3")),
+    asynchronous=WATCHER_MODE == "async",
+    source_watch=os.getenv("SOURCE_WATCH", "off")
+)
+
+# Default watcher instance (first organism)
+watcher = scheduler.default
 
 
 def start_watcher():
-    """Start the watcher in a background thread"""
-    thread = threading.Thread(target=watcher.start_watch_loop, daemon=True)
+    """Start the scheduler on the running event loop (async mode) or in a background thread"""
+    if scheduler.asynchronous:
+        scheduler.start_async()
+        return scheduler
+    
+    thread = threading.Thread(target=scheduler.start_watch_loop, daemon=True)
     thread.start()
-    return watcher
+    return scheduler
 
 
 if __name__ == "__main__":
@@ -294,7 +1223,10 @@ if __name__ == "__main__":
     print("=" * 60)
     
     try:
-        watcher.start_watch_loop()
+        if scheduler.asynchronous:
+            asyncio.run(scheduler.run_async())
+        else:
+            scheduler.start_watch_loop()
     except KeyboardInterrupt:
-        watcher.stop()
+        scheduler.stop()
         print("\n👋 Watcher stopped by user")
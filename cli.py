@@ -0,0 +1,122 @@
+"""
+cli.py - The Voice
+How main.py reports a result: subquadratic decimal conversion, hex and raw
+binary encodings, chunked writes and the argparse command line.
+"""
+import argparse
+import decimal
+import sys
+import time
+
+
+# Below this many bits str() is fast enough (and within sys.int_max_str_digits)
+DECIMAL_SPLIT_BITS = 8192
+# Bytes per write when streaming a result out
+OUTPUT_CHUNK_SIZE = 1 << 16
+
+
+def _to_decimal(value):
+    """
+    Exact decimal.Decimal of a non-negative int, splitting on bit halves:
+    value = hi * 2^k + lo. libmpdec multiplies large numbers in
+    subquadratic time, so the whole conversion is subquadratic, unlike
+    str(int), which is quadratic and refuses values past
+    sys.int_max_str_digits.
+    """
+    powers = {}
+
+    def power_of_two(bits):
+        if bits not in powers:
+            half = bits // 2
+            powers[bits] = (power_of_two(half) * power_of_two(bits - half)) if bits > DECIMAL_SPLIT_BITS \
+                else decimal.Decimal(1 << bits)
+        return powers[bits]
+
+    def convert(n, bits):
+        if bits <= DECIMAL_SPLIT_BITS:
+            return decimal.Decimal(n)
+        half = bits // 2
+        return convert(n >> half, bits - half) * power_of_two(half) + convert(n & ((1 << half) - 1), half)
+
+    with decimal.localcontext() as context:
+        context.prec = decimal.MAX_PREC
+        context.Emax = decimal.MAX_EMAX
+        context.traps[decimal.Inexact] = True  # Never round silently
+        return convert(value, value.bit_length())
+
+
+def to_decimal_string(value):
+    """Decimal digits of a non-negative int of any size"""
+    if value.bit_length() <= DECIMAL_SPLIT_BITS:
+        return str(value)
+    return str(_to_decimal(value))
+
+
+def encode_result(value, fmt="decimal"):
+    """value as bytes: decimal or hex digits, or raw big-endian binary"""
+    if fmt == "binary":
+        return value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big")
+    if fmt == "hex":
+        return format(value, "x").encode("ascii")  # Power-of-two bases convert in linear time
+    return to_decimal_string(value).encode("ascii")
+
+
+def write_chunks(data, stream, chunk_size=OUTPUT_CHUNK_SIZE):
+    """Write bytes to a binary stream a chunk at a time"""
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        stream.write(view[start:start + chunk_size])
+    return len(data)
+
+
+def run(compute, argv=None):
+    """Command line: compute F(n) with compute(n) and write it as decimal, hex or raw binary"""
+    parser = argparse.ArgumentParser(description="Calculate the nth Fibonacci number.")
+    parser.add_argument("n", nargs="?", type=int, default=15, help="index of the Fibonacci number (default: 15)")
+    parser.add_argument("-f", "--format", choices=("decimal", "hex", "binary"), default="decimal",
+                        help="decimal or hex digits, or raw big-endian bytes (default: decimal)")
+    parser.add_argument("-o", "--output", default="-", help="file to write the result to (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=OUTPUT_CHUNK_SIZE, help="bytes per write")
+    parser.add_argument("--time", action="store_true", help="report compute and output times on stderr")
+    args = parser.parse_args(argv)
+
+    to_stdout = args.output == "-"
+    # Raw bytes on stdout must not be mixed with messages
+    info = sys.stderr if to_stdout and args.format == "binary" else sys.stdout
+
+    try:
+        print(f"Calculating Fibonacci({args.n})...", file=info)
+        start = time.perf_counter()
+        result = compute(args.n)
+        computed = time.perf_counter()
+
+        data = encode_result(result, args.format)
+        encoded = time.perf_counter()
+
+        if to_stdout:
+            # Captured stdout (a test harness, the warm runner) is text-only
+            stream = getattr(sys.stdout, "buffer", None)
+            if stream is None and args.format == "binary":
+                raise ValueError("Binary output needs a byte stream; use --output.")
+            if args.format != "binary":
+                print("Result: ", end="", file=info)
+            sys.stdout.flush()
+            if stream is None:
+                sys.stdout.write(data.decode("ascii"))
+            else:
+                write_chunks(data, stream, args.chunk_size)
+                stream.flush()
+            if args.format != "binary":
+                print(file=info)
+        else:
+            with open(args.output, "wb") as f:
+                write_chunks(data, f, args.chunk_size)
+            print(f"Result: {len(data):,} bytes ({args.format}) written to {args.output}", file=info)
+        written = time.perf_counter()
+
+        print("Calculation successful", file=info)
+        if args.time:
+            print(f"Computed in {computed - start:.3f}s, encoded in {encoded - computed:.3f}s, "
+                  f"written in {written - encoded:.3f}s ({result.bit_length():,} bits)", file=sys.stderr)
+    except ValueError as e:
+        print(f"Error: {e}", file=info)
@@ -99,17 +99,63 @@ export default function GodView() {
     }
   }
 
-  // Poll for updates
+  // Live updates: server push over /stream, polling only while the stream is down
   useEffect(() => {
     fetchStatus()
     fetchLogs()
-    
-    const statusInterval = setInterval(fetchStatus, 1000)
-    const logsInterval = setInterval(fetchLogs, 2000)
-    
+
+    let statusInterval: ReturnType<typeof setInterval> | null = null
+    let logsInterval: ReturnType<typeof setInterval> | null = null
+
+    const startPolling = () => {
+      if (statusInterval) return
+      statusInterval = setInterval(fetchStatus, 1000)
+      logsInterval = setInterval(fetchLogs, 2000)
+    }
+
+    const stopPolling = () => {
+      if (statusInterval) clearInterval(statusInterval)
+      if (logsInterval) clearInterval(logsInterval)
+      statusInterval = null
+      logsInterval = null
+    }
+
+    if (typeof EventSource === 'undefined') {
+      startPolling()
+      return stopPolling
+    }
+
+    const source = new EventSource(`${API_URL}/stream?limit=20`)
+
+    source.addEventListener('snapshot', (event) => {
+      const data = JSON.parse((event as MessageEvent).data)
+      setStatus(data.status)
+      // Snapshots sent on resume (Last-Event-ID) carry no logs, the missed lines follow as log events
+      if (data.logs) setLogs(data.logs)
+      setIsConnected(true)
+      setError(null)
+      stopPolling()
+    })
+
+    source.addEventListener('log', (event) => {
+      const data = JSON.parse((event as MessageEvent).data)
+      setLogs((prev) => [...prev, data.line].slice(-20))
+    })
+
+    source.addEventListener('status', (event) => {
+      const data = JSON.parse((event as MessageEvent).data)
+      setStatus((prev) => (prev ? { ...prev, ...data.changes } : prev))
+    })
+
+    // We fell behind and lost lines - resync the terminal once
+    source.addEventListener('lagged', () => fetchLogs())
+
+    // EventSource reconnects by itself; poll until the next snapshot arrives
+    source.onerror = () => startPolling()
+
     return () => {
-      clearInterval(statusInterval)
-      clearInterval(logsInterval)
+      source.close()
+      stopPolling()
     }
   }, [])
 
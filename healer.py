@@ -1,9 +1,14 @@
 """
 healer.py - The AI Doctor
-Uses Groq to analyze errors and fix the code automatically.
+Uses an LLM provider (Groq by default) to analyze errors and fix the code automatically.
 """
 import os
-from groq import Groq
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from providers import get_provider  # noqa: E402
+from validator import validate_code  # noqa: E402
 
 
 def read_file(filepath):
@@ -15,16 +20,19 @@ def read_file(filepath):
         return ""
 
 
+def reply_budget(code):
+    """max_tokens for a whole-file reply: the file (about 4 characters a token) plus half again, within 2000..8000"""
+    return max(2000, min(8000, len(code) * 3 // 8))
+
+
 def heal_code():
-    """Use Groq AI to fix the broken code"""
-    # Initialize Groq client
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        print("❌ GROQ_API_KEY not found in environment variables")
+    """Use the configured LLM provider (LLM_PROVIDER) to fix the broken code"""
+    try:
+        provider = get_provider()
+    except (ValueError, ImportError) as e:
+        print(f"❌ {e}")
         return False
     
-    client = Groq(api_key=api_key)
-    
     # Read the broken code and error log
     current_code = read_file("main.py")
     error_log = read_file("error.log")
@@ -37,10 +45,10 @@ def heal_code():
         print("⚠️  No error.log found, but attempting to optimize code anyway")
         error_log = "No specific error. Optimize the code to handle larger inputs."
     
-    print("🧬 Analyzing error and generating fix...")
+    print(f"🧬 Analyzing error and generating fix ({provider.name}: {provider.model})...")
     print(f"📋 Error context: {error_log[:200]}")
     
-    # Create prompt for Groq
+    # Create prompt for the LLM
     prompt = f"""The following Python code has an error:
 
 ERROR LOG:
@@ -58,10 +66,8 @@ Fix the error and return the complete corrected Python code. The code should:
 Return ONLY the fixed Python code, nothing else. No markdown, no explanations."""
     
     try:
-        # Call Groq API
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
+        fixed_code = provider.complete(
+            [
                 {
                     "role": "system",
                     "content": "You are a Python Expert. Fix the error in the code. Return ONLY the full valid Python code. No markdown."
@@ -71,11 +77,10 @@ Return ONLY the fixed Python code, nothing else. No markdown, no explanations.""
                     "content": prompt
                 }
             ],
+            {"error_log": error_log, "current_code": current_code, "mutation_type": "ERROR"},
             temperature=0.3,
-            max_tokens=2000
-        )
-        
-        fixed_code = response.choices[0].message.content.strip()
+            max_tokens=reply_budget(current_code)
+        ).strip()
         
         # Remove markdown code blocks if present
         if fixed_code.startswith("```python"):
@@ -83,13 +88,13 @@ Return ONLY the fixed Python code, nothing else. No markdown, no explanations.""
         elif fixed_code.startswith("```"):
             fixed_code = fixed_code.split("```")[1].split("```")[0].strip()
         
-        # Validate the fixed code
-        try:
-            compile(fixed_code, '<string>', 'exec')
-            print("✅ Generated code is syntactically valid")
-        except SyntaxError as e:
-            print(f"❌ Generated code has syntax errors: {e}")
+        # Validate the fixed code: syntax, entry points, imports, then a sandboxed smoke run
+        validation = validate_code(fixed_code, os.path.abspath("main.py"), current_code,
+                                   timeout=float(os.getenv("SMOKE_TIMEOUT", "3")))
+        if not validation["valid"]:
+            print(f"❌ Generated code failed {validation['stage']} validation: {validation['error']}")
             return False
+        print(f"✅ Generated code passed validation ({validation['time'] * 1000:.0f}ms)")
         
         # Write fixed code back to main.py
         with open("main.py", 'w') as f:
@@ -2,35 +2,123 @@
 main.py - The Organism
 A Fibonacci calculator with an intentional bug fixed for demonstration.
 """
+from collections import OrderedDict
+
+from cli import run as run_cli
+from pisano import fibonacci_mod, fibonacci_mod_many, pisano_period  # noqa: F401 (part of this module's API)
+
+
+# Computed (F(n), F(n + 1)) pairs, least recently used first
+CHECKPOINT_CAPACITY = 64
+# Requests this close above a checkpoint are stepped forward from it instead of recomputed
+CHECKPOINT_REACH = 4096
+
+_checkpoints = OrderedDict()
+
+
+def _validate(n):
+    """Enforce the input contract shared by every entry point"""
+    if not isinstance(n, int) or n < 0:
+        raise ValueError("Input must be a non-negative integer.")
+
+
+def _doubling(n, start=0, pair=(0, 1)):
+    """
+    (F(n), F(n + 1)) by fast doubling over the bits of n, O(log n)
+    multiplications. pair is (F(start), F(start + 1)) for a prefix of n's
+    bits (start == n >> k), so a checkpointed prefix skips the leading bits.
+    """
+    a, b = pair
+    shift = n.bit_length() - start.bit_length() if start else n.bit_length()
+    for bit in range(shift - 1, -1, -1):
+        # F(2k) = F(k) * (2F(k+1) - F(k)),  F(2k+1) = F(k)^2 + F(k+1)^2
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if (n >> bit) & 1:
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+
+def _advance(pair, m):
+    """(F(k + m), F(k + m + 1)) from pair = (F(k), F(k + 1))"""
+    fk, fk1 = pair
+    if m <= 32:
+        for _ in range(m):
+            fk, fk1 = fk1, fk + fk1
+        return fk, fk1
+    # F(k+m) = F(k+1)F(m) + F(k)(F(m+1) - F(m)),  F(k+m+1) = F(k+1)F(m+1) + F(k)F(m)
+    fm, fm1 = _doubling(m)
+    return fk1 * fm + fk * (fm1 - fm), fk1 * fm1 + fk * fm
+
+
+def _remember(n, pair):
+    _checkpoints[n] = pair
+    _checkpoints.move_to_end(n)
+    while len(_checkpoints) > CHECKPOINT_CAPACITY:
+        _checkpoints.popitem(last=False)
+
+
+def _fibonacci_pair(n):
+    """(F(n), F(n + 1)), seeded from the nearest checkpoint when one is useful"""
+    if n in _checkpoints:
+        _checkpoints.move_to_end(n)
+        return _checkpoints[n]
+
+    below = [k for k in _checkpoints if k <= n]
+    nearest = max(below) if below else None
+    if nearest is not None and n - nearest <= CHECKPOINT_REACH:
+        pair = _advance(_checkpoints[nearest], n - nearest)
+    else:
+        # Resume doubling from the longest checkpointed bit prefix of n, if any
+        prefix = next((n >> k for k in range(1, n.bit_length()) if (n >> k) in _checkpoints), 0)
+        pair = _doubling(n, prefix, _checkpoints[prefix]) if prefix else _doubling(n)
+
+    _remember(n, pair)
+    return pair
 
 
 def fibonacci(n):
     """Calculate the nth Fibonacci number"""
     # Check for negative inputs
-    if not isinstance(n, int) or n < 0:
-        raise ValueError("Input must be a non-negative integer.")
-    
+    _validate(n)
+
     # Base cases
     if n <= 1:
         return n
-    
-    # Initialize variables for the Fibonacci sequence
-    a, b = 0, 1
-    
-    # Calculate the nth Fibonacci number
-    for _ in range(2, n + 1):
-        a, b = b, a + b
-    
-    return b
+
+    return _fibonacci_pair(n)[0]
+
+
+def fibonacci_many(ns):
+    """
+    Calculate F(n) for every n in ns, returned in the same order. Requests
+    are solved in ascending order, each stepped forward from the previous
+    result, so a batch costs little more than its largest member.
+    """
+    ns = list(ns)
+    for n in ns:
+        _validate(n)
+
+    results = {}
+    previous = None
+    for n in sorted(set(ns)):
+        if n in _checkpoints or previous is None:
+            pair = _fibonacci_pair(n)
+        else:
+            pair = _advance(previous[1], n - previous[0])
+            _remember(n, pair)
+        results[n] = pair[0]
+        previous = (n, pair)
+
+    return [results[n] for n in ns]
+
+
+def main(argv=None):
+    """Command line: compute F(n) and write it as decimal, hex or raw binary"""
+    run_cli(fibonacci, argv)
 
 
 if __name__ == "__main__":
-    # Test with a value
-    test_value = 15
-    try:
-        print(f"Calculating Fibonacci({test_value})...")
-        result = fibonacci(test_value)
-        print(f"Result: {result}")
-        print("Calculation successful")
-    except ValueError as e:
-        print(f"Error: {e}")
\ No newline at end of file
+    main()
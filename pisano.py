@@ -0,0 +1,192 @@
+"""
+pisano.py - The Cycle
+Fibonacci numbers modulo m without building F(n): indices are reduced by
+the Pisano period and the rest is 2x2 matrix powering, with a vectorized
+NumPy path for batches. Imported by main.py.
+"""
+from functools import lru_cache
+from math import gcd
+
+try:
+    import numpy as np
+except ImportError:  # Optional: batched modular queries fall back to the scalar path
+    np = None
+
+
+# Largest modulus whose Pisano period is worth finding (trial division up to its square root)
+PISANO_LIMIT = 10 ** 10
+# Largest modulus the NumPy path handles: 2 * (m - 1)^2 must fit in 64 bits
+VECTOR_MODULUS_LIMIT = 2 ** 31
+
+
+def _validate(n):
+    """The input contract of main.fibonacci"""
+    if not isinstance(n, int) or n < 0:
+        raise ValueError("Input must be a non-negative integer.")
+
+
+def _validate_modulus(m):
+    if not isinstance(m, int) or m < 1:
+        raise ValueError("Modulus must be a positive integer.")
+
+
+def _matrix_multiply(x, y, m):
+    """Product of two 2x2 matrices stored as (a, b, c, d) row-major, mod m"""
+    return (
+        (x[0] * y[0] + x[1] * y[2]) % m,
+        (x[0] * y[1] + x[1] * y[3]) % m,
+        (x[2] * y[0] + x[3] * y[2]) % m,
+        (x[2] * y[1] + x[3] * y[3]) % m,
+    )
+
+
+def _fibonacci_pair_mod(n, m):
+    """(F(n), F(n + 1)) mod m from [[1, 1], [1, 0]]^n = [[F(n+1), F(n)], [F(n), F(n-1)]]"""
+    result = (1 % m, 0, 0, 1 % m)
+    base = (1, 1, 1, 0)
+    while n:
+        if n & 1:
+            result = _matrix_multiply(result, base, m)
+        base = _matrix_multiply(base, base, m)
+        n >>= 1
+    return result[1], result[0]
+
+
+def _factorize(n):
+    """Prime factorization by trial division, {prime: exponent}"""
+    factors = {}
+    d = 2
+    while d * d <= n:
+        while n % d == 0:
+            factors[d] = factors.get(d, 0) + 1
+            n //= d
+        d += 1 if d == 2 else 2
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    return factors
+
+
+def _prime_pisano(p):
+    """Pisano period of a prime: a divisor of p - 1 or 2(p + 1), depending on p mod 5"""
+    if p == 2:
+        return 3
+    if p == 5:
+        return 20
+    period = p - 1 if p % 5 in (1, 4) else 2 * (p + 1)
+    for q in _factorize(period):
+        while period % q == 0 and _fibonacci_pair_mod(period // q, p) == (0, 1):
+            period //= q
+    return period
+
+
+@lru_cache(maxsize=256)
+def pisano_period(m):
+    """
+    Period of F(n) mod m, from the periods of its prime powers:
+    pi(p^k) divides p^(k-1) * pi(p), with equality for every prime known.
+    Either way the result is a period, which is all reduction needs.
+    """
+    _validate_modulus(m)
+    period = 1
+    for p, k in _factorize(m).items():
+        part = _prime_pisano(p) * p ** (k - 1)
+        period = period * part // gcd(period, part)
+    return period
+
+
+def fibonacci_mod(n, m):
+    """
+    Calculate F(n) mod m without building F(n): n is reduced modulo the
+    Pisano period, then [[1, 1], [1, 0]] is raised to it by squaring.
+    """
+    _validate(n)
+    _validate_modulus(m)
+
+    # The period is at most 6m, so reduction only pays when n is much larger than m
+    if m <= PISANO_LIMIT and n.bit_length() > m.bit_length() + 3:
+        n %= pisano_period(m)
+
+    return _fibonacci_pair_mod(n, m)[0]
+
+
+def _fibonacci_mod_vector(ns, ms):
+    """F(n) mod m elementwise for a uint64 array of n and m below VECTOR_MODULUS_LIMIT (array or scalar)"""
+    def reduce_once(x):
+        # x < 2m -> x mod m; for unsigned values x - m wraps around when x < m, so the minimum is right
+        return np.minimum(x, x - ms, out=x)
+
+    a = np.zeros(ns.shape, dtype=np.uint64)
+    b = np.ones(ns.shape, dtype=np.uint64) % ms
+    top = int(ns.max()).bit_length() if ns.size else 0
+    for bit in range(top - 1, -1, -1):
+        # Fast doubling on all pairs at once; leading zero bits leave (F(0), F(1)) unchanged
+        c = 2 * b
+        c += ms
+        c -= a
+        c = reduce_once(reduce_once(c))
+        c *= a
+        c %= ms
+        d = a * a
+        d += b * b
+        d %= ms
+        total = reduce_once(c + d)
+        odd = ((ns >> np.uint64(bit)) & np.uint64(1)).astype(bool)
+        np.copyto(c, d, where=odd)
+        np.copyto(d, total, where=odd)
+        a, b = c, d
+    return a
+
+
+def _reduce_by_period(ns, ms):
+    """n mod pisano_period(m) when there are few distinct moduli (periods are below 2^34)"""
+    if ms.ndim == 0:
+        return ns % np.uint64(pisano_period(int(ms)))
+    moduli, inverse = np.unique(ms, return_inverse=True)
+    if len(moduli) > 64:
+        return ns
+    periods = np.array([pisano_period(int(m)) for m in moduli], dtype=np.uint64)
+    return ns % periods[inverse.reshape(ns.shape)]
+
+
+def fibonacci_mod_many(ns, ms):
+    """
+    Calculate F(n) mod m for arrays of n and m (m may be a single modulus).
+    With NumPy installed, integer inputs are evaluated in one vectorized
+    pass and an array is returned; moduli of 2^31 and above, and values
+    NumPy cannot hold, use fibonacci_mod. Without NumPy the result is a
+    list.
+    """
+    if np is None:
+        ns = list(ns)
+        ms = list(ms) if hasattr(ms, "__iter__") else [ms] * len(ns)
+        if len(ms) != len(ns):
+            raise ValueError("ns and ms must have the same length.")
+        return [fibonacci_mod(n, m) for n, m in zip(ns, ms)]
+
+    n_array = np.asarray(ns)
+    m_array = np.asarray(ms)
+    if m_array.ndim == 0 and m_array.dtype.kind in "iu" and 1 <= ms < VECTOR_MODULUS_LIMIT \
+            and n_array.dtype.kind in "iu" and not (n_array < 0).any():
+        # One small modulus: no per-element moduli to materialize
+        n_array = _reduce_by_period(n_array.astype(np.uint64), m_array)
+        return _fibonacci_mod_vector(n_array, np.uint64(ms)).astype(m_array.dtype)
+    m_array = np.broadcast_to(m_array, n_array.shape) if m_array.ndim == 0 else m_array
+    if n_array.shape != m_array.shape:
+        raise ValueError("ns and ms must have the same length.")
+    if n_array.dtype.kind not in "iu" or m_array.dtype.kind not in "iu":
+        # Python ints beyond 64 bits (object arrays) or non-integers: fibonacci_mod validates each
+        values = [fibonacci_mod(n, m) for n, m in zip(n_array.ravel().tolist(), m_array.ravel().tolist())]
+        return np.array(values, dtype=object).reshape(n_array.shape)
+    if (n_array < 0).any():
+        raise ValueError("Input must be a non-negative integer.")
+    if (m_array < 1).any():
+        raise ValueError("Modulus must be a positive integer.")
+
+    result = np.zeros(n_array.shape, dtype=m_array.dtype)  # Every F(n) mod m fits wherever m does
+    small = m_array < VECTOR_MODULUS_LIMIT
+    small_ms = m_array[small].astype(np.uint64)
+    small_ns = _reduce_by_period(n_array[small].astype(np.uint64), small_ms)
+    result[small] = _fibonacci_mod_vector(small_ns, small_ms)
+    for index in zip(*np.nonzero(~small)):
+        result[index] = fibonacci_mod(int(n_array[index]), int(m_array[index]))
+    return result
@@ -0,0 +1,30 @@
+"""
+Shared fixtures: backend modules are importable by name, and the root
+main.py (the GitHub Actions organism) is loaded as `organism_main` so it
+does not clash with backend/main.py.
+"""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND = os.path.join(ROOT, "backend")
+MAIN_PATH = os.path.join(ROOT, "main.py")
+
+if BACKEND not in sys.path:
+    sys.path.insert(0, BACKEND)
+# Modules the root main.py imports, after the backend so backend/main.py keeps its name
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+
+@pytest.fixture(scope="session")
+def organism_main():
+    """The root main.py as a module"""
+    spec = importlib.util.spec_from_file_location("organism_main", MAIN_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,50 @@
+"""Adaptive cycle interval: fast re-checks after mutations, exponential backoff otherwise"""
+import random
+
+from watcher import AdaptiveInterval
+
+
+def interval(**kwargs):
+    return AdaptiveInterval(base=1.0, min_interval=0.25, max_interval=8.0, jitter=0.0, **kwargs)
+
+
+def test_stable_organism_backs_off_to_the_cap():
+    schedule = interval()
+    assert [schedule.next(True, False) for _ in range(6)] == [1, 2, 4, 8, 8, 8]
+
+
+def test_mutation_rechecks_quickly_then_restarts_backoff():
+    schedule = interval()
+    for _ in range(4):
+        schedule.next(True, False)
+    assert schedule.next(True, True) == 0.25
+    assert schedule.next(True, False) == 1
+
+
+def test_outcome_change_restarts_backoff():
+    schedule = interval()
+    for _ in range(3):
+        schedule.next(True, False)
+    assert [schedule.next(False, False) for _ in range(3)] == [1, 2, 4]
+    assert schedule.next(True, False) == 1
+
+
+def test_reset():
+    schedule = interval()
+    for _ in range(3):
+        schedule.next(True, False)
+    schedule.reset()
+    assert schedule.next(True, False) == 1
+
+
+def test_jitter_stays_in_bounds():
+    samples = [AdaptiveInterval(base=2.0, jitter=0.1, rng=random.Random(seed)).next(True, False) for seed in range(50)]
+    assert all(1.8 <= sample <= 2.2 for sample in samples)
+    assert len(set(samples)) > 1
+
+
+def test_long_streaks_do_not_overflow():
+    schedule = interval()
+    for _ in range(2000):
+        last = schedule.next(True, False)
+    assert last == 8
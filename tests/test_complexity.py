@@ -0,0 +1,60 @@
+"""Growth-class estimation from scaling profiles"""
+import math
+import random
+
+import pytest
+
+from complexity import CLASSES, MODELS, estimate_complexity, exceeds, fit_loglog, parse_class
+
+
+SIZES = [1_000, 2_000, 4_000, 8_000, 16_000, 32_000]
+
+
+def profile(f, scale, noise=0.0, seed=0):
+    rng = random.Random(seed)
+    rows = [{"size": n, "median": scale * f(n) * math.exp(rng.gauss(0, noise)), "status": "ok"} for n in SIZES]
+    return {"rows": rows}
+
+
+@pytest.mark.parametrize("name, f", [model for model in MODELS if model[0] != "O(1)"])
+def test_recovers_each_class(name, f):
+    scale = 1.0 / f(SIZES[0])  # One second at the smallest size
+    assert estimate_complexity(profile(f, scale, noise=0.03))["class"] == name
+
+
+def test_constant_time():
+    assert estimate_complexity(profile(lambda n: 1.0, 0.01, noise=0.02))["class"] == "O(1)"
+
+
+def test_loglog_slope():
+    slope, intercept, r2 = fit_loglog(SIZES, [3e-9 * n ** 2 for n in SIZES])
+    assert slope == pytest.approx(2.0)
+    assert intercept == pytest.approx(math.log(3e-9))
+    assert r2 == pytest.approx(1.0)
+
+
+def test_too_fast_or_failed_sizes_are_ignored():
+    rows = [{"size": n, "median": 1e-6, "status": "ok"} for n in SIZES]
+    rows[-1] = {"size": SIZES[-1], "median": 0.5, "status": "ok"}
+    assert estimate_complexity({"rows": rows}) is None
+    rows[-2] = {"size": SIZES[-2], "median": 0.0, "status": "timeout"}
+    assert estimate_complexity({"rows": rows}) is None
+
+
+@pytest.mark.parametrize("text, name", [("n log n", "O(n log n)"), ("O(n²)", "O(n^2)"), ("nlogn", "O(n log n)"),
+                                        ("n**3", "O(n^3)"), ("O(1)", "O(1)"), ("log n", "O(log n)")])
+def test_parse_class(text, name):
+    assert parse_class(text) == name
+
+
+def test_parse_class_rejects_unknown():
+    with pytest.raises(ValueError):
+        parse_class("O(2^n)")
+
+
+def test_exceeds():
+    quadratic = estimate_complexity(profile(lambda n: n * n, 1e-8))
+    assert exceeds(quadratic, "n log n")
+    assert not exceeds(quadratic, "n^2")
+    assert not exceeds(None, "O(1)")
+    assert CLASSES[quadratic["rank"]] == "O(n^2)"
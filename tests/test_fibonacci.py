@@ -0,0 +1,64 @@
+"""fibonacci() by fast doubling with checkpoint reuse, against a naive reference"""
+import pytest
+
+
+def naive_fibonacci(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+
+@pytest.fixture
+def fib(organism_main):
+    """The module with an empty checkpoint cache, so each test picks its own reuse path"""
+    organism_main._checkpoints.clear()
+    yield organism_main
+    organism_main._checkpoints.clear()
+
+
+def test_small_inputs_match_naive(fib):
+    for n in range(300):
+        assert fib.fibonacci(n) == naive_fibonacci(n)
+
+
+def test_base_cases(fib):
+    assert fib.fibonacci(0) == 0
+    assert fib.fibonacci(1) == 1
+    assert fib.fibonacci(2) == 1
+
+
+@pytest.mark.parametrize("bad", [-1, -100, 2.0, 1.5, "15", None])
+def test_rejects_invalid_input(fib, bad):
+    with pytest.raises(ValueError, match="non-negative integer"):
+        fib.fibonacci(bad)
+
+
+def test_checkpoint_paths_agree(fib):
+    reference = {n: naive_fibonacci(n) for n in (5000, 5001, 5030, 9000, 10000, 10001, 20000)}
+    fib.fibonacci(5000)
+    assert fib.fibonacci(5030) == reference[5030]    # short step forward from a checkpoint
+    assert fib.fibonacci(9000) == reference[9000]    # long step by doubling the gap
+    assert fib.fibonacci(5001) == reference[5001]
+    assert fib.fibonacci(10000) == reference[10000]  # 5000 is a bit prefix of 10000
+    assert fib.fibonacci(20000) == reference[20000]
+    assert fib.fibonacci(10001) == reference[10001]
+    assert fib.fibonacci(5000) == reference[5000]    # exact hit
+
+
+def test_checkpoints_stay_bounded(fib):
+    for n in range(2, 2 + 3 * fib.CHECKPOINT_CAPACITY):
+        fib.fibonacci(n * 37)
+    assert len(fib._checkpoints) <= fib.CHECKPOINT_CAPACITY
+
+
+def test_many_keeps_order_and_duplicates(fib):
+    ns = [30, 0, 1, 500, 30, 7, 4096, 2]
+    assert fib.fibonacci_many(ns) == [naive_fibonacci(n) for n in ns]
+    assert fib.fibonacci_many([]) == []
+
+
+def test_many_validates_before_computing(fib):
+    with pytest.raises(ValueError):
+        fib.fibonacci_many([5, -1])
+    assert not fib._checkpoints
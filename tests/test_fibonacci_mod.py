@@ -0,0 +1,102 @@
+"""pisano.py: fibonacci_mod with Pisano reduction and the NumPy batch path"""
+import random
+
+import pytest
+
+import pisano
+
+
+MODULI = [1, 2, 3, 5, 10, 97, 1000, 10 ** 9 + 7, 2 ** 31 - 19, 2 ** 31 - 1, 2 ** 31, 2 ** 61 - 1]
+
+
+@pytest.fixture
+def np():
+    if pisano.np is None:
+        pytest.skip("NumPy is not installed")
+    return pisano.np
+
+
+@pytest.mark.parametrize("m", MODULI)
+def test_matches_reference(organism_main, m):
+    for n in list(range(200)) + [4096, 12345]:
+        assert pisano.fibonacci_mod(n, m) == organism_main.fibonacci(n) % m
+
+
+def test_modulus_one_is_always_zero():
+    assert pisano.pisano_period(1) == 1
+    assert [pisano.fibonacci_mod(n, 1) for n in (0, 1, 2, 10 ** 30)] == [0, 0, 0, 0]
+
+
+@pytest.mark.parametrize("m, period", [(1, 1), (2, 3), (3, 8), (5, 20), (10, 60), (100, 300), (1000, 1500)])
+def test_known_pisano_periods(m, period):
+    assert pisano.pisano_period(m) == period
+
+
+@pytest.mark.parametrize("m", [4, 7, 12, 49, 64, 97, 360, 2 ** 31 - 1])
+def test_period_restarts_the_sequence(m):
+    period = pisano.pisano_period(m)
+    assert pisano._fibonacci_pair_mod(period, m) == (0, 1 % m)
+
+
+def test_reduction_of_huge_indices(organism_main):
+    # n far beyond m's size takes the Pisano reduction; the period is exact, so shifting by it is invisible
+    for m in (97, 1000, 10 ** 9 + 7):
+        period = pisano.pisano_period(m)
+        for n in (10 ** 18 + 3, 2 ** 200 + 11, 10 ** 60):
+            assert pisano.fibonacci_mod(n, m) == pisano.fibonacci_mod(n % period, m)
+            assert pisano.fibonacci_mod(n + period, m) == pisano.fibonacci_mod(n, m)
+    n = 50000
+    assert pisano.fibonacci_mod(n, 97) == organism_main.fibonacci(n) % 97
+
+
+@pytest.mark.parametrize("n, m", [(-1, 10), (5, 0), (5, -3), (5, 2.0), (1.5, 10)])
+def test_rejects_invalid_input(n, m):
+    with pytest.raises(ValueError):
+        pisano.fibonacci_mod(n, m)
+
+
+def test_many_without_numpy(organism_main, monkeypatch):
+    monkeypatch.setattr(pisano, "np", None)
+    assert pisano.fibonacci_mod_many([0, 1, 10, 100], 7) == [organism_main.fibonacci(n) % 7 for n in (0, 1, 10, 100)]
+    assert pisano.fibonacci_mod_many([10, 20], [3, 1000]) == [55 % 3, 6765 % 1000]
+    with pytest.raises(ValueError):
+        pisano.fibonacci_mod_many([1, 2], [3])
+
+
+def test_vector_single_modulus(np):
+    rng = random.Random(7)
+    ns = [rng.randrange(10 ** 6) for _ in range(500)] + [0, 1, 2]
+    for m in (1, 2, 1000, 2 ** 31 - 19, 2 ** 31 - 1):
+        result = pisano.fibonacci_mod_many(np.array(ns, dtype=np.int64), m)
+        assert result.tolist() == [pisano.fibonacci_mod(n, m) for n in ns]
+
+
+def test_vector_per_element_moduli_near_the_limit(np):
+    rng = random.Random(11)
+    ns = [rng.randrange(10 ** 12) for _ in range(300)]
+    ms = [rng.choice([1, 2, 3, 2 ** 31 - 19, 2 ** 31 - 1, 2 ** 31, 2 ** 40 + 15]) for _ in ns]
+    result = pisano.fibonacci_mod_many(np.array(ns, dtype=np.int64), np.array(ms, dtype=np.int64))
+    assert result.dtype == np.int64
+    assert result.tolist() == [pisano.fibonacci_mod(n, m) for n, m in zip(ns, ms)]
+
+
+def test_vector_falls_back_for_ints_past_64_bits(np):
+    ns = [2 ** 70 + 5, 3, 10 ** 25]
+    result = pisano.fibonacci_mod_many(ns, [97, 97, 2 ** 31 - 1])
+    assert result.dtype == object
+    assert result.tolist() == [pisano.fibonacci_mod(n, m) for n, m in zip(ns, [97, 97, 2 ** 31 - 1])]
+
+
+def test_vector_rejects_invalid_input(np):
+    with pytest.raises(ValueError, match="non-negative"):
+        pisano.fibonacci_mod_many(np.array([1, -2]), np.array([5, 5]))
+    with pytest.raises(ValueError, match="Modulus"):
+        pisano.fibonacci_mod_many(np.array([1, 2]), np.array([5, 0]))
+    with pytest.raises(ValueError, match="same length"):
+        pisano.fibonacci_mod_many(np.array([1, 2]), np.array([5, 6, 7]))
+
+
+def test_main_exposes_the_modular_api(organism_main):
+    assert organism_main.fibonacci_mod is pisano.fibonacci_mod
+    assert organism_main.fibonacci_mod_many is pisano.fibonacci_mod_many
+    assert organism_main.pisano_period is pisano.pisano_period
@@ -0,0 +1,29 @@
+"""healer.py validates fixes with a smoke run of main.py in the warm worker"""
+import healer
+from conftest import MAIN_PATH
+from validator import validate_code
+
+
+def test_smoke_validation_accepts_unchanged_main():
+    with open(MAIN_PATH) as f:
+        source = f.read()
+    result = validate_code(source, MAIN_PATH, source, timeout=10)
+    assert result["valid"], result
+
+
+def test_smoke_validation_rejects_crashing_main():
+    with open(MAIN_PATH) as f:
+        source = f.read()
+    broken = source.replace("    main()\n", "    main()\n    1 / 0\n")
+    result = validate_code(broken, MAIN_PATH, source, timeout=10)
+    assert not result["valid"]
+    assert result["stage"] == "smoke"
+    assert "ZeroDivisionError" in result["error"]
+
+
+def test_reply_budget_fits_the_whole_file():
+    with open(MAIN_PATH) as f:
+        source = f.read()
+    assert healer.reply_budget(source) * 4 >= len(source) * 1.25
+    assert healer.reply_budget("") == 2000
+    assert healer.reply_budget("x" * 10 ** 6) == 8000
@@ -0,0 +1,61 @@
+"""LogStore ring buffer: sequence numbers, cursors and wrap-around"""
+import pytest
+
+from logstore import LogStore
+
+
+def fill(store, count):
+    for i in range(count):
+        store.append(f"line {i + 1}", "INFO", 1)
+
+
+def test_empty_store():
+    store = LogStore(4)
+    assert (len(store), store.last_seq, store.first_seq) == (0, 0, 1)
+    assert store.tail(10) == []
+    assert store.since(0) == []
+
+
+def test_rejects_zero_capacity():
+    with pytest.raises(ValueError):
+        LogStore(0)
+
+
+def test_sequence_numbers_are_monotonic():
+    store = LogStore(4)
+    entries = [store.append(f"line {i}") for i in range(3)]
+    assert [entry.seq for entry in entries] == [1, 2, 3]
+    assert entries[-1].message == "line 2"
+
+
+def test_wrap_around_keeps_the_newest():
+    store = LogStore(4)
+    fill(store, 10)
+    assert (len(store), store.first_seq, store.last_seq) == (4, 7, 10)
+    assert [entry.seq for entry in store.tail(100)] == [7, 8, 9, 10]
+    assert [entry.message for entry in store.tail(2)] == ["line 9", "line 10"]
+    assert store.tail(0) == []
+
+
+def test_since_pages_forward():
+    store = LogStore(100)
+    fill(store, 10)
+    assert [entry.seq for entry in store.since(3, limit=4)] == [4, 5, 6, 7]
+    assert [entry.seq for entry in store.since(7)] == [8, 9, 10]
+    assert store.since(10) == []
+
+
+def test_since_skips_overwritten_entries():
+    store = LogStore(4)
+    fill(store, 10)
+    # Entries 2..6 were overwritten; the cursor resumes at the oldest retained one
+    assert [entry.seq for entry in store.since(1)] == [7, 8, 9, 10]
+
+
+def test_entry_rendering():
+    store = LogStore(4)
+    entry = store.append("hello", "WARNING", 3)
+    data = entry.to_dict()
+    assert (data["seq"], data["level"], data["generation"], data["message"]) == (1, "WARNING", 3, "hello")
+    assert entry.format().endswith("] hello")
+    assert data["line"] == entry.format()
@@ -0,0 +1,81 @@
+"""Mutation cache: error signatures, LRU eviction and TTL expiry"""
+import time
+
+import pytest
+
+from mutation_cache import MutationCache, error_signature
+
+
+TRACE_A = '''Traceback (most recent call last):
+  File "/home/a/organisms/alpha/main.py", line 12, in <module>
+    print(1 / 0)
+          ~~^~~
+ZeroDivisionError: division by zero at 0x7f3a2c 10:42:01.123
+'''
+TRACE_B = '''Traceback (most recent call last):
+  File "/srv/run/main.py", line 40, in <module>
+    print(1 / 0)
+ZeroDivisionError: division by zero at 0x55e1 23:01:59
+'''
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return MutationCache(str(tmp_path / "cache.db"), capacity=2, ttl=60)
+
+
+def test_signature_ignores_noise():
+    assert error_signature(TRACE_A, "SYNTAX_ERROR") == error_signature(TRACE_B, "SYNTAX_ERROR")
+    assert error_signature(TRACE_A, "SYNTAX_ERROR") != error_signature("NameError: x", "SYNTAX_ERROR")
+
+
+def test_optimization_signature_ignores_output():
+    assert error_signature("took 3.2s", "OPTIMIZATION") == error_signature("took 9.9s", "OPTIMIZATION")
+
+
+def test_key_depends_on_code_and_type(cache):
+    key = cache.key(TRACE_A, "code", "SYNTAX_ERROR")
+    assert key == cache.key(TRACE_B, "code", "SYNTAX_ERROR")
+    assert key != cache.key(TRACE_A, "other code", "SYNTAX_ERROR")
+    assert key != cache.key(TRACE_A, "code", "OPTIMIZATION")
+
+
+def test_hit_and_miss(cache):
+    assert cache.get(TRACE_A, "code", "SYNTAX_ERROR") is None
+    cache.put(TRACE_A, "code", "SYNTAX_ERROR", "fixed", "why")
+    assert cache.get(TRACE_B, "code", "SYNTAX_ERROR") == ("fixed", "why")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+
+def test_lru_eviction(cache):
+    cache.put("e1", "code", "SYNTAX_ERROR", "f1", "")
+    cache.put("e2", "code", "SYNTAX_ERROR", "f2", "")
+    assert cache.get("e1", "code", "SYNTAX_ERROR")  # e1 becomes most recently used
+    cache.put("e3", "code", "SYNTAX_ERROR", "f3", "")
+
+    assert cache.get("e2", "code", "SYNTAX_ERROR") is None
+    assert cache.get("e1", "code", "SYNTAX_ERROR") == ("f1", "")
+    assert cache.get("e3", "code", "SYNTAX_ERROR") == ("f3", "")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(cache, monkeypatch):
+    cache.put(TRACE_A, "code", "SYNTAX_ERROR", "fixed", "")
+    now = time.time()
+    monkeypatch.setattr("mutation_cache.time.time", lambda: now + 61)
+    assert cache.get(TRACE_A, "code", "SYNTAX_ERROR") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    MutationCache(path).put(TRACE_A, "code", "SYNTAX_ERROR", "fixed", "why")
+    assert MutationCache(path).get(TRACE_B, "code", "SYNTAX_ERROR") == ("fixed", "why")
+
+
+def test_invalidate(cache):
+    cache.put(TRACE_A, "code", "SYNTAX_ERROR", "fixed", "")
+    cache.invalidate(TRACE_B, "code", "SYNTAX_ERROR")
+    assert cache.get(TRACE_A, "code", "SYNTAX_ERROR") is None
@@ -0,0 +1,32 @@
+"""Resolving the ORGANISMS setting to organism files"""
+import os
+
+import pytest
+
+from watcher import BASE_DIR, _organism_paths
+
+
+def test_files_resolve_relative_to_the_backend():
+    assert _organism_paths("organism.py") == [os.path.join(BASE_DIR, "organism.py")]
+
+
+def test_blank_entries_are_skipped():
+    expected = [os.path.join(BASE_DIR, "organism.py")]
+    assert _organism_paths("organism.py,") == expected
+    assert _organism_paths(" , organism.py , ") == expected
+
+
+def test_nothing_configured_means_the_default_organism():
+    assert _organism_paths("") == _organism_paths(" ") == [os.path.join(BASE_DIR, "organism.py")]
+
+
+@pytest.mark.parametrize("spec", [".", "./", "organism.py,.", "../backend"])
+def test_backend_directory_is_refused(spec):
+    with pytest.raises(ValueError, match="backend directory"):
+        _organism_paths(spec)
+
+
+def test_directories_expand_to_their_organisms(tmp_path):
+    for name in ["b.py", "a.py", "a_v3.py", "notes.txt"]:
+        (tmp_path / name).write_text("")
+    assert _organism_paths(f" {tmp_path} ") == [str(tmp_path / "a.py"), str(tmp_path / "b.py")]
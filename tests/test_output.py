@@ -0,0 +1,84 @@
+"""cli.py: subquadratic decimal conversion, output formats and the command line"""
+import io
+import random
+import sys
+
+import pytest
+
+import cli
+
+
+@pytest.fixture
+def unlimited_str():
+    """str(int) as the reference, past Python's default 4300-digit guard"""
+    limit = sys.get_int_max_str_digits() if hasattr(sys, "get_int_max_str_digits") else None
+    if limit is not None:
+        sys.set_int_max_str_digits(0)
+    yield
+    if limit is not None:
+        sys.set_int_max_str_digits(limit)
+
+
+def test_decimal_matches_str(unlimited_str):
+    split = cli.DECIMAL_SPLIT_BITS
+    rng = random.Random(3)
+    values = [0, 1, 9, 10, 2 ** split - 1, 2 ** split, 2 ** split + 1, 10 ** 5000, 10 ** 5000 - 1,
+              rng.getrandbits(3 * split + 17), rng.getrandbits(100_000) | 1]
+    for value in values:
+        assert cli.to_decimal_string(value) == str(value)
+
+
+def test_decimal_of_a_large_fibonacci(organism_main, unlimited_str):
+    value = organism_main.fibonacci(200_000)
+    digits = cli.to_decimal_string(value)
+    assert digits == str(value)
+    assert len(digits) == 41_798
+
+
+@pytest.mark.parametrize("value", [0, 1, 255, 256, 2 ** 64 + 3])
+def test_hex_and_binary_round_trip(value):
+    assert int(cli.encode_result(value, "hex"), 16) == value
+    assert int.from_bytes(cli.encode_result(value, "binary"), "big") == value
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 16])
+def test_write_chunks(chunk_size):
+    data = bytes(range(256)) * 10
+    stream = io.BytesIO()
+    assert cli.write_chunks(data, stream, chunk_size) == len(data)
+    assert stream.getvalue() == data
+
+
+def test_cli_default_output_is_unchanged(organism_main, capsys):
+    organism_main.main([])
+    assert capsys.readouterr().out == "Calculating Fibonacci(15)...\nResult: 610\nCalculation successful\n"
+
+
+def test_cli_formats(organism_main, capsys, tmp_path):
+    organism_main.main(["100", "-f", "hex"])
+    assert "Result: 1333db76a7c594bfc3\n" in capsys.readouterr().out
+
+    target = tmp_path / "f.bin"
+    organism_main.main(["1000", "-f", "binary", "-o", str(target)])
+    assert int.from_bytes(target.read_bytes(), "big") == organism_main.fibonacci(1000)
+
+
+def test_cli_reports_bad_input(organism_main, capsys):
+    organism_main.main(["-5"])
+    assert "Error: Input must be a non-negative integer." in capsys.readouterr().out
+
+
+def test_cli_on_text_only_stdout(organism_main, monkeypatch):
+    # The warm runner and other harnesses capture stdout as text without .buffer
+    out, err = io.StringIO(), io.StringIO()
+    monkeypatch.setattr(sys, "stdout", out)
+    monkeypatch.setattr(sys, "stderr", err)
+    organism_main.main(["20"])
+    assert "Result: 6765\n" in out.getvalue()
+    organism_main.main(["20", "-f", "binary"])
+    assert "Binary output needs a byte stream" in err.getvalue()
+
+
+def test_cli_computes_with_any_function(capsys):
+    cli.run(lambda n: 2 * n, ["21"])
+    assert "Result: 42\n" in capsys.readouterr().out
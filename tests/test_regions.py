@@ -0,0 +1,138 @@
+"""Region-scoped mutations: locating the function, applying diffs and replacement functions"""
+import pytest
+
+from architect import Architect
+
+from regions import apply_region_reply, apply_unified_diff, compact_error, locate_region
+
+
+CODE = '''import time
+
+
+def helper(x):
+    return x + 1
+
+
+def slow(items):
+    total = 0
+    for a in items:
+        for b in items:
+            total += a * b
+    return total
+
+
+def crash(value):
+    return value / 0
+'''
+
+TRACE = '''Traceback (most recent call last):
+  File "/tmp/organism.py", line 20, in <module>
+    crash(3)
+  File "/tmp/organism.py", line 17, in crash
+    return value / 0
+           ~~~~~~^~~
+ZeroDivisionError: division by zero
+'''
+
+
+def test_diff_with_context_and_wrong_line_numbers():
+    diff = '''--- a/organism.py
++++ b/organism.py
+@@ -100,3 +100,3 @@
+ def crash(value):
+-    return value / 0
++    return value / 1
+'''
+    assert apply_unified_diff(CODE, diff) == CODE.replace("value / 0", "value / 1")
+
+
+def test_diff_with_several_hunks():
+    diff = '''@@ -4,2 +4,2 @@
+ def helper(x):
+-    return x + 1
++    return x + 2
+@@ -16,2 +16,3 @@
+ def crash(value):
+-    return value / 0
++    if value:
++        return value / 1
+'''
+    expected = CODE.replace("x + 1", "x + 2").replace("    return value / 0", "    if value:\n        return value / 1")
+    assert apply_unified_diff(CODE, diff) == expected
+
+
+def test_diff_ignores_trailing_whitespace():
+    diff = "@@ -1 +1 @@\n-def helper(x):   \n+def helper(y):\n"
+    assert "def helper(y):" in apply_unified_diff(CODE, diff)
+
+
+def test_diff_that_does_not_match_is_rejected():
+    with pytest.raises(ValueError):
+        apply_unified_diff(CODE, "@@ -1 +1 @@\n-def missing():\n+def found():\n")
+
+
+def test_hunks_apply_in_order():
+    code = "a\nx\nb\nx\n"
+    diff = "@@ @@\n b\n-x\n+y\n"
+    assert apply_unified_diff(code, diff) == "a\nx\nb\ny\n"
+
+
+def test_crash_region_is_the_innermost_frame():
+    region = locate_region(CODE, TRACE, "ERROR")
+    assert (region["name"], region["start"], region["end"]) == ("crash", 16, 17)
+
+
+def test_optimization_region_is_the_deepest_loop():
+    assert locate_region(CODE, "", "OPTIMIZATION")["name"] == "slow"
+
+
+def test_no_region_outside_functions():
+    assert locate_region(CODE, 'File "/tmp/organism.py", line 1, in <module>', "ERROR") is None
+
+
+def test_region_in_code_that_does_not_parse():
+    broken = CODE.replace("return value / 0", "return value / 0 )")
+    assert locate_region(broken, TRACE, "ERROR")["name"] == "crash"
+
+
+def test_replacement_function_is_spliced_in():
+    region = locate_region(CODE, TRACE, "ERROR")
+    fixed = apply_region_reply(CODE, region, "def crash(value):\n    return 0\n")
+    assert fixed == CODE.replace("return value / 0", "return 0")
+
+
+def test_reply_without_the_function_is_rejected():
+    with pytest.raises(ValueError):
+        apply_region_reply(CODE, locate_region(CODE, TRACE, "ERROR"), "def other():\n    pass\n")
+
+
+def test_compact_error_drops_carets_and_keeps_the_exception():
+    compact = compact_error(TRACE, max_lines=4)
+    assert "~" not in compact
+    assert compact.splitlines()[0] == "Traceback (most recent call last):"
+    assert compact.splitlines()[-1] == "ZeroDivisionError: division by zero"
+
+
+class ScriptedProvider:
+    """Replies with the given texts in order"""
+
+    name = "scripted"
+    model = "scripted"
+    streams = False
+    rate_limits = None
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+
+    def complete(self, messages, request, temperature, max_tokens):
+        return self.replies.pop(0)
+
+
+def test_unusable_region_reply_is_logged_and_retried_whole(monkeypatch):
+    monkeypatch.setenv("PROMPT_MODE", "region")
+    fixed = CODE.replace("value / 0", "value")
+    architect = Architect(ScriptedProvider("def other():\n    pass\n", fixed))
+    notes = []
+    code, _ = architect.analyze_and_fix(TRACE, CODE, "ERROR", log=notes.append)
+    assert code.strip() == fixed.strip()
+    assert len(notes) == 1 and "crash()" in notes[0] and "full file" in notes[0]
@@ -0,0 +1,218 @@
+"""LLM request scheduler: token buckets, coalescing, priorities and 429 backoff"""
+import threading
+
+import pytest
+
+from architect import RequestScheduler, _rate_limit, StreamAborted, StreamGuard, TokenBucket
+
+
+MESSAGES = [{"role": "user", "content": "fix it"}]
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class FakeProvider:
+    """Records calls; each call waits for `gate` and may raise the next queued error"""
+
+    streams = True
+
+    def __init__(self, errors=()):
+        self.calls = []
+        self.errors = list(errors)
+        self.gate = threading.Event()
+        self.gate.set()
+        self.lock = threading.Lock()
+        self.streamed = []
+
+    def complete(self, messages, request, temperature, max_tokens):
+        with self.lock:
+            self.calls.append(request["name"])
+            error = self.errors.pop(0) if self.errors else None
+        self.gate.wait(5)
+        if error is not None:
+            raise error
+        return f"reply to {request['name']}"
+
+    def stream(self, messages, request, temperature, max_tokens):
+        self.calls.append(request["name"])
+        for chunk in request["chunks"]:
+            self.streamed.append(chunk)
+            yield chunk
+
+
+def submit(scheduler, name, mutation_type="ERROR"):
+    return scheduler.submit(mutation_type, MESSAGES + [{"role": "user", "content": name}], {"name": name}, 0.3, 100)
+
+
+def test_bucket_refills_continuously():
+    bucket = TokenBucket(60)
+    t = bucket.updated
+    bucket.spend(60, now=t)
+    assert bucket.wait_time(1, now=t) == pytest.approx(1.0)
+    assert bucket.wait_time(30, now=t) == pytest.approx(30.0)
+    assert bucket.wait_time(30, now=t + 30) == 0.0
+    assert bucket.wait_time(60, now=t + 1000) == 0.0  # Never above capacity
+
+
+def test_bucket_oversized_request_still_fits():
+    bucket = TokenBucket(60)
+    t = bucket.updated
+    assert bucket.wait_time(500, now=t) == 0.0
+    bucket.spend(500, now=t)
+    assert bucket.wait_time(500, now=t) == pytest.approx(60.0)
+
+
+def test_zero_limit_is_unlimited():
+    bucket = TokenBucket(0)
+    bucket.spend(10 ** 9, now=bucket.updated)
+    assert bucket.wait_time(10 ** 9, now=bucket.updated) == 0.0
+
+
+def test_bucket_refund_is_capped():
+    bucket = TokenBucket(100)
+    bucket.spend(80, now=bucket.updated)
+    bucket.refund(30)
+    assert bucket.level == pytest.approx(50, abs=0.1)
+    bucket.refund(500)
+    assert bucket.level == 100
+
+
+def test_calls_settle_their_token_reservation():
+    scheduler = RequestScheduler(FakeProvider(errors=[ValueError("bad request")]), rpm=0, tpm=6000)
+    with pytest.raises(ValueError):
+        submit(scheduler, "a").result(5)
+    prompt = scheduler.tokens.capacity - scheduler.tokens.level
+    assert prompt < 100  # The reply budget came back
+
+    scheduler.tokens.level = scheduler.tokens.capacity
+    reply = submit(scheduler, "a").result(5).text
+    used = scheduler.tokens.capacity - scheduler.tokens.level
+    assert used == pytest.approx(prompt + len(reply) // 4, abs=1)
+
+
+def test_rate_limits_come_from_the_provider_unless_configured(monkeypatch):
+    provider = FakeProvider()
+    provider.rate_limits = {"rpm": 30, "tpm": 6000}
+    monkeypatch.delenv("LLM_TPM", raising=False)
+    assert _rate_limit("LLM_TPM", provider, "tpm") == 6000
+    monkeypatch.setenv("LLM_TPM", "100")
+    assert _rate_limit("LLM_TPM", provider, "tpm") == 100
+    provider.rate_limits = None
+    monkeypatch.setenv("LLM_TPM", " ")
+    assert _rate_limit("LLM_TPM", provider, "tpm") == 0
+
+
+def test_identical_requests_are_coalesced():
+    provider = FakeProvider()
+    provider.gate.clear()
+    scheduler = RequestScheduler(provider, rpm=0, tpm=0)
+    first, second = submit(scheduler, "a"), submit(scheduler, "a")
+    provider.gate.set()
+
+    assert first is second
+    assert first.result(5).text == "reply to a"
+    assert provider.calls == ["a"]
+    assert scheduler.stats()["coalesced"] == 1
+
+
+def test_errors_jump_ahead_of_optimizations():
+    provider = FakeProvider()
+    provider.gate.clear()
+    scheduler = RequestScheduler(provider, rpm=0, tpm=0, concurrency=1)
+    futures = [submit(scheduler, "busy")]
+    futures += [submit(scheduler, "optimize", "OPTIMIZATION"), submit(scheduler, "crash", "ERROR")]
+    provider.gate.set()
+
+    for future in futures:
+        future.result(5)
+    assert provider.calls == ["busy", "crash", "optimize"]
+
+
+def test_rate_limits_are_retried():
+    provider = FakeProvider(errors=[RateLimited(), RateLimited()])
+    scheduler = RequestScheduler(provider, rpm=0, tpm=0, backoff=0.01)
+
+    assert submit(scheduler, "a").result(5).text == "reply to a"
+    assert provider.calls == ["a", "a", "a"]
+    assert scheduler.stats()["rate_limited"] == 2
+
+
+def test_retries_are_bounded():
+    provider = FakeProvider(errors=[RateLimited(), RateLimited()])
+    scheduler = RequestScheduler(provider, rpm=0, tpm=0, max_retries=1, backoff=0.01)
+    with pytest.raises(RateLimited):
+        submit(scheduler, "a").result(5)
+
+
+def test_other_errors_fail_immediately():
+    provider = FakeProvider(errors=[ValueError("bad request")])
+    scheduler = RequestScheduler(provider, rpm=0, tpm=0)
+    with pytest.raises(ValueError):
+        submit(scheduler, "a").result(5)
+    assert provider.calls == ["a"]
+
+
+def test_request_budget_spaces_calls():
+    scheduler = RequestScheduler(FakeProvider(), rpm=60, tpm=0)
+    scheduler.requests.spend(60, now=scheduler.requests.updated)
+    future = submit(scheduler, "a")
+    with pytest.raises(TimeoutError):
+        future.result(0.5)  # Needs a full second of refill
+    assert future.result(5).text == "reply to a"
+
+
+def test_stream_stops_at_the_closing_fence():
+    guard = StreamGuard()
+    chunks = ["```py", "thon\ndef run():\n", "    pass\n``", "`\nThis fix ", "removes the crash.\n"]
+    done = [guard.feed(chunk) for chunk in chunks[:4]]
+    assert done == [False, False, False, True]
+    assert guard.text == "```python\ndef run():\n    pass\n```\n"
+    assert guard.stats()["first_token"] is not None
+
+
+def test_stream_aborts_on_prose():
+    guard = StreamGuard()
+    with pytest.raises(StreamAborted):
+        guard.feed("I am sorry, but I cannot help with that.\n")
+
+
+def test_streamed_scheduler_reads_only_what_it_needs():
+    provider = FakeProvider()
+    scheduler = RequestScheduler(provider, rpm=0, tpm=0, stream=True)
+    chunks = ["```\n", "x = 1\n", "```\n", "Explanation that is never read.\n"]
+    future = scheduler.submit("ERROR", MESSAGES, {"name": "a", "chunks": chunks}, 0.3, 100)
+
+    completion = future.result(5)
+    assert completion.text == "```\nx = 1\n```\n"
+    assert completion.stats["tokens"] == len(completion.text) // 4
+    assert provider.streamed == chunks[:3]
+
+
+def test_streamed_prose_fails_without_retry():
+    provider = FakeProvider()
+    scheduler = RequestScheduler(provider, rpm=0, tpm=0, stream=True)
+    future = scheduler.submit("ERROR", MESSAGES, {"name": "a", "chunks": ["Here is the fixed code for you:\n"]}, 0.3, 100)
+    with pytest.raises(StreamAborted):
+        future.result(5)
+    assert provider.calls == ["a"]
+
+
+def test_providers_that_cannot_stream_complete_normally():
+    provider = FakeProvider()
+    provider.streams = False
+    scheduler = RequestScheduler(provider, rpm=0, tpm=0, stream=True)
+    completion = submit(scheduler, "a").result(5)
+    assert (completion.text, completion.stats) == ("reply to a", None)
+
+
+def test_aborted_streams_settle_their_token_reservation():
+    chunks = ["Here is the fixed ", "code for you:\n", "```\n"]
+    scheduler = RequestScheduler(FakeProvider(), rpm=0, tpm=6000, stream=True)
+    future = scheduler.submit("ERROR", MESSAGES, {"name": "a", "chunks": chunks}, 0.3, 100)
+    with pytest.raises(StreamAborted):
+        future.result(5)
+    used = scheduler.tokens.capacity - scheduler.tokens.level
+    prompt = sum(len(m["content"]) for m in MESSAGES) // 4
+    assert used == pytest.approx(prompt + len("".join(chunks[:2])) // 4, abs=1)
@@ -0,0 +1,69 @@
+"""Warm runner: crashes of the worker itself are reported with its stderr"""
+import asyncio
+import os
+
+import pytest
+
+from runner import AsyncWarmRunner, WarmRunner
+
+
+HEALTHY = 'def run():\n    print("ok")\n'
+HARD_EXIT = 'import os\n\n\ndef run():\n    os.write(2, b"native library says goodbye\\n")\n    os._exit(3)\n'
+SEGFAULT = 'import ctypes\n\n\ndef run():\n    ctypes.string_at(0)\n'
+
+
+@pytest.fixture
+def path(tmp_path):
+    target = tmp_path / "organism.py"
+    target.write_text(HEALTHY)
+    return str(target)
+
+
+def test_crash_result_carries_worker_stderr(path):
+    runner = WarmRunner(path, timeout=10)
+    try:
+        result = runner.run(HARD_EXIT)
+        assert result["returncode"] == -1
+        assert "exit code 3" in result["stderr"]
+        assert "native library says goodbye" in result["stderr"]
+    finally:
+        runner.close()
+
+
+def test_segfault_leaves_a_traceback(path):
+    runner = WarmRunner(path, timeout=10)
+    try:
+        result = runner.run(SEGFAULT)
+        assert "Segmentation fault" in result["stderr"]
+        assert os.path.basename(path) in result["stderr"]
+    finally:
+        runner.close()
+
+
+def test_worker_restarts_count_respawns(path):
+    runner = WarmRunner(path, timeout=10)
+    try:
+        assert runner.run()["stdout"] == "ok\n"
+        assert runner.run()["stdout"] == "ok\n"
+        assert runner.worker_restarts == 0
+        runner.run(HARD_EXIT)
+        assert runner.run()["stdout"] == "ok\n"
+        assert runner.worker_restarts == 1
+    finally:
+        runner.close()
+
+
+def test_async_runner_reports_the_same(path):
+    async def scenario():
+        runner = AsyncWarmRunner(path, timeout=10)
+        try:
+            assert (await runner.run())["stdout"] == "ok\n"
+            crashed = await runner.run(HARD_EXIT)
+            assert (await runner.run())["stdout"] == "ok\n"
+            return crashed, runner.worker_restarts
+        finally:
+            await runner.aclose()
+
+    crashed, restarts = asyncio.run(scenario())
+    assert "native library says goodbye" in crashed["stderr"]
+    assert restarts == 1
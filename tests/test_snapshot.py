@@ -0,0 +1,39 @@
+"""Immutable state snapshots and ETag matching"""
+import json
+
+from snapshot import etag_matches, make_snapshot
+
+
+STATE = {"status": "HEALTHY", "generation": 3, "times": [0.1, 0.2]}
+
+
+def test_body_is_serialized_once():
+    snapshot = make_snapshot(STATE, key=7)
+    assert json.loads(snapshot.body) == STATE
+    assert snapshot.key == 7 and snapshot.data is STATE
+
+
+def test_etag_follows_the_content():
+    etag = make_snapshot(STATE).etag
+    assert etag.startswith('"') and etag.endswith('"')
+    assert make_snapshot(dict(STATE)).etag == etag
+    assert make_snapshot(dict(STATE, generation=4)).etag != etag
+
+
+def test_etag_matching():
+    etag = make_snapshot(STATE).etag
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches(" * ", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches("", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(etag.strip('"'), etag)
+
+
+def test_volatile_fields_do_not_change_the_etag():
+    first = make_snapshot(dict(STATE, uptime=1.0), volatile=("uptime",))
+    later = make_snapshot(dict(STATE, uptime=9.0), volatile=("uptime",))
+    assert first.etag == later.etag
+    assert json.loads(later.body)["uptime"] == 9.0  # Still served
+    assert make_snapshot(dict(STATE, uptime=9.0, generation=4), volatile=("uptime",)).etag != first.etag
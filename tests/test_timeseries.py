@@ -0,0 +1,96 @@
+"""Fixed-memory time series: raw ring and minute/hour rollups"""
+import time
+
+import pytest
+
+from timeseries import RingSeries, Rollup, TimeSeries
+
+
+def test_ring_keeps_the_newest_samples():
+    ring = RingSeries(3)
+    for i in range(5):
+        ring.append(float(i), i * 10.0)
+    assert len(ring) == 3 and ring.count == 5
+    assert ring.last(2) == [30.0, 40.0]
+    assert ring.last(10) == [20.0, 30.0, 40.0]
+    assert ring.columns(since=2.0) == {"t": [3.0, 4.0], "value": [30.0, 40.0]}
+
+
+def test_ring_rejects_zero_capacity():
+    with pytest.raises(ValueError):
+        RingSeries(0)
+
+
+T = 60.0 * 28_000_000  # A minute boundary in 2023
+
+
+def test_rollup_aggregates_per_bucket():
+    rollup = Rollup(60.0, 10)
+    for offset, value in [(0, 1.0), (30, 3.0), (59.9, 2.0), (60, 5.0)]:
+        rollup.add(T + offset, value)
+    columns = rollup.columns(now=T + 119)
+    assert columns == {"t": [T, T + 60], "count": [3, 1], "mean": [2.0, 5.0], "min": [1.0, 5.0], "max": [3.0, 5.0]}
+
+
+def test_rollup_window_slides():
+    rollup = Rollup(60.0, 3)
+    for minute in range(5):
+        rollup.add(T + minute * 60, float(minute))
+    now = T + 4 * 60
+    assert rollup.columns(now=now)["t"] == [T + 120, T + 180, T + 240]
+    rollup.add(T, 99.0)  # Older than the window: dropped
+    assert rollup.columns(now=now)["max"] == [2.0, 3.0, 4.0]
+    assert rollup.columns(since=T + 200, now=now)["t"] == [T + 180, T + 240]
+
+
+def test_rollup_stale_buckets_leave_the_window():
+    rollup = Rollup(60.0, 3)
+    rollup.add(T, 1.0)
+    assert rollup.columns(now=T + 10 * 60)["t"] == []
+
+
+def test_timeseries_mean_and_recent():
+    series = TimeSeries(raw=4)
+    assert series.mean() == 0.0
+    for value in [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]:
+        series.record(value)
+    assert len(series) == 6
+    assert series.recent(2) == [5.0, 6.0]
+    assert series.mean() == 3.5  # Lifetime, beyond the raw ring
+    assert series.mean(4) == 4.5
+
+
+def test_timeseries_history_resolutions():
+    series = TimeSeries()
+    now = time.time()
+    for i in range(10):
+        series.record(float(i), now - 10 + i)
+    assert series.history("raw", limit=3)["value"] == [7.0, 8.0, 9.0]
+    for resolution in ("minute", "hour"):
+        history = series.history(resolution)
+        assert sum(history["count"]) == 10
+        assert min(history["min"]) == 0.0 and max(history["max"]) == 9.0
+    with pytest.raises(ValueError):
+        series.history("second")
+
+
+def test_zero_and_none_limits_mean_everything():
+    series = TimeSeries()
+    for i in range(5):
+        series.record(float(i))
+    for resolution in ("raw", "minute"):
+        assert series.history(resolution, limit=0) == series.history(resolution, limit=None)
+    assert len(series.history("raw", limit=0)["value"]) == 5
+
+
+def test_limit_applies_after_since():
+    series = TimeSeries()
+    for i in range(10):
+        series.record(float(i), T + i)
+    assert series.history("raw", since=T + 2, limit=3)["value"] == [7.0, 8.0, 9.0]
+    assert series.history("raw", since=T + 7, limit=5)["value"] == [8.0, 9.0]
+
+
+def test_negative_limit_is_rejected():
+    with pytest.raises(ValueError):
+        TimeSeries().history("raw", limit=-1)
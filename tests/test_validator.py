@@ -0,0 +1,86 @@
+"""Staged validation of mutations: syntax, entry points, imports, smoke run"""
+import asyncio
+import os
+
+import pytest
+
+from validator import avalidate_code, check_static, required_entry_points, validate_code
+
+
+ORGANISM = '''import random
+
+
+def run():
+    print(sorted(random.sample(range(100), 5)))
+
+
+if __name__ == "__main__":
+    run()
+'''
+
+
+@pytest.fixture
+def path(tmp_path):
+    return os.path.join(str(tmp_path), "organism.py")
+
+
+def test_accepts_healthy_code(path):
+    result = validate_code(ORGANISM, path, ORGANISM)
+    assert (result["valid"], result["stage"], result["error"]) == (True, "smoke", "")
+
+
+def test_syntax_stage(path):
+    result = check_static(ORGANISM + "this is not valid python!!!\n", ORGANISM, path)
+    assert (result["valid"], result["stage"]) == (False, "syntax")
+
+
+def test_entry_points_come_from_the_reference(path):
+    assert required_entry_points(ORGANISM) == ["run"]
+    # The reference may itself be broken; its entry points are still found
+    assert required_entry_points("def fibonacci(n):\n  !!!\n") == ["fibonacci"]
+    result = check_static(ORGANISM.replace("def run():", "def start():").replace("    run()", "    start()"),
+                          ORGANISM, path)
+    assert (result["valid"], result["stage"]) == (False, "entry_points")
+    assert "run" in result["error"]
+
+
+def test_unresolvable_import(path):
+    result = check_static("import surely_not_a_module_xyz\n" + ORGANISM, ORGANISM, path)
+    assert (result["valid"], result["stage"]) == (False, "imports")
+    assert "surely_not_a_module_xyz" in result["error"]
+
+
+@pytest.mark.parametrize("handler", ["ImportError", "ModuleNotFoundError", "(ImportError, AttributeError)", "Exception", ""])
+def test_guarded_optional_imports_are_allowed(path, handler):
+    guarded = f"try:\n    import surely_not_a_module_xyz\nexcept {handler}:\n    surely_not_a_module_xyz = None\n"
+    assert check_static(guarded + ORGANISM, ORGANISM, path)["valid"]
+
+
+def test_imports_guarded_by_other_handlers_are_checked(path):
+    guarded = "try:\n    import surely_not_a_module_xyz\nexcept KeyError:\n    pass\n"
+    assert check_static(guarded + ORGANISM, ORGANISM, path)["stage"] == "imports"
+
+
+def test_sibling_modules_resolve(path):
+    with open(os.path.join(os.path.dirname(path), "helpers_xyz.py"), "w") as f:
+        f.write("VALUE = 1\n")
+    assert check_static("import helpers_xyz\n" + ORGANISM, ORGANISM, path)["valid"]
+
+
+def test_smoke_stage_catches_runtime_errors(path):
+    result = validate_code(ORGANISM.replace("print(", "print(1 / 0, "), path, ORGANISM)
+    assert (result["valid"], result["stage"]) == (False, "smoke")
+    assert "ZeroDivisionError" in result["error"]
+
+
+def test_smoke_stage_times_out(path):
+    frozen = ORGANISM.replace("def run():\n", "def run():\n    while True:\n        pass\n")
+    result = validate_code(frozen, path, ORGANISM, timeout=0.5)
+    assert (result["valid"], result["stage"]) == (False, "smoke")
+    assert "no exit" in result["error"]
+
+
+def test_async_version_agrees(path):
+    assert asyncio.run(avalidate_code(ORGANISM, path, ORGANISM))["valid"]
+    result = asyncio.run(avalidate_code(ORGANISM.replace("print(", "print(1 / 0, "), path, ORGANISM))
+    assert (result["valid"], result["stage"]) == (False, "smoke")